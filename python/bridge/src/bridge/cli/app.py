@@ -1,6 +1,7 @@
 from click import Group
 
 from bridge.cli.commands.database import database
+from bridge.cli.commands.sync import sync
 from bridge.cli.commands.users import users
 
 
@@ -15,3 +16,4 @@ def configure_commands(app: Group):
     """Configure the application's commands."""
     app.add_command(database)
     app.add_command(users)
+    app.add_command(sync)
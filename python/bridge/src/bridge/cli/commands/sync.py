@@ -0,0 +1,120 @@
+import click
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from bridge.cli.commands.users import with_async_database_connection
+from bridge.config import upstream
+from bridge.database.storages.user import PostgresUserStorage
+from bridge.domain.users.services.pull_users import PullUsers
+from bridge.domain.users.services.pull_users import PullUsersHandler
+from bridge.domain.users.services.sync_users import SyncUsers
+from bridge.domain.users.services.sync_users import SyncUsersHandler
+from bridge.upstream.core import UpstreamError
+from bridge.upstream.core import get_client
+from bridge.upstream.sources.user import DummyJsonUserSource
+
+
+@click.group()
+def sync():
+    """Synchronise users with the upstream DummyJSON API."""
+
+
+def upstream_options(function):
+    """Decorator adding the options of the upstream requests to a CLI command."""
+    function = click.option(
+        "--concurrency",
+        type=click.IntRange(min=1),
+        default=lambda: upstream.concurrency,
+        help="Number of upstream requests in flight at once.",
+    )(function)
+    function = click.option(
+        "--page-size",
+        type=click.IntRange(min=1),
+        default=lambda: upstream.page_size,
+        help="Number of users per upstream request.",
+    )(function)
+    return function
+
+
+@sync.command()
+@upstream_options
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="Number of users stored per transaction.",
+)
+@with_async_database_connection
+async def pull(conn: AsyncConnection, page_size: int, concurrency: int, batch_size: int):
+    """Pull the upstream users, creating or updating them by email.
+
+    Pages are fetched concurrently, and their users stored by batches, each committed on
+    its own: an interrupted pull keeps the users already stored.
+    """
+    storage = PostgresUserStorage(conn)
+    received = changed = 0
+
+    async with get_client(upstream, concurrency) as client:
+        source = DummyJsonUserSource(client, upstream, concurrency)
+        handler = PullUsersHandler(storage, source)
+        command = PullUsers(page_size=page_size, concurrency=concurrency, batch_size=batch_size)
+        try:
+            async for batch in handler.handle(command):
+                await conn.commit()
+                received += batch.received
+                changed += batch.changed
+        except UpstreamError as exc:
+            raise click.ClickException(
+                f"{exc} ({received} users received, {changed} created or updated)"
+            ) from exc
+
+    click.echo(f"{received} users received, {changed} created or updated.")
+
+
+@sync.command()
+@upstream_options
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="Number of users read, and changed, per transaction.",
+)
+@click.option("--dry-run", is_flag=True, help="Count the changes, without applying them.")
+@with_async_database_connection
+async def mirror(
+    conn: AsyncConnection, page_size: int, concurrency: int, batch_size: int, dry_run: bool
+):
+    """Make the stored users a copy of the upstream ones.
+
+    The upstream users are merged with the stored ones, both by email: the missing users are
+    inserted, those whose content hash differs updated, and those gone upstream deleted.
+    Unchanged users are not written. Each batch of changes is committed on its own.
+    """
+    storage = PostgresUserStorage(conn)
+    inserted = updated = deleted = unchanged = 0
+
+    async with get_client(upstream, concurrency) as client:
+        source = DummyJsonUserSource(client, upstream, concurrency)
+        handler = SyncUsersHandler(storage, source)
+        command = SyncUsers(
+            page_size=page_size, concurrency=concurrency, batch_size=batch_size, dry_run=dry_run
+        )
+        try:
+            async for batch in handler.handle(command):
+                await conn.commit()
+                inserted += batch.inserted
+                updated += batch.updated
+                deleted += batch.deleted
+                unchanged += batch.unchanged
+        except (UpstreamError, ValueError) as exc:
+            raise click.ClickException(str(exc)) from exc
+
+    if dry_run:
+        click.echo(
+            f"{inserted} users to insert, {updated} to update, {deleted} to delete, "
+            f"{unchanged} unchanged."
+        )
+    else:
+        click.echo(
+            f"{inserted} users inserted, {updated} updated, {deleted} deleted, "
+            f"{unchanged} unchanged."
+        )
@@ -1,22 +1,42 @@
 import asyncio
 from functools import wraps
+from pathlib import Path
+from typing import TextIO
 
 import click
 from sqlalchemy.ext.asyncio import AsyncConnection
 from tabulate import tabulate
 
+from bridge.cli.user_files import FORMATS
+from bridge.cli.user_files import Checkpoint
+from bridge.cli.user_files import Row
+from bridge.cli.user_files import file_format
+from bridge.cli.user_files import read_rows
+from bridge.cli.user_files import user_writer
 from bridge.config import database
 from bridge.database.core import get_async_engine
 from bridge.database.core import get_connection
 from bridge.database.storages.user import PostgresUserStorage
+from bridge.domain.users.models.user_cursor import UserCursor
+from bridge.domain.users.models.user_filter import UserFilter
 from bridge.domain.users.services.create_user import CreateUser
 from bridge.domain.users.services.create_user import CreateUserHandler
 from bridge.domain.users.services.delete_user import DeleteUser
 from bridge.domain.users.services.delete_user import DeleteUserHandler
+from bridge.domain.users.services.delete_users import DeleteUsers
+from bridge.domain.users.services.delete_users import DeleteUsersHandler
+from bridge.domain.users.services.export_users import ExportUsers
+from bridge.domain.users.services.export_users import ExportUsersHandler
 from bridge.domain.users.services.fetch_all_users import FetchAllUsers
 from bridge.domain.users.services.fetch_all_users import FetchAllUsersHandler
+from bridge.domain.users.services.import_users import ImportUsers
+from bridge.domain.users.services.import_users import ImportUsersHandler
 from bridge.domain.users.services.update_user import UpdateUser
 from bridge.domain.users.services.update_user import UpdateUserHandler
+from bridge.domain.users.services.update_users import UpdateUsers
+from bridge.domain.users.services.update_users import UpdateUsersByEmail
+from bridge.domain.users.services.update_users import UpdateUsersByEmailHandler
+from bridge.domain.users.services.update_users import UpdateUsersHandler
 
 
 def with_async_database_connection(function):
@@ -63,14 +83,19 @@ async def create(conn: AsyncConnection, email: str, first_name: str, last_name:
 @users.command(name="list")
 @click.option("--limit", default=10, help="Number of users to fetch.")
 @click.option("--offset", default=0, help="Number of users to skip.")
+@click.option("--after", help="Cursor of the previous page, as printed after it.")
 @with_async_database_connection
-async def list_(conn: AsyncConnection, limit: int, offset: int):
+async def list_(conn: AsyncConnection, limit: int, offset: int, after: str | None):
     """List all users from the system."""
 
+    try:
+        cursor = None if after is None else UserCursor.parse(after)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--after") from exc
     storage = PostgresUserStorage(conn)
     handler = FetchAllUsersHandler(storage)
 
-    query = FetchAllUsers(limit=limit, offset=offset)
+    query = FetchAllUsers(limit=limit, offset=offset, after=cursor)
     users = await handler.handle(query)
     if not users:
         click.echo("No users found.")
@@ -79,16 +104,125 @@ async def list_(conn: AsyncConnection, limit: int, offset: int):
     table_data = [[str(u.id), u.email, u.first_name, u.last_name] for u in users]
     headers = ["User ID", "Email", "First Name", "Last Name"]
     click.echo(tabulate(table_data, headers=headers, tablefmt="simple"))
+    if len(users) == limit:
+        click.echo(f"Next page: --after {UserCursor.of(users[-1])}")
+
+
+FILTER_FIELDS = ("email_domain", "first_name", "last_name")
+
+
+def filter_options(function):
+    """Decorator adding the options selecting a set of users to a CLI command."""
+    function = click.option(
+        "--where",
+        multiple=True,
+        metavar="FIELD=VALUE",
+        help=f"Select the users by {', '.join(FILTER_FIELDS)} (repeatable).",
+    )(function)
+    function = click.option(
+        "--email-domain", help="Select the users of an email domain (case insensitive)."
+    )(function)
+    return function
+
+
+def user_filter(email_domain: str | None, where: tuple[str, ...]) -> UserFilter | None:
+    """The filter of the `--email-domain` and `--where` options, `None` if not given."""
+    criteria = {"email_domain": email_domain} if email_domain else {}
+    for criterion in where:
+        field, separator, value = criterion.partition("=")
+        if not separator or field not in FILTER_FIELDS:
+            raise click.BadParameter(
+                f"{criterion!r} is not FIELD=VALUE, FIELD being one of {', '.join(FILTER_FIELDS)}",
+                param_hint="--where",
+            )
+        criteria[field] = value
+    return UserFilter(**criteria) if criteria else None
 
 
 @users.command()
-@click.argument("email", type=str)
+@click.argument("email", type=str, required=False)
 @click.option("--first-name", help="New first name.")
 @click.option("--last-name", help="New last name.")
+@filter_options
+@click.option(
+    "--from-file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="CSV or JSONL file of the new names of the users, by email.",
+)
+@click.option(
+    "--format", "format_", type=click.Choice(FORMATS), help="File format, from its extension."
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="Number of users updated per transaction.",
+)
+@click.option("--dry-run", is_flag=True, help="Count the users to update, changing nothing.")
 @with_async_database_connection
-async def update(conn: AsyncConnection, email: str, first_name: str | None, last_name: str | None):
-    """Update an existing user from the system."""
+async def update(
+    conn: AsyncConnection,
+    email: str | None,
+    first_name: str | None,
+    last_name: str | None,
+    email_domain: str | None,
+    where: tuple[str, ...],
+    from_file: Path | None,
+    format_: str | None,
+    batch_size: int,
+    dry_run: bool,
+):
+    """Update an existing user, the users matching a filter, or those of a file.
+
+    Filtered and file updates run by batches, each committed on its own.
+    """
+    filter_ = user_filter(email_domain, where)
+    if [email, filter_, from_file].count(None) != 2:
+        raise click.UsageError(
+            "Missing argument 'EMAIL', or else one of --email-domain/--where or --from-file."
+        )
+    if email is not None and dry_run:
+        raise click.UsageError("Option '--dry-run' needs a filter or --from-file.")
+    if from_file is not None and (first_name is not None or last_name is not None):
+        raise click.UsageError(
+            "Options '--first-name' and '--last-name' cannot be used with --from-file."
+        )
     storage = PostgresUserStorage(conn)
+
+    if from_file is not None:
+        try:
+            format_ = file_format(from_file, format_)
+        except ValueError as exc:
+            raise click.BadParameter(str(exc), param_hint="--format") from exc
+        by_email_handler = UpdateUsersByEmailHandler(storage)
+        total = 0
+        batch: list[CreateUser] = []
+        for row in read_rows(from_file, format_):
+            if row.user is None:
+                click.echo(f"Line {row.line}: {row.error}", err=True)
+                continue
+            batch.append(row.user)
+            if len(batch) == batch_size:
+                total += await by_email_handler.handle(UpdateUsersByEmail(batch, dry_run))
+                await conn.commit()
+                batch = []
+        total += await by_email_handler.handle(UpdateUsersByEmail(batch, dry_run))
+        await conn.commit()
+        click.echo(f"{total} users to update." if dry_run else f"{total} users updated.")
+        return
+
+    if filter_ is not None:
+        if first_name is None and last_name is None:
+            raise click.UsageError("Missing option '--first-name' or '--last-name'.")
+        matching_handler = UpdateUsersHandler(storage)
+        command = UpdateUsers(filter_, first_name, last_name, batch_size, dry_run)
+        total = 0
+        async for count in matching_handler.handle(command):
+            await conn.commit()
+            total += count
+        click.echo(f"{total} users to update." if dry_run else f"{total} users updated.")
+        return
+
     handler = UpdateUserHandler(storage)
 
     command = UpdateUser(email=email, first_name=first_name, last_name=last_name)
@@ -99,11 +233,45 @@ async def update(conn: AsyncConnection, email: str, first_name: str | None, last
 
 
 @users.command()
-@click.argument("email", type=str)
+@click.argument("email", type=str, required=False)
+@filter_options
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="Number of users deleted per transaction.",
+)
+@click.option("--dry-run", is_flag=True, help="Count the users to delete, deleting nothing.")
 @with_async_database_connection
-async def delete(conn: AsyncConnection, email: str):
-    """Delete a user from the system."""
+async def delete(
+    conn: AsyncConnection,
+    email: str | None,
+    email_domain: str | None,
+    where: tuple[str, ...],
+    batch_size: int,
+    dry_run: bool,
+):
+    """Delete a user, or the users matching a filter, from the system.
+
+    Filtered deletes run by batches, each committed on its own.
+    """
+    filter_ = user_filter(email_domain, where)
+    if (email is None) == (filter_ is None):
+        raise click.UsageError("Missing argument 'EMAIL', or else --email-domain/--where.")
+    if email is not None and dry_run:
+        raise click.UsageError("Option '--dry-run' needs a filter.")
     storage = PostgresUserStorage(conn)
+
+    if filter_ is not None:
+        matching_handler = DeleteUsersHandler(storage)
+        command = DeleteUsers(filter=filter_, batch_size=batch_size, dry_run=dry_run)
+        total = 0
+        async for count in matching_handler.handle(command):
+            await conn.commit()
+            total += count
+        click.echo(f"{total} users match." if dry_run else f"{total} users deleted.")
+        return
+
     handler = DeleteUserHandler(storage)
 
     command = DeleteUser(email=email)
@@ -111,3 +279,102 @@ async def delete(conn: AsyncConnection, email: str):
     await conn.commit()
 
     click.echo(f"User {email} deleted.")
+
+
+@users.command(name="import")
+@click.argument("file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--format", "format_", type=click.Choice(FORMATS), help="File format, from its extension."
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="Number of users inserted per transaction.",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Progress file to resume from, FILE.checkpoint by default.",
+)
+@with_async_database_connection
+async def import_(
+    conn: AsyncConnection,
+    file: Path,
+    format_: str | None,
+    batch_size: int,
+    checkpoint: Path | None,
+):
+    """Import users from a CSV or JSONL file.
+
+    Each batch is committed on its own, then recorded in the checkpoint file: an interrupted
+    import resumes after the last committed batch. Invalid rows, and users already stored,
+    are reported and skipped.
+    """
+    try:
+        format_ = file_format(file, format_)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--format") from exc
+    storage = PostgresUserStorage(conn)
+    handler = ImportUsersHandler(storage)
+    progress = Checkpoint(checkpoint or file.with_name(f"{file.name}.checkpoint"))
+
+    done = progress.load()
+    if done:
+        click.echo(f"Resuming after {done} rows.")
+    imported = rejected = 0
+    batch: list[Row] = []
+
+    async def flush():
+        nonlocal imported, rejected
+        result = await handler.handle(ImportUsers(users=[row.user for row in batch if row.user]))
+        await conn.commit()
+        progress.save(done)
+        rejected_ids = {user.id for user in result.rejected}
+        lines = (row.line for row in batch if row.user)
+        for line, user in zip(lines, result.users):
+            if user.id in rejected_ids:
+                click.echo(f"Line {line}: user {user.email} already exists.", err=True)
+        imported += len(result.users) - len(result.rejected)
+        rejected += len(result.rejected)
+        batch.clear()
+
+    for row in read_rows(file, format_, skip=done):
+        done += 1
+        if row.error:
+            click.echo(f"Line {row.line}: {row.error}", err=True)
+            rejected += 1
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+    progress.clear()
+
+    click.echo(f"{imported} users imported, {rejected} rejected.")
+
+
+@users.command()
+@click.option("--format", "format_", type=click.Choice(FORMATS), default="csv", show_default=True)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w", encoding="utf-8", lazy=True),
+    default="-",
+    help="File to write to, stdout by default.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    help="Number of users fetched per query.",
+)
+@with_async_database_connection
+async def export(conn: AsyncConnection, format_: str, output: TextIO, batch_size: int):
+    """Export all users to a CSV or JSONL file, in constant memory."""
+    storage = PostgresUserStorage(conn)
+    handler = ExportUsersHandler(storage)
+
+    query = ExportUsers(batch_size=batch_size)
+    write = user_writer(output, format_)
+    async for user in handler.handle(query):
+        write(user)
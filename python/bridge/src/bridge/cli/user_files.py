@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Annotated
+from typing import Callable
+from typing import Iterator
+from typing import TextIO
+
+from pydantic import StringConstraints
+from pydantic import TypeAdapter
+from pydantic import ValidationError
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.services.create_user import CreateUser
+
+FORMATS = ("csv", "jsonl")
+EXPORT_COLUMNS = ("id", "email", "first_name", "last_name")
+
+Name = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=255)]
+Email = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, max_length=255, pattern=r"^[^@\s]+@[^@\s]+$"),
+]
+
+
+@dataclass(frozen=True)
+class UserRow:
+    """A user, as a row of an import file (any other column being ignored)."""
+
+    email: Email
+    first_name: Name
+    last_name: Name
+
+
+# built once, since building a TypeAdapter compiles its validator
+user_row = TypeAdapter(UserRow)
+
+
+@dataclass(frozen=True)
+class Row:
+    """A row read from an import file, either valid or rejected with an error."""
+
+    line: int
+    user: CreateUser | None = None
+    error: str | None = None
+
+
+def file_format(path: Path, default: str | None = None) -> str:
+    """The format of a file: the given one, or guessed from the file extension."""
+    guessed = default or path.suffix.lstrip(".").lower()
+    if guessed not in FORMATS:
+        raise ValueError(f"Unknown file format {guessed!r}, expected one of {', '.join(FORMATS)}")
+    return guessed
+
+
+def read_rows(path: Path, format_: str, skip: int = 0) -> Iterator[Row]:
+    """Stream the rows of a CSV (with a header) or JSONL file, after the first `skip` ones."""
+    with path.open(newline="", encoding="utf-8") as file:
+        if format_ == "csv":
+            reader = csv.DictReader(file)
+            for record in islice(reader, skip, None):
+                yield _validate(reader.line_num, user_row.validate_python, record)
+        else:
+            lines = ((number, line) for number, line in enumerate(file, 1) if line.strip())
+            for number, line in islice(lines, skip, None):
+                yield _validate(number, user_row.validate_json, line)
+
+
+def _validate(line: int, validate, record) -> Row:
+    """Validate a record of an import file."""
+    try:
+        row = validate(record)
+    except ValidationError as exc:
+        errors = (
+            f"{'.'.join(map(str, error['loc']))}: {error['msg']}" if error["loc"] else error["msg"]
+            for error in exc.errors()
+        )
+        return Row(line, error="; ".join(errors))
+    return Row(line, user=CreateUser(row.email, row.first_name, row.last_name))
+
+
+def user_writer(output: TextIO, format_: str) -> Callable[[User], None]:
+    """A function writing users to a CSV (with a header) or JSONL file, one row at a time."""
+    if format_ == "csv":
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(EXPORT_COLUMNS)
+        return lambda user: writer.writerow(_export_row(user))
+    return lambda user: output.write(
+        json.dumps(dict(zip(EXPORT_COLUMNS, _export_row(user)))) + "\n"
+    )
+
+
+def _export_row(user: User) -> tuple[str, str, str, str]:
+    """The exported fields of a user."""
+    return str(user.id), user.email, user.first_name, user.last_name
+
+
+class Checkpoint:
+    """The number of rows of a file already processed, stored in a file next to it."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> int:
+        """The number of rows already processed, 0 if none."""
+        try:
+            return int(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return 0
+
+    def save(self, rows: int):
+        """Record the number of rows processed, atomically."""
+        temporary = self.path.with_name(f".{self.path.name}.tmp")
+        temporary.write_text(str(rows), encoding="utf-8")
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        """Forget the progress, once the whole file is processed."""
+        self.path.unlink(missing_ok=True)
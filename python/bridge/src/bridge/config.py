@@ -26,4 +26,26 @@ class DatabaseConfig:
         return self.path == ":memory:"
 
 
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Configuration for the upstream users API."""
+
+    url: str = field(default_factory=lambda: os.getenv("UPSTREAM_URL", "https://dummyjson.com"))
+    page_size: int = field(default_factory=lambda: int(os.getenv("UPSTREAM_PAGE_SIZE", "100")))
+    concurrency: int = field(default_factory=lambda: int(os.getenv("UPSTREAM_CONCURRENCY", "4")))
+    timeout: float = field(default_factory=lambda: float(os.getenv("UPSTREAM_TIMEOUT", "10")))
+    max_retries: int = field(default_factory=lambda: int(os.getenv("UPSTREAM_MAX_RETRIES", "5")))
+    backoff: float = field(default_factory=lambda: float(os.getenv("UPSTREAM_BACKOFF", "0.5")))
+    max_backoff: float = field(
+        default_factory=lambda: float(os.getenv("UPSTREAM_MAX_BACKOFF", "30"))
+    )
+    failure_threshold: int = field(
+        default_factory=lambda: int(os.getenv("UPSTREAM_FAILURE_THRESHOLD", "5"))
+    )
+    reset_timeout: float = field(
+        default_factory=lambda: float(os.getenv("UPSTREAM_RESET_TIMEOUT", "30"))
+    )
+
+
 database = DatabaseConfig()
+upstream = UpstreamConfig()
@@ -0,0 +1,29 @@
+"""add users listing index
+
+Revision ID: 3f1c8e2b7a94
+Revises: 55e0e2a96507
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+# fmt: off
+# pylint: disable=no-member, line-too-long
+from typing import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c8e2b7a94"
+down_revision: Union[str, None] = "55e0e2a96507"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade from `55e0e2a96507` to `3f1c8e2b7a94`."""
+    op.create_index("ix_users_created_at", "users", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade from `3f1c8e2b7a94` to `55e0e2a96507`."""
+    op.drop_index("ix_users_created_at", table_name="users")
@@ -0,0 +1,78 @@
+"""add users content hash
+
+Revision ID: 8d2a6c4f1e07
+Revises: 3f1c8e2b7a94
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+# fmt: off
+# pylint: disable=no-member
+import hashlib
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2a6c4f1e07"
+down_revision: Union[str, None] = "3f1c8e2b7a94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10_000
+
+
+def content_hash(email: str, first_name: str, last_name: str) -> str:
+    """The content hash of a user, as computed by this revision."""
+    content = "\0".join((email, first_name, last_name))
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade from `3f1c8e2b7a94` to `8d2a6c4f1e07`."""
+    op.add_column("users", sa.Column("content_hash", sa.CHAR(length=32), nullable=True))
+
+    # hash the stored users, by keyset batches of ids
+    users = sa.table(
+        "users",
+        sa.column("id"),
+        sa.column("email"),
+        sa.column("first_name"),
+        sa.column("last_name"),
+        sa.column("content_hash"),
+    )
+    connection = op.get_bind()
+    stmt = (
+        users.update()
+        .where(users.c.id == sa.bindparam("b_id"))
+        .values(content_hash=sa.bindparam("b_content_hash"))
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(users.c.id, users.c.email, users.c.first_name, users.c.last_name)
+            .order_by(users.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(users.c.id > last_id)
+        rows = connection.execute(query).fetchall()
+        if not rows:
+            return
+        connection.execute(
+            stmt,
+            [
+                {
+                    "b_id": row.id,
+                    "b_content_hash": content_hash(row.email, row.first_name, row.last_name),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade from `8d2a6c4f1e07` to `3f1c8e2b7a94`."""
+    op.drop_column("users", "content_hash")
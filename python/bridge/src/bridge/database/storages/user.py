@@ -1,11 +1,25 @@
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import ColumnElement
+from sqlalchemy import Select
+from sqlalchemy import and_
+from sqlalchemy import bindparam
 from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import or_
 from sqlalchemy import select
+from sqlalchemy import true
+from sqlalchemy import tuple_
 from sqlalchemy import update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 from bridge.database.tables.users import users
 from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_cursor import UserCursor
+from bridge.domain.users.models.user_digest import UserDigest
+from bridge.domain.users.models.user_filter import UserFilter
 from bridge.domain.users.storages.interface import UserStorage
 
 
@@ -21,9 +35,66 @@ class PostgresUserStorage(UserStorage):
             email=user.email,
             first_name=user.first_name,
             last_name=user.last_name,
+            content_hash=user.content_hash,
         )
         await self._connection.execute(stmt)
 
+    async def insert_many(self, batch: list[User]) -> list[User]:
+        if not batch:
+            return []
+        stmt = insert(users).on_conflict_do_nothing().returning(users.c.id)
+        result = await self._connection.execute(
+            stmt,
+            [
+                {
+                    "id": user.id,
+                    "email": user.email,
+                    "first_name": user.first_name,
+                    "last_name": user.last_name,
+                    "content_hash": user.content_hash,
+                }
+                for user in batch
+            ],
+        )
+        inserted = set(result.scalars())
+        return [user for user in batch if user.id not in inserted]
+
+    async def upsert_many(self, batch: list[User]) -> int:
+        if not batch:
+            return 0
+        stmt = insert(users)
+        # the users already stored are matched by email, and written only if their names change
+        # (or their content hash is unknown)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[users.c.email],
+            set_={
+                "first_name": stmt.excluded.first_name,
+                "last_name": stmt.excluded.last_name,
+                "content_hash": stmt.excluded.content_hash,
+            },
+            where=or_(
+                users.c.first_name != stmt.excluded.first_name,
+                users.c.last_name != stmt.excluded.last_name,
+                users.c.content_hash.is_distinct_from(stmt.excluded.content_hash),
+            ),
+        ).returning(users.c.id)
+        # the statement may be sent as one multi-row insert, which may not write a row twice
+        unique = {user.email: user for user in batch}
+        result = await self._connection.execute(
+            stmt,
+            [
+                {
+                    "id": user.id,
+                    "email": user.email,
+                    "first_name": user.first_name,
+                    "last_name": user.last_name,
+                    "content_hash": user.content_hash,
+                }
+                for user in unique.values()
+            ],
+        )
+        return len(result.all())
+
     async def update(self, user: User):
         stmt = (
             update(users)
@@ -32,10 +103,100 @@ class PostgresUserStorage(UserStorage):
                 email=user.email,
                 first_name=user.first_name,
                 last_name=user.last_name,
+                content_hash=user.content_hash,
             )
         )
         await self._connection.execute(stmt)
 
+    async def update_by_email(
+        self, email: str, first_name: str | None = None, last_name: str | None = None
+    ) -> User | None:
+        changes = _changes(first_name, last_name)
+        if not changes:
+            return await self.fetch_by(email)
+        # only the given columns are written, and only when one of them changes
+        changed = _changed(changes)
+        # the content hash is known only when both names are given
+        content_hash = (
+            User(email, first_name, last_name).content_hash
+            if first_name is not None and last_name is not None
+            else None
+        )
+        stmt = (
+            update(users)
+            .where(users.c.email == email, changed)
+            .values(**changes, content_hash=content_hash)
+            .returning(users.c.id, users.c.email, users.c.first_name, users.c.last_name)
+        )
+        result = await self._connection.execute(stmt)
+        row = result.fetchone()
+
+        if row is None:
+            # no such user, or nothing to change
+            return await self.fetch_by(email)
+
+        return User(
+            id_=row.id,
+            email=row.email,
+            first_name=row.first_name,
+            last_name=row.last_name,
+        )
+
+    async def update_many(self, batch: list[User]) -> int:
+        if not batch:
+            return 0
+        # one statement run for every user (executemany), writing the changed rows only
+        stmt = (
+            update(users)
+            .where(
+                users.c.email == bindparam("b_email"),
+                or_(
+                    users.c.first_name != bindparam("b_first_name"),
+                    users.c.last_name != bindparam("b_last_name"),
+                ),
+            )
+            .values(
+                first_name=bindparam("b_first_name"),
+                last_name=bindparam("b_last_name"),
+                content_hash=bindparam("b_content_hash"),
+            )
+        )
+        result = await self._connection.execute(
+            stmt,
+            [
+                {
+                    "b_email": user.email,
+                    "b_first_name": user.first_name,
+                    "b_last_name": user.last_name,
+                    "b_content_hash": user.content_hash,
+                }
+                for user in batch
+            ],
+        )
+        return result.rowcount
+
+    async def update_where(
+        self,
+        filter_: UserFilter,
+        limit: int,
+        after: UUID | None = None,
+        first_name: str | None = None,
+        last_name: str | None = None,
+    ) -> list[UUID]:
+        changes = _changes(first_name, last_name)
+        if not changes:
+            return []
+        ids = _batch_ids(and_(_matching(filter_), _changed(changes)), limit, after)
+        # the content hash of every user would take hashing its row: it becomes unknown
+        stmt = (
+            update(users)
+            .where(users.c.id.in_(ids))
+            .values(**changes, content_hash=None)
+            .returning(users.c.id)
+        )
+        result = await self._connection.execute(stmt)
+        return list(result.scalars())
+
     async def fetch_by(self, email: str) -> User | None:
         stmt = select(users).where(users.c.email == email)
         result = await self._connection.execute(stmt)
@@ -49,10 +210,20 @@ class PostgresUserStorage(UserStorage):
             email=row.email,
             first_name=row.first_name,
             last_name=row.last_name,
+            created_at=row.created_at,
         )
 
-    async def fetch_all(self, limit: int, offset: int) -> list[User]:
-        stmt = select(users).limit(limit).offset(offset).order_by(users.c.created_at)
+    async def fetch_all(
+        self, limit: int, offset: int, after: UserCursor | None = None
+    ) -> list[User]:
+        # ordered along the (created_at, id) index, so that no page sorts the table
+        stmt = select(users).limit(limit).offset(offset).order_by(users.c.created_at, users.c.id)
+        if after is not None:
+            # keyset pagination: the pages after a cursor are index range scans, from its
+            # sort key (the user of the cursor may be gone), bound as the columns are
+            stmt = stmt.where(
+                tuple_(users.c.created_at, users.c.id) > (after.created_at, after.id)
+            )
         result = await self._connection.execute(stmt)
         rows = result.fetchall()
 
@@ -62,10 +233,148 @@ class PostgresUserStorage(UserStorage):
                 email=row.email,
                 first_name=row.first_name,
                 last_name=row.last_name,
+                created_at=row.created_at,
             )
             for row in rows
         ]
 
+    async def count_where(
+        self, filter_: UserFilter, first_name: str | None = None, last_name: str | None = None
+    ) -> int:
+        condition = _matching(filter_)
+        changes = _changes(first_name, last_name)
+        if changes:
+            # the users an update would change, like `update_where`
+            condition = and_(condition, _changed(changes))
+        stmt = select(func.count()).select_from(users).where(condition)
+        result = await self._connection.execute(stmt)
+        return result.scalar_one()
+
+    async def count_changes(self, batch: list[User]) -> int:
+        names = {user.email: (user.first_name, user.last_name) for user in batch}
+        stmt = select(users.c.email, users.c.first_name, users.c.last_name).where(
+            users.c.email.in_(names)
+        )
+        result = await self._connection.execute(stmt)
+        return sum(1 for row in result if names[row.email] != (row.first_name, row.last_name))
+
+    async def iter_all(self, batch_size: int) -> AsyncIterator[User]:
+        last_id: UUID | None = None
+        while True:
+            # keyset pagination on the (time ordered uuid7) primary key: every batch is an
+            # index range scan, read from a server-side cursor a partition at a time
+            stmt = select(users).order_by(users.c.id).limit(batch_size)
+            if last_id is not None:
+                stmt = stmt.where(users.c.id > last_id)
+            result = await self._connection.stream(stmt.execution_options(yield_per=batch_size))
+            count = 0
+            async for partition in result.partitions():
+                for row in partition:
+                    yield User(
+                        id_=row.id,
+                        email=row.email,
+                        first_name=row.first_name,
+                        last_name=row.last_name,
+                        created_at=row.created_at,
+                    )
+                count += len(partition)
+                last_id = partition[-1].id
+            if count < batch_size:
+                return
+
+    async def iter_digests(self, batch_size: int) -> AsyncIterator[UserDigest]:
+        last_email: str | None = None
+        while True:
+            # keyset pagination along the unique email index, every batch being read at
+            # once: the users may be written between two batches
+            stmt = (
+                select(users.c.id, users.c.email, users.c.content_hash)
+                .order_by(users.c.email)
+                .limit(batch_size)
+            )
+            if last_email is not None:
+                stmt = stmt.where(users.c.email > last_email)
+            result = await self._connection.execute(stmt)
+            rows = result.fetchall()
+            for row in rows:
+                yield UserDigest(id=row.id, email=row.email, content_hash=row.content_hash)
+            if len(rows) < batch_size:
+                return
+            last_email = rows[-1].email
+
     async def delete(self, user: User):
         stmt = delete(users).where(users.c.id == user.id)
         await self._connection.execute(stmt)
+
+    async def delete_by_email(self, email: str) -> User | None:
+        stmt = (
+            delete(users)
+            .where(users.c.email == email)
+            .returning(users.c.id, users.c.email, users.c.first_name, users.c.last_name)
+        )
+        result = await self._connection.execute(stmt)
+        row = result.fetchone()
+
+        if row is None:
+            return None
+
+        return User(
+            id_=row.id,
+            email=row.email,
+            first_name=row.first_name,
+            last_name=row.last_name,
+        )
+
+    async def delete_many(self, ids: list[UUID]) -> int:
+        if not ids:
+            return 0
+        stmt = delete(users).where(users.c.id.in_(ids))
+        result = await self._connection.execute(stmt)
+        return result.rowcount
+
+    async def delete_where(
+        self, filter_: UserFilter, limit: int, after: UUID | None = None
+    ) -> list[UUID]:
+        ids = _batch_ids(_matching(filter_), limit, after)
+        stmt = delete(users).where(users.c.id.in_(ids)).returning(users.c.id)
+        result = await self._connection.execute(stmt)
+        return list(result.scalars())
+
+
+def _matching(filter_: UserFilter) -> ColumnElement[bool]:
+    """The condition on the users matched by a filter."""
+    conditions = []
+    if filter_.email_domain is not None:
+        # LIKE is case insensitive (for ASCII characters) in SQLite
+        conditions.append(users.c.email.endswith(f"@{filter_.email_domain}", autoescape=True))
+    if filter_.first_name is not None:
+        conditions.append(users.c.first_name == filter_.first_name)
+    if filter_.last_name is not None:
+        conditions.append(users.c.last_name == filter_.last_name)
+    return and_(true(), *conditions)
+
+
+def _changes(first_name: str | None, last_name: str | None) -> dict[str, str]:
+    """The values of the given names, by column."""
+    return {
+        column: value
+        for column, value in (("first_name", first_name), ("last_name", last_name))
+        if value is not None
+    }
+
+
+def _changed(changes: dict[str, str]) -> ColumnElement[bool]:
+    """The condition on the users some of whose columns differ from the given values."""
+    return or_(*(users.c[column] != value for column, value in changes.items()))
+
+
+def _batch_ids(condition: ColumnElement[bool], limit: int, after: UUID | None) -> Select:
+    """The ids of the next batch of users meeting a condition, by id after the given one.
+
+    Resuming after the last id of the previous batch, rather than from the start, the
+    batches scan the table once overall.
+    """
+    stmt = select(users.c.id).where(condition).order_by(users.c.id).limit(limit)
+    if after is not None:
+        stmt = stmt.where(users.c.id > after)
+    return stmt
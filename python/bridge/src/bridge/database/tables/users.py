@@ -1,14 +1,26 @@
 # pylint: disable=not-callable
 
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Table
 from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import DATETIME
+from sqlalchemy.types import CHAR
 from sqlalchemy.types import TIMESTAMP
 from sqlalchemy.types import UUID
 from sqlalchemy.types import VARCHAR
 
 from bridge.database.core import metadata
 
+# SQLite stores CURRENT_TIMESTAMP as text, to the second: the bound creation times are
+# written the same way, so that they compare with the stored ones
+CREATED_AT = TIMESTAMP(timezone=True).with_variant(
+    DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
 users = Table(
     "users",
     metadata,
@@ -16,5 +28,9 @@ users = Table(
     Column("email", VARCHAR(255), unique=True, nullable=False),
     Column("first_name", VARCHAR(255), nullable=False),
     Column("last_name", VARCHAR(255), nullable=False),
-    Column("created_at", TIMESTAMP(timezone=True), server_default=func.now(), nullable=False),
+    # the hash of the synchronised fields, NULL when unknown (see `User.content_hash`)
+    Column("content_hash", CHAR(32), nullable=True),
+    Column("created_at", CREATED_AT, server_default=func.now(), nullable=False),
+    # the listing order, unique thanks to the id (creation times are to the second)
+    Index("ix_users_created_at", "created_at", "id"),
 )
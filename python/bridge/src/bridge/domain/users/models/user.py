@@ -1,4 +1,7 @@
+import hashlib
 from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
 from uuid import UUID
 
 from uuid6 import uuid7
@@ -12,6 +15,8 @@ class User:
     email: str
     first_name: str
     last_name: str
+    # when the user was stored, if known: set by the storages, not part of its content
+    created_at: datetime | None = field(default=None, compare=False)
 
     def __init__(
         self,
@@ -19,8 +24,16 @@ class User:
         first_name: str,
         last_name: str,
         id_: UUID | None = None,
+        created_at: datetime | None = None,
     ):
         self.id = id_ or uuid7()
         self.email = email
         self.first_name = first_name
         self.last_name = last_name
+        self.created_at = created_at
+
+    @property
+    def content_hash(self) -> str:
+        """A hash of the synchronised fields, telling whether a stored copy is up to date."""
+        content = "\0".join((self.email, self.first_name, self.last_name))
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
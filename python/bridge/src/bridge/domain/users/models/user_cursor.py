@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from bridge.domain.users.models.user import User
+
+
+@dataclass(frozen=True)
+class UserCursor:
+    """The position of a user in the listing order: its creation time, then its id.
+
+    A cursor holds the sort key itself, rather than the user: the page after it starts at
+    the first user sorting after that key, whether the user still exists or not.
+    """
+
+    created_at: datetime
+    id: UUID
+
+    @classmethod
+    def of(cls, user: User) -> "UserCursor":
+        """The cursor right after a stored user."""
+        if user.created_at is None:
+            raise ValueError(f"User {user.id} has no creation time")
+        return cls(created_at=user.created_at, id=user.id)
+
+    @classmethod
+    def parse(cls, value: str) -> "UserCursor":
+        """Parse a cursor from its text form, `<created_at ISO 8601>_<id>`."""
+        created_at, separator, id_ = value.rpartition("_")
+        if not separator:
+            raise ValueError(f"Invalid user cursor {value!r}")
+        try:
+            return cls(created_at=datetime.fromisoformat(created_at), id=UUID(id_))
+        except ValueError as exc:
+            raise ValueError(f"Invalid user cursor {value!r}") from exc
+
+    def __str__(self) -> str:
+        return f"{self.created_at.isoformat()}_{self.id}"
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class UserDigest:
+    """A stored user, as its id, email and content hash.
+
+    The content hash is unknown (`None`) for the users last written by a set-based update.
+    """
+
+    id: UUID
+    email: str
+    content_hash: str | None
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+from bridge.domain.users.models.user import User
+
+
+@dataclass(frozen=True)
+class UserFilter:
+    """A set of users, by email domain (case insensitive) and names.
+
+    A `None` criterion matches every user.
+    """
+
+    email_domain: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+
+    def matches(self, user: User) -> bool:
+        """Whether the filter matches the given user."""
+        return (
+            (
+                self.email_domain is None
+                or user.email.lower().endswith(f"@{self.email_domain.lower()}")
+            )
+            and (self.first_name is None or user.first_name == self.first_name)
+            and (self.last_name is None or user.last_name == self.last_name)
+        )
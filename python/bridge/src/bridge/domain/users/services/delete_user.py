@@ -22,13 +22,10 @@ class DeleteUserHandler:
     async def handle(self, command: DeleteUser) -> User:
         """Handles the delete user command."""
 
-        # fetch user matching email
-        user = await self.users.fetch_by(command.email)
+        # delete the user matching email, in one statement
+        user = await self.users.delete_by_email(command.email)
         if not user:
             raise RuntimeError("User not found")
 
-        # persist user deletion
-        await self.users.delete(user)
-
         # return deleted user
         return user
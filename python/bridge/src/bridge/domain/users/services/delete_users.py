@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from bridge.domain.users.models.user_filter import UserFilter
+from bridge.domain.users.storages.interface import UserStorage
+
+
+@dataclass(frozen=True)
+class DeleteUsers:
+    """The delete users command payload, for every user matching a filter."""
+
+    filter: UserFilter
+    batch_size: int
+    dry_run: bool = False
+
+
+class DeleteUsersHandler:
+    """The delete users command handler."""
+
+    users: UserStorage
+
+    def __init__(self, users: UserStorage):
+        self.users = users
+
+    async def handle(self, command: DeleteUsers) -> AsyncIterator[int]:
+        """Handles the delete users command, a batch at a time.
+
+        Yields the number of users deleted by each batch, once it is done: the caller may
+        commit every batch on its own. A dry run yields the number of matching users only.
+        """
+
+        # count matching users, on a dry run
+        if command.dry_run:
+            yield await self.users.count_where(command.filter)
+            return
+
+        # delete matching users by batches, each resuming after the previous one
+        after = None
+        while ids := await self.users.delete_where(command.filter, command.batch_size, after):
+            yield len(ids)
+            after = max(ids)
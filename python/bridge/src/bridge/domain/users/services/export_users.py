@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.storages.interface import UserStorage
+
+
+@dataclass(frozen=True)
+class ExportUsers:
+    """The export users query payload."""
+
+    batch_size: int
+
+
+class ExportUsersHandler:
+    """The export users query handler."""
+
+    users: UserStorage
+
+    def __init__(self, users: UserStorage):
+        self.users = users
+
+    async def handle(self, query: ExportUsers) -> AsyncIterator[User]:
+        """Handles the export users query, streaming every user."""
+
+        # stream all users, fetched by batches
+        async for user in self.users.iter_all(query.batch_size):
+            yield user
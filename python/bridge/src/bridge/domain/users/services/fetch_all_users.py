@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_cursor import UserCursor
 from bridge.domain.users.storages.interface import UserStorage
 
 
@@ -10,6 +11,7 @@ class FetchAllUsers:
 
     limit: int
     offset: int
+    after: UserCursor | None = None
 
 
 class FetchAllUsersHandler:
@@ -23,10 +25,11 @@ class FetchAllUsersHandler:
     async def handle(self, query: FetchAllUsers) -> list[User]:
         """Handles The fetch all users query."""
 
-        # fetch all users with pagination
+        # fetch all users with pagination, after the cursor if any
         users = await self.users.fetch_all(
             offset=query.offset,
             limit=query.limit,
+            after=query.after,
         )
 
         # return fetched users
@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.services.create_user import CreateUser
+from bridge.domain.users.storages.interface import UserStorage
+
+
+@dataclass(frozen=True)
+class ImportUsers:
+    """The import users command payload, a batch of users to create."""
+
+    users: list[CreateUser]
+
+
+@dataclass(frozen=True)
+class ImportedUsers:
+    """The import users command outcome.
+
+    The users created, in the payload order, and those rejected as already stored.
+    """
+
+    users: list[User]
+    rejected: list[User]
+
+
+class ImportUsersHandler:
+    """The import users command handler."""
+
+    users: UserStorage
+
+    def __init__(self, users: UserStorage):
+        self.users = users
+
+    async def handle(self, command: ImportUsers) -> ImportedUsers:
+        """Handles the import users command."""
+
+        # create new users
+        users = [
+            User(
+                email=payload.email,
+                first_name=payload.first_name,
+                last_name=payload.last_name,
+            )
+            for payload in command.users
+        ]
+
+        # persist created users, those already stored (e.g. by email) being rejected
+        rejected = await self.users.insert_many(users)
+
+        # return created and rejected users
+        return ImportedUsers(users=users, rejected=rejected)
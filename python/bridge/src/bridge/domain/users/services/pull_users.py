@@ -0,0 +1,85 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.sources.interface import UserSource
+from bridge.domain.users.storages.interface import UserStorage
+
+
+@dataclass(frozen=True)
+class PullUsers:
+    """The pull users command payload."""
+
+    page_size: int
+    concurrency: int
+    batch_size: int
+
+
+@dataclass(frozen=True)
+class PulledUsers:
+    """A batch of pulled users, once stored."""
+
+    received: int
+    changed: int
+
+
+class PullUsersHandler:
+    """The pull users command handler."""
+
+    users: UserStorage
+    source: UserSource
+
+    def __init__(self, users: UserStorage, source: UserSource):
+        self.users = users
+        self.source = source
+
+    async def handle(self, command: PullUsers) -> AsyncIterator[PulledUsers]:
+        """Handles the pull users command.
+
+        Once the first page gives the number of upstream users, `concurrency` fetchers
+        take the next pages, and put them in a bounded queue (holding them back when the
+        storage is slower than the source). The users are stored by batches of at least
+        `batch_size`, yielded once done: the caller may commit every batch on its own.
+        """
+
+        # fetch the first page, giving the number of pages
+        first = await self.source.fetch_page(0, command.page_size)
+        offsets = iter(range(command.page_size, first.total, command.page_size))
+        pages: asyncio.Queue[list[User] | Exception | None] = asyncio.Queue(
+            2 * command.concurrency
+        )
+        await pages.put(first.users)
+
+        # fetch the other pages concurrently, until none is left, then mark the end (or the
+        # first error) in the queue
+        async def fetch():
+            for offset in offsets:
+                page = await self.source.fetch_page(offset, command.page_size)
+                await pages.put(page.users)
+
+        async def fetch_all():
+            try:
+                async with asyncio.TaskGroup() as group:
+                    for _ in range(command.concurrency):
+                        group.create_task(fetch())
+            except ExceptionGroup as errors:
+                await pages.put(errors.exceptions[0])
+            else:
+                await pages.put(None)
+
+        fetcher = asyncio.create_task(fetch_all())
+        try:
+            # store the fetched users by batches
+            batch: list[User] = []
+            while (page := await pages.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                batch += page
+                if len(batch) >= command.batch_size:
+                    yield PulledUsers(len(batch), await self.users.upsert_many(batch))
+                    batch = []
+            if batch:
+                yield PulledUsers(len(batch), await self.users.upsert_many(batch))
+        finally:
+            fetcher.cancel()
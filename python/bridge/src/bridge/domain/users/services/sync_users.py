@@ -0,0 +1,134 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import AsyncIterator
+from uuid import UUID
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_digest import UserDigest
+from bridge.domain.users.sources.interface import UserSource
+from bridge.domain.users.storages.interface import UserStorage
+
+
+@dataclass(frozen=True)
+class SyncUsers:
+    """The sync users command payload, making the stored users a copy of the upstream ones."""
+
+    page_size: int
+    concurrency: int
+    batch_size: int
+    dry_run: bool = False
+
+
+@dataclass(frozen=True)
+class SyncedUsers:
+    """A batch of synchronised users (to be synchronised, on a dry run)."""
+
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+
+
+class SyncUsersHandler:
+    """The sync users command handler."""
+
+    users: UserStorage
+    source: UserSource
+
+    def __init__(self, users: UserStorage, source: UserSource):
+        self.users = users
+        self.source = source
+
+    async def handle(self, command: SyncUsers) -> AsyncIterator[SyncedUsers]:
+        """Handles the sync users command, a batch at a time.
+
+        The upstream users and the stored ones, both by email, are merged as two sorted
+        streams: an upstream user alone is inserted, a stored user alone is deleted, and a
+        stored user whose content hash differs from the upstream one is updated. Memory
+        holds `concurrency` pages, a batch of stored users and `batch_size` changes at most.
+        Yields every batch of changes once applied (or counted, on a dry run): the caller
+        may commit every batch on its own.
+        """
+        upserts: list[User] = []
+        deletes: list[UUID] = []
+        inserted = updated = unchanged = 0
+
+        async def apply() -> SyncedUsers:
+            nonlocal inserted, updated, unchanged
+            if not command.dry_run:
+                await self.users.upsert_many(upserts)
+                await self.users.delete_many(deletes)
+            batch = SyncedUsers(inserted, updated, len(deletes), unchanged)
+            upserts.clear()
+            deletes.clear()
+            inserted = updated = unchanged = 0
+            return batch
+
+        # merge the stored and the upstream users, collecting the changes by batches
+        stored_users = self.users.iter_digests(command.batch_size)
+        async for stored, upstream in _merge(stored_users, self._snapshot(command)):
+            if stored is None:
+                upserts.append(upstream)
+                inserted += 1
+            elif upstream is None:
+                deletes.append(stored.id)
+            elif stored.content_hash != upstream.content_hash:
+                upserts.append(upstream)
+                updated += 1
+            else:
+                unchanged += 1
+            if len(upserts) + len(deletes) >= command.batch_size:
+                yield await apply()
+
+        # apply the last changes
+        if upserts or deletes or unchanged:
+            yield await apply()
+
+    async def _snapshot(self, command: SyncUsers) -> AsyncIterator[User]:
+        """The upstream users by email, fetching up to `concurrency` pages ahead."""
+        first = await self.source.fetch_page(0, command.page_size)
+        offsets = iter(range(command.page_size, first.total, command.page_size))
+
+        def fetch(offset: int) -> asyncio.Task:
+            return asyncio.create_task(self.source.fetch_page(offset, command.page_size))
+
+        # the pages are awaited in order, unlike those of a pull, the next ones being
+        # fetched meanwhile
+        pending = deque(fetch(offset) for offset in islice(offsets, command.concurrency))
+        try:
+            for user in first.users:
+                yield user
+            while pending:
+                page = await pending.popleft()
+                pending.extend(fetch(offset) for offset in islice(offsets, 1))
+                for user in page.users:
+                    yield user
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _merge(
+    stored_users: AsyncIterator[UserDigest], upstream_users: AsyncIterator[User]
+) -> AsyncIterator[tuple[UserDigest | None, User | None]]:
+    """Merge-join two streams of users sorted by email, pairing the users by email."""
+    stored = await anext(stored_users, None)
+    upstream = await anext(upstream_users, None)
+    while stored is not None or upstream is not None:
+        if upstream is None or (stored is not None and stored.email < upstream.email):
+            yield stored, None
+            stored = await anext(stored_users, None)
+            continue
+        if stored is None or upstream.email < stored.email:
+            yield None, upstream
+        else:
+            yield stored, upstream
+            stored = await anext(stored_users, None)
+        previous, upstream = upstream.email, await anext(upstream_users, None)
+        if upstream is not None and upstream.email <= previous:
+            raise ValueError(
+                f"Upstream users not sorted by email: {upstream.email!r} after {previous!r}"
+            )
@@ -24,19 +24,14 @@ class UpdateUserHandler:
     async def handle(self, command: UpdateUser) -> User:
         """Handles the update user command."""
 
-        # fetch user matching email
-        user = await self.users.fetch_by(command.email)
+        # update the given names of the user matching email, in one statement
+        user = await self.users.update_by_email(
+            command.email,
+            first_name=command.first_name,
+            last_name=command.last_name,
+        )
         if not user:
             raise RuntimeError("User not found")
 
-        # update user according to command payload
-        if command.first_name is not None:
-            user.first_name = command.first_name
-        if command.last_name is not None:
-            user.last_name = command.last_name
-
-        # persist updated user
-        await self.users.update(user)
-
         # return updated user
         return user
@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_filter import UserFilter
+from bridge.domain.users.services.create_user import CreateUser
+from bridge.domain.users.storages.interface import UserStorage
+
+
+@dataclass(frozen=True)
+class UpdateUsers:
+    """The update users command payload, for every user matching a filter."""
+
+    filter: UserFilter
+    first_name: str | None
+    last_name: str | None
+    batch_size: int
+    dry_run: bool = False
+
+
+class UpdateUsersHandler:
+    """The update users command handler."""
+
+    users: UserStorage
+
+    def __init__(self, users: UserStorage):
+        self.users = users
+
+    async def handle(self, command: UpdateUsers) -> AsyncIterator[int]:
+        """Handles the update users command, a batch at a time.
+
+        Yields the number of users changed by each batch, once it is done: the caller may
+        commit every batch on its own. A dry run yields the number of users to change only:
+        the matching users whose names differ from the new ones.
+        """
+
+        # count the users to change, on a dry run
+        if command.dry_run:
+            yield await self.users.count_where(
+                command.filter, first_name=command.first_name, last_name=command.last_name
+            )
+            return
+
+        # update matching users by batches, each resuming after the previous one
+        after = None
+        while ids := await self.users.update_where(
+            command.filter,
+            command.batch_size,
+            after,
+            first_name=command.first_name,
+            last_name=command.last_name,
+        ):
+            yield len(ids)
+            after = max(ids)
+
+
+@dataclass(frozen=True)
+class UpdateUsersByEmail:
+    """The update users by email command payload, a batch of new names."""
+
+    users: list[CreateUser]
+    dry_run: bool = False
+
+
+class UpdateUsersByEmailHandler:
+    """The update users by email command handler."""
+
+    users: UserStorage
+
+    def __init__(self, users: UserStorage):
+        self.users = users
+
+    async def handle(self, command: UpdateUsersByEmail) -> int:
+        """Handles the update users by email command.
+
+        Returns the number of users changed, or to change on a dry run.
+        """
+
+        # the new names of the users, by email
+        batch = [
+            User(email=names.email, first_name=names.first_name, last_name=names.last_name)
+            for names in command.users
+        ]
+
+        # count the users to change, on a dry run
+        if command.dry_run:
+            return await self.users.count_changes(batch)
+
+        # persist the changed names
+        return await self.users.update_many(batch)
@@ -0,0 +1,21 @@
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+
+from bridge.domain.users.models.user import User
+
+
+@dataclass(frozen=True)
+class UsersPage:
+    """A page of the upstream users, with the total number of upstream users."""
+
+    users: list[User]
+    total: int
+
+
+class UserSource(ABC):
+    """Abstract base class for fetching the users of an upstream system, by email."""
+
+    @abstractmethod
+    async def fetch_page(self, offset: int, limit: int) -> UsersPage:
+        """Fetches the page of `limit` users starting at `offset`, in email order."""
@@ -1,13 +1,30 @@
+from datetime import UTC
+from datetime import datetime
+from typing import AsyncIterator
+from typing import Iterator
 from uuid import UUID
 
 from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_cursor import UserCursor
+from bridge.domain.users.models.user_digest import UserDigest
+from bridge.domain.users.models.user_filter import UserFilter
 from bridge.domain.users.storages.interface import UserStorage
 
 
 class InMemoryUserStorage(UserStorage):
-    """In-memory implementation of the UserStorage interface."""
+    """In-memory implementation of the UserStorage interface.
+
+    Like the database storage, emails are unique, and users are listed in insertion
+    (creation) order. The ids are indexed by email, so fetching a user by email is a
+    lookup, and kept in insertion order in a list, deleted users leaving a hole until the
+    next compaction, so that a page of `k` users costs O(k) whatever its offset.
+    """
 
     _users: dict[UUID, User]
+    _emails: dict[UUID, str]
+    _ids_by_email: dict[str, UUID]
+    _order: list[UUID | None]
+    _positions: dict[UUID, int]
 
     @property
     def items(self) -> list[User]:
@@ -15,20 +32,220 @@ class InMemoryUserStorage(UserStorage):
         return list(self._users.values())
 
     def __init__(self, *args: User):
-        self._users = {user.id: user for user in args}
+        self._users = {}
+        self._emails = {}
+        self._ids_by_email = {}
+        self._order = []
+        self._positions = {}
+        for user in args:
+            self._store(user)
 
     async def insert(self, user: User):
-        self._users[user.id] = user
+        if user.id in self._users:
+            raise RuntimeError("User already exists")
+        self._store(user)
+
+    async def insert_many(self, batch: list[User]) -> list[User]:
+        rejected = []
+        for user in batch:
+            if user.id in self._users or user.email in self._ids_by_email:
+                rejected.append(user)
+                continue
+            self._store(user)
+        return rejected
+
+    async def upsert_many(self, batch: list[User]) -> int:
+        changed = 0
+        for user in batch:
+            stored = await self.fetch_by(user.email)
+            if stored is None:
+                self._store(user)
+            elif _names(stored) != _names(user):
+                stored.first_name, stored.last_name = _names(user)
+            else:
+                continue
+            changed += 1
+        return changed
 
     async def update(self, user: User):
-        self._users[user.id] = user
+        self._store(user)
+
+    async def update_by_email(
+        self, email: str, first_name: str | None = None, last_name: str | None = None
+    ) -> User | None:
+        user = await self.fetch_by(email)
+        if user is not None:
+            if first_name is not None:
+                user.first_name = first_name
+            if last_name is not None:
+                user.last_name = last_name
+        return user
+
+    async def update_many(self, batch: list[User]) -> int:
+        changed = 0
+        for names in batch:
+            user = await self.fetch_by(names.email)
+            if user is not None and _names(user) != _names(names):
+                user.first_name, user.last_name = _names(names)
+                changed += 1
+        return changed
+
+    async def update_where(
+        self,
+        filter_: UserFilter,
+        limit: int,
+        after: UUID | None = None,
+        first_name: str | None = None,
+        last_name: str | None = None,
+    ) -> list[UUID]:
+        changed = []
+        for user in self._matching(filter_, after):
+            if len(changed) == limit:
+                break
+            names = _renamed(user, first_name, last_name)
+            if names != _names(user):
+                user.first_name, user.last_name = names
+                changed.append(user.id)
+        return changed
 
     async def fetch_by(self, email: str) -> User | None:
-        return next((user for user in self.items if user.email == email), None)
+        id_ = self._ids_by_email.get(email)
+        return None if id_ is None else self._users[id_]
+
+    async def fetch_all(
+        self, limit: int, offset: int, after: UserCursor | None = None
+    ) -> list[User]:
+        if after is None:
+            # without holes, the offset is the position of the first user of the page
+            self._compact()
+            start, skip = offset, 0
+        elif after.id in self._positions:
+            start, skip = self._positions[after.id] + 1, offset
+        else:
+            # the user of the cursor is gone: the page starts at the first user after it
+            start = next(
+                (
+                    position
+                    for position, id_ in enumerate(self._order)
+                    if id_ is not None
+                    and _sort_key(self._users[id_]) > (after.created_at, after.id)
+                ),
+                len(self._order),
+            )
+            skip = offset
+        users = []
+        for user in self._iter_from(start):
+            if skip:
+                skip -= 1
+                continue
+            if len(users) == limit:
+                break
+            users.append(user)
+        return users
+
+    async def count_where(
+        self, filter_: UserFilter, first_name: str | None = None, last_name: str | None = None
+    ) -> int:
+        renaming = first_name is not None or last_name is not None
+        return sum(
+            1
+            for user in self._users.values()
+            if filter_.matches(user)
+            and (not renaming or _renamed(user, first_name, last_name) != _names(user))
+        )
 
-    async def fetch_all(self, limit: int, offset: int) -> list[User]:
-        start, end = offset, offset + limit
-        return self.items[start:end]
+    async def count_changes(self, batch: list[User]) -> int:
+        stored = [(await self.fetch_by(names.email), names) for names in batch]
+        return sum(1 for user, names in stored if user and _names(user) != _names(names))
+
+    async def iter_all(self, batch_size: int) -> AsyncIterator[User]:
+        for user in sorted(self.items, key=lambda user: user.id):
+            yield user
+
+    async def iter_digests(self, batch_size: int) -> AsyncIterator[UserDigest]:
+        for user in sorted(self.items, key=lambda user: user.email):
+            yield UserDigest(id=user.id, email=user.email, content_hash=user.content_hash)
 
     async def delete(self, user: User):
-        self._users.pop(user.id, None)
+        if self._users.pop(user.id, None) is None:
+            return
+        del self._ids_by_email[self._emails.pop(user.id)]
+        self._order[self._positions.pop(user.id)] = None
+        if len(self._order) > 2 * len(self._users):
+            self._compact()
+
+    async def delete_by_email(self, email: str) -> User | None:
+        user = await self.fetch_by(email)
+        if user is not None:
+            await self.delete(user)
+        return user
+
+    async def delete_many(self, ids: list[UUID]) -> int:
+        deleted = [self._users[id_] for id_ in set(ids) if id_ in self._users]
+        for user in deleted:
+            await self.delete(user)
+        return len(deleted)
+
+    async def delete_where(
+        self, filter_: UserFilter, limit: int, after: UUID | None = None
+    ) -> list[UUID]:
+        deleted = [user for _, user in zip(range(limit), self._matching(filter_, after))]
+        for user in deleted:
+            await self.delete(user)
+        return [user.id for user in deleted]
+
+    def _matching(self, filter_: UserFilter, after: UUID | None) -> Iterator[User]:
+        """The matching users by id, after the given one if any."""
+        for user in sorted(self._users.values(), key=lambda user: user.id):
+            if (after is None or user.id > after) and filter_.matches(user):
+                yield user
+
+    def _store(self, user: User):
+        """Insert or replace a user, keeping the indexes in sync."""
+        owner = self._ids_by_email.get(user.email)
+        if owner is not None and owner != user.id:
+            raise RuntimeError("Email already exists")
+        # the stored user may be the given one, its email changed in place
+        previous_email = self._emails.get(user.id)
+        if previous_email is None:
+            if user.created_at is None:
+                user.created_at = datetime.now(UTC)
+            self._positions[user.id] = len(self._order)
+            self._order.append(user.id)
+        elif previous_email != user.email:
+            del self._ids_by_email[previous_email]
+        self._users[user.id] = user
+        self._emails[user.id] = user.email
+        self._ids_by_email[user.email] = user.id
+
+    def _iter_from(self, start: int) -> Iterator[User]:
+        """The users from a position of the insertion order on, skipping the holes."""
+        for position in range(start, len(self._order)):
+            id_ = self._order[position]
+            if id_ is not None:
+                yield self._users[id_]
+
+    def _compact(self):
+        """Remove the holes left by deleted users from the insertion order."""
+        if len(self._order) == len(self._users):
+            return
+        self._order = list(self._users)
+        self._positions = {id_: position for position, id_ in enumerate(self._order)}
+
+
+def _sort_key(user: User) -> tuple[datetime, UUID]:
+    """The position of a user in the listing order (its creation time, then its id)."""
+    return user.created_at, user.id
+
+
+def _names(user: User) -> tuple[str, str]:
+    """The first and last names of a user."""
+    return user.first_name, user.last_name
+
+
+def _renamed(user: User, first_name: str | None, last_name: str | None) -> tuple[str, str]:
+    """The names of a user once given the new ones (`None` keeping a name as it is)."""
+    return (
+        user.first_name if first_name is None else first_name,
+        user.last_name if last_name is None else last_name,
+    )
@@ -1,7 +1,12 @@
 from abc import ABC
 from abc import abstractmethod
+from typing import AsyncIterator
+from uuid import UUID
 
 from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_cursor import UserCursor
+from bridge.domain.users.models.user_digest import UserDigest
+from bridge.domain.users.models.user_filter import UserFilter
 
 
 class UserStorage(ABC):
@@ -11,18 +16,87 @@ class UserStorage(ABC):
     async def insert(self, user: User):
         """Stores the given user."""
 
+    @abstractmethod
+    async def insert_many(self, batch: list[User]) -> list[User]:
+        """Stores the given batch of users, returning those rejected as already stored."""
+
+    @abstractmethod
+    async def upsert_many(self, batch: list[User]) -> int:
+        """Stores the given users, or their names by email, returning how many changed.
+
+        Users whose names are unchanged but whose content hash is unknown count as changed.
+        """
+
     @abstractmethod
     async def update(self, user: User):
         """Stores the given user."""
 
+    @abstractmethod
+    async def update_by_email(
+        self, email: str, first_name: str | None = None, last_name: str | None = None
+    ) -> User | None:
+        """Updates the given names of one user, returning it (`None` if not found)."""
+
+    @abstractmethod
+    async def update_many(self, batch: list[User]) -> int:
+        """Updates the names of the users with the given emails, returning how many changed."""
+
+    @abstractmethod
+    async def update_where(
+        self,
+        filter_: UserFilter,
+        limit: int,
+        after: UUID | None = None,
+        first_name: str | None = None,
+        last_name: str | None = None,
+    ) -> list[UUID]:
+        """Updates the names of a batch of matching users, by id, returning the changed ids."""
+
     @abstractmethod
     async def fetch_by(self, email: str) -> User | None:
         """Fetches one user."""
 
     @abstractmethod
-    async def fetch_all(self, limit: int, offset: int) -> list[User]:
-        """Fetches all users."""
+    async def fetch_all(
+        self, limit: int, offset: int, after: UserCursor | None = None
+    ) -> list[User]:
+        """Fetches all users by creation order, those after the given cursor if any."""
+
+    @abstractmethod
+    async def count_where(
+        self, filter_: UserFilter, first_name: str | None = None, last_name: str | None = None
+    ) -> int:
+        """Counts the matching users, only those whose names differ from the given ones if any.
+
+        Given names, counts the users `update_where` would change.
+        """
+
+    @abstractmethod
+    async def count_changes(self, batch: list[User]) -> int:
+        """Counts the users whose names differ from those of the given ones, by email."""
+
+    @abstractmethod
+    def iter_all(self, batch_size: int) -> AsyncIterator[User]:
+        """Iterates over all users by id, fetching them by batches."""
+
+    @abstractmethod
+    def iter_digests(self, batch_size: int) -> AsyncIterator[UserDigest]:
+        """Iterates over the digests of all users by email, fetching them by batches."""
 
     @abstractmethod
     async def delete(self, user: User):
         """Deletes the given user."""
+
+    @abstractmethod
+    async def delete_by_email(self, email: str) -> User | None:
+        """Deletes one user, returning it (`None` if not found)."""
+
+    @abstractmethod
+    async def delete_many(self, ids: list[UUID]) -> int:
+        """Deletes the users with the given ids, returning how many were deleted."""
+
+    @abstractmethod
+    async def delete_where(
+        self, filter_: UserFilter, limit: int, after: UUID | None = None
+    ) -> list[UUID]:
+        """Deletes a batch of matching users, by id, returning their ids."""
@@ -0,0 +1,75 @@
+import time
+from typing import Callable
+
+import httpx
+
+from bridge.config import UpstreamConfig
+
+
+class UpstreamError(Exception):
+    """The upstream API failed to answer, even after retries."""
+
+
+class CircuitOpenError(UpstreamError):
+    """The upstream API failed too often lately to be called."""
+
+
+class CircuitBreaker:
+    """A circuit breaker, failing fast once the upstream API failed too many times in a row.
+
+    The circuit is closed until `threshold` consecutive failures open it. Once open, calls
+    fail fast until `reset_timeout` seconds have passed, then the circuit is half-open:
+    calls go through again, the next success closing the circuit and the next failure
+    opening it again.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        """The state of the circuit: closed, open or half-open."""
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def check(self):
+        """Fail fast if the circuit is open."""
+        if self.state == "open":
+            raise CircuitOpenError(
+                f"Upstream circuit open after {self._failures} consecutive failures"
+            )
+
+    def success(self):
+        """Record a successful call, closing the circuit."""
+        self._failures = 0
+        self._opened_at = None
+
+    def failure(self):
+        """Record a failed call, opening the circuit past the threshold or when half-open."""
+        self._failures += 1
+        if self._failures >= self.threshold or self.state == "half-open":
+            self._opened_at = self._clock()
+
+
+def get_client(
+    config: UpstreamConfig, concurrency: int, transport: httpx.AsyncBaseTransport | None = None
+) -> httpx.AsyncClient:
+    """Create a client of the upstream API, pooling up to `concurrency` connections."""
+    return httpx.AsyncClient(
+        base_url=config.url,
+        timeout=config.timeout,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        transport=transport,
+    )
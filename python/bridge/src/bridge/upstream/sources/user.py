@@ -0,0 +1,120 @@
+import asyncio
+import random
+from datetime import UTC
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+from bridge.config import UpstreamConfig
+from bridge.domain.users.models.user import User
+from bridge.domain.users.sources.interface import UserSource
+from bridge.domain.users.sources.interface import UsersPage
+from bridge.upstream.core import CircuitBreaker
+from bridge.upstream.core import UpstreamError
+
+FIELDS = "firstName,lastName,email"
+
+
+class DummyJsonUserSource(UserSource):
+    """DummyJSON implementation of the UserSource interface.
+
+    At most `concurrency` requests are in flight at once. Rate limited requests (429) are
+    retried after their `Retry-After` delay, failing at once when it exceeds `max_backoff`,
+    server errors and transport errors after an exponential backoff with jitter. All of
+    them count as circuit breaker failures.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        config: UpstreamConfig,
+        concurrency: int,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self._client = client
+        self._config = config
+        self._slots = asyncio.Semaphore(concurrency)
+        self._breaker = breaker or CircuitBreaker(config.failure_threshold, config.reset_timeout)
+
+    async def fetch_page(self, offset: int, limit: int) -> UsersPage:
+        params = {
+            "limit": limit,
+            "skip": offset,
+            "select": FIELDS,
+            "sortBy": "email",
+            "order": "asc",
+        }
+        body = await self._get("/users", params)
+        try:
+            users = [
+                User(email=user["email"], first_name=user["firstName"], last_name=user["lastName"])
+                for user in body["users"]
+            ]
+            return UsersPage(users=users, total=body["total"])
+        except (KeyError, TypeError) as exc:
+            raise UpstreamError(f"Upstream response to /users is malformed: {exc!r}") from exc
+
+    async def _get(self, path: str, params: dict[str, Any]) -> Any:
+        """Get a JSON resource, retrying rate limited and failed requests."""
+        for attempt in range(self._config.max_retries + 1):
+            self._breaker.check()
+            try:
+                async with self._slots:
+                    response = await self._client.get(path, params=params)
+            except httpx.TransportError as exc:
+                self._breaker.failure()
+                error, delay = f"{type(exc).__name__}: {exc}", self._backoff(attempt)
+            else:
+                error = f"{response.status_code} {response.reason_phrase}"
+                if response.status_code == 429:
+                    self._breaker.failure()
+                    retry_after = _retry_after(response)
+                    if retry_after is not None and retry_after > self._config.max_backoff:
+                        raise UpstreamError(
+                            f"Upstream request {path} failed: {error}, retry after "
+                            f"{retry_after:g}s exceeds {self._config.max_backoff:g}s"
+                        )
+                    delay = self._backoff(attempt) if retry_after is None else retry_after
+                elif response.status_code >= 500:
+                    self._breaker.failure()
+                    delay = self._backoff(attempt)
+                elif response.is_error:
+                    raise UpstreamError(f"Upstream request {path} failed: {error}")
+                else:
+                    self._breaker.success()
+                    try:
+                        return response.json()
+                    except ValueError as exc:
+                        raise UpstreamError(
+                            f"Upstream response to {path} is not JSON: {exc}"
+                        ) from exc
+            if attempt < self._config.max_retries:
+                # a Retry-After delay is within the cap already: only the backoff is capped
+                await asyncio.sleep(min(delay, self._config.max_backoff))
+        raise UpstreamError(
+            f"Upstream request {path} failed after {attempt + 1} attempts: {error}"
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        """The delay before retrying a failed request: exponential, with full jitter."""
+        return random.uniform(0, self._config.backoff * 2**attempt)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """The delay a rate limited response asks to wait, in seconds or as a date, if any."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return max((moment - datetime.now(UTC)).total_seconds(), 0.0)
@@ -1,3 +1,7 @@
+import json
+from unittest.mock import patch
+from urllib.parse import parse_qsl
+
 import pytest
 import pytest_asyncio
 from faker import Faker
@@ -5,6 +9,8 @@ from faker import Faker
 from bridge.config import DatabaseConfig
 from bridge.database.core import get_async_engine
 from bridge.database.core import get_connection
+from bridge.database.core import get_sync_engine
+from bridge.database.core import metadata
 from bridge.database.storages.user import PostgresUserStorage
 from bridge.domain.users.models.user import User
 from bridge.domain.users.storages.in_memory import InMemoryUserStorage
@@ -33,6 +39,17 @@ async def async_connection(async_engine):
         yield conn
 
 
+@pytest.fixture
+def file_database(tmp_path):
+    """Provides a database file with the tables created, used by the CLI commands."""
+    config = DatabaseConfig(path=str(tmp_path / "db.sqlite"))
+    engine = get_sync_engine(config)
+    metadata.create_all(engine)
+    with patch("bridge.cli.commands.users.database", config):
+        yield engine
+    engine.dispose()
+
+
 @pytest.fixture
 def sample_user():
     """Provides a sample user for testing."""
@@ -85,3 +102,53 @@ def multiple_user_data():
         }
         for _ in range(3)
     ]
+
+
+class StandInUpstream:
+    """A stand-in of the DummyJSON users API, served over ASGI.
+
+    The given statuses (e.g. 429 or 503) are answered first, one per request, then the
+    pages of the given users, sorted by email when asked to. Rate limited requests are
+    asked to retry after `retry_after`.
+    """
+
+    def __init__(self, users: list[User], statuses: tuple[int, ...] = (), retry_after: str = "0"):
+        self.users = users
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.requests: list[dict[str, str]] = []
+
+    async def __call__(self, scope, receive, send):
+        query = dict(parse_qsl(scope["query_string"].decode()))
+        self.requests.append(query)
+        status, headers, body = 200, [(b"content-type", b"application/json")], {}
+        if self.statuses:
+            status = self.statuses.pop(0)
+            if status == 429:
+                headers.append((b"retry-after", self.retry_after.encode()))
+        else:
+            skip, limit = int(query["skip"]), int(query["limit"])
+            users = self.users
+            if "sortBy" in query:
+                users = sorted(users, key=lambda user: user.email)
+            page = users[skip:][:limit]
+            body = {
+                "users": [
+                    {"firstName": user.first_name, "lastName": user.last_name, "email": user.email}
+                    for user in page
+                ],
+                "total": len(self.users),
+                "skip": skip,
+                "limit": limit,
+            }
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+
+@pytest.fixture
+def upstream_users():
+    """Provides the users of a stand-in upstream API."""
+    return [
+        User(email=f"user{i:02d}@example.com", first_name=f"First{i}", last_name=f"Last{i}")
+        for i in range(25)
+    ]
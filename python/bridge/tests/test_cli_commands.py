@@ -1,3 +1,4 @@
+from datetime import datetime
 from unittest.mock import AsyncMock
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -5,17 +6,29 @@ from unittest.mock import patch
 import pytest
 from click.testing import CliRunner
 from faker import Faker
+from sqlalchemy import select
+from uuid6 import uuid7
 
 from bridge.cli.commands.users import create
 from bridge.cli.commands.users import delete
+from bridge.cli.commands.users import export
+from bridge.cli.commands.users import import_
 from bridge.cli.commands.users import list_
 from bridge.cli.commands.users import update
 from bridge.cli.commands.users import users
+from bridge.database.tables.users import users as users_table
 from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_cursor import UserCursor
 
 fake = Faker()
 
 
+def stored_emails(engine):
+    """The emails of the users stored in a database."""
+    with engine.connect() as conn:
+        return sorted(conn.execute(users_table.select()).scalars("email"))
+
+
 class TestUsersGroup:
     """Tests for the users command group."""
 
@@ -27,6 +40,25 @@ class TestUsersGroup:
         assert result.exit_code == 0
         assert "Manage bridge users" in result.output
 
+    @pytest.mark.parametrize(
+        "command, args",
+        [
+            (export, []),
+            (import_, ["users.csv"]),
+            (update, ["user@example.com", "--first-name", "New"]),
+            (delete, ["user@example.com"]),
+        ],
+    )
+    def test_batch_size_must_be_positive(self, command, args, tmp_path, monkeypatch):
+        """Test that the bulk commands reject an empty batch, which would never end."""
+        (tmp_path / "users.csv").write_text("email,first_name,last_name\n")
+        monkeypatch.chdir(tmp_path)
+        runner = CliRunner()
+        result = runner.invoke(command, [*args, "--batch-size", "0"])
+
+        assert result.exit_code == 2
+        assert "Invalid value for '--batch-size'" in result.output
+
 
 class TestCreateUserCommand:
     """Tests for create user command."""
@@ -184,6 +216,55 @@ class TestListUsersCommand:
         assert call_args.limit == 5
         assert call_args.offset == 10
 
+    @patch("bridge.cli.commands.users.get_async_engine")
+    @patch("bridge.cli.commands.users.get_connection")
+    @patch("bridge.cli.commands.users.PostgresUserStorage")
+    @patch("bridge.cli.commands.users.FetchAllUsersHandler")
+    def test_list_users_after_cursor(
+        self, mock_handler_class, mock_storage_class, mock_get_connection, mock_get_engine
+    ):
+        """Test listing the users after a cursor, hinting at the next page."""
+        mock_engine = AsyncMock()
+        mock_conn = AsyncMock()
+        mock_handler = AsyncMock()
+        created_at = datetime(2026, 10, 18, 9, 30)
+        mock_users = [
+            User(
+                email="user1@example.com",
+                first_name="User",
+                last_name="One",
+                created_at=created_at,
+            ),
+            User(
+                email="user2@example.com",
+                first_name="User",
+                last_name="Two",
+                created_at=created_at,
+            ),
+        ]
+        after = UserCursor(created_at=created_at, id=uuid7())
+
+        mock_get_engine.return_value = mock_engine
+        mock_get_connection.return_value.__aenter__.return_value = mock_conn
+        mock_get_connection.return_value.__aexit__.return_value = None
+        mock_handler_class.return_value = mock_handler
+        mock_handler.handle.return_value = mock_users
+
+        runner = CliRunner()
+        result = runner.invoke(list_, ["--limit", "2", "--after", str(after)])
+
+        assert result.exit_code == 0
+        assert mock_handler.handle.call_args[0][0].after == after
+        assert f"Next page: --after 2026-10-18T09:30:00_{mock_users[1].id}" in result.output
+
+    def test_list_users_invalid_cursor(self):
+        """Test that a malformed cursor is rejected as a bad parameter."""
+        runner = CliRunner()
+        result = runner.invoke(list_, ["--after", "not-a-cursor"])
+
+        assert result.exit_code == 2
+        assert "Invalid user cursor 'not-a-cursor'" in result.output
+
 
 class TestUpdateUserCommand:
     """Tests for update user command."""
@@ -307,6 +388,239 @@ class TestDeleteUserCommand:
         assert "Missing argument" in result.output
 
 
+class TestImportUsersCommand:
+    """Tests for import users command."""
+
+    def test_import_csv(self, file_database, tmp_path):
+        """Test importing a CSV file in batches, reporting the rejected rows."""
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,first_name,last_name\n"
+            "ada@example.com,Ada,Lovelace\n"
+            "alan@example.com,Alan,Turing\n"
+            "invalid,Grace,Hopper\n"
+            "ada@example.com,Ada,Byron\n"
+            "grace@example.com,Grace,Hopper\n"
+        )
+
+        runner = CliRunner()
+        result = runner.invoke(import_, [str(path), "--batch-size", "2"])
+
+        assert result.exit_code == 0, result.output
+        assert "3 users imported, 2 rejected." in result.stdout
+        assert "Line 4: email:" in result.stderr
+        assert "Line 5: user ada@example.com already exists." in result.stderr
+        assert stored_emails(file_database) == [
+            "ada@example.com",
+            "alan@example.com",
+            "grace@example.com",
+        ]
+        assert not (tmp_path / "users.csv.checkpoint").exists()
+
+    def test_import_resumes_from_checkpoint(self, file_database, tmp_path):
+        """Test that an interrupted import resumes after the rows already processed."""
+        path = tmp_path / "users.jsonl"
+        path.write_text(
+            '{"email": "ada@example.com", "first_name": "Ada", "last_name": "Lovelace"}\n'
+            '{"email": "alan@example.com", "first_name": "Alan", "last_name": "Turing"}\n'
+        )
+        (tmp_path / "users.jsonl.checkpoint").write_text("1")
+
+        runner = CliRunner()
+        result = runner.invoke(import_, [str(path)])
+
+        assert result.exit_code == 0, result.output
+        assert "Resuming after 1 rows." in result.stdout
+        assert "1 users imported, 0 rejected." in result.stdout
+        assert stored_emails(file_database) == ["alan@example.com"]
+
+    def test_import_unknown_format(self, tmp_path):
+        """Test importing a file of unknown format."""
+        path = tmp_path / "users.xml"
+        path.write_text("<users/>")
+
+        runner = CliRunner()
+        result = runner.invoke(import_, [str(path)])
+
+        assert result.exit_code != 0
+        assert "Unknown file format" in result.output
+
+
+class TestExportUsersCommand:
+    """Tests for export users command."""
+
+    @pytest.fixture
+    def stored_users(self, file_database):
+        """Provides users stored in the database file."""
+        stored = [
+            User(email=f"user{i}@example.com", first_name="User", last_name=str(i))
+            for i in range(5)
+        ]
+        with file_database.begin() as conn:
+            conn.execute(
+                users_table.insert(),
+                [
+                    {
+                        "id": user.id,
+                        "email": user.email,
+                        "first_name": user.first_name,
+                        "last_name": user.last_name,
+                    }
+                    for user in stored
+                ],
+            )
+        return stored
+
+    def test_export_csv_to_stdout(self, stored_users):
+        """Test exporting every user as CSV, by batches smaller than the table."""
+        runner = CliRunner()
+        result = runner.invoke(export, ["--batch-size", "2"])
+
+        assert result.exit_code == 0, result.output
+        lines = result.output.splitlines()
+        assert lines[0] == "id,email,first_name,last_name"
+        assert lines[1:] == [
+            f"{user.id},{user.email},{user.first_name},{user.last_name}"
+            for user in sorted(stored_users, key=lambda user: user.id)
+        ]
+
+    def test_export_jsonl_then_import(self, stored_users, file_database, tmp_path):
+        """Test that exported users can be imported back."""
+        path = tmp_path / "users.jsonl"
+        runner = CliRunner()
+
+        exported = runner.invoke(export, ["--format", "jsonl", "--output", str(path)])
+        with file_database.begin() as conn:
+            conn.execute(users_table.delete())
+        imported = runner.invoke(import_, [str(path)])
+
+        assert exported.exit_code == 0, exported.output
+        assert len(path.read_text().splitlines()) == len(stored_users)
+        assert "5 users imported, 0 rejected." in imported.output
+        assert stored_emails(file_database) == sorted(user.email for user in stored_users)
+
+
+class TestBulkUsersCommands:
+    """Tests for the set-based update and delete users commands."""
+
+    @pytest.fixture
+    def stored_users(self, file_database):
+        """Provides users of two email domains stored in the database file."""
+        with file_database.begin() as conn:
+            conn.execute(
+                users_table.insert(),
+                [
+                    {
+                        "id": uuid7(),
+                        "email": f"user{i}@{domain}",
+                        "first_name": "User",
+                        "last_name": str(i),
+                    }
+                    for domain in ("example.com", "example.org")
+                    for i in range(3)
+                ],
+            )
+
+    def test_delete_email_domain_dry_run(self, stored_users, file_database):
+        """Test that a dry run counts the users to delete."""
+        runner = CliRunner()
+        result = runner.invoke(delete, ["--email-domain", "example.com", "--dry-run"])
+
+        assert result.exit_code == 0, result.output
+        assert "3 users match." in result.output
+        assert len(stored_emails(file_database)) == 6
+
+    def test_delete_email_domain(self, stored_users, file_database):
+        """Test deleting the users of an email domain, by batches."""
+        runner = CliRunner()
+        result = runner.invoke(delete, ["--email-domain", "example.com", "--batch-size", "2"])
+
+        assert result.exit_code == 0, result.output
+        assert "3 users deleted." in result.output
+        assert stored_emails(file_database) == [f"user{i}@example.org" for i in range(3)]
+
+    def test_update_where(self, stored_users, file_database):
+        """Test updating the users matching a filter."""
+        arguments = ["--where", "email_domain=example.org", "--where", "last_name=1"]
+        runner = CliRunner()
+        result = runner.invoke(update, [*arguments, "--last-name", "One"])
+
+        assert result.exit_code == 0, result.output
+        assert "1 users updated." in result.output
+        with file_database.connect() as conn:
+            rows = conn.execute(select(users_table.c.email, users_table.c.last_name))
+            names = dict(rows.all())
+        assert names["user1@example.org"] == "One"
+        assert names["user1@example.com"] == "1"
+
+    def test_update_from_file(self, stored_users, file_database, tmp_path):
+        """Test updating the users of a file, by email."""
+        path = tmp_path / "names.csv"
+        path.write_text(
+            "email,first_name,last_name\n"
+            "user0@example.com,User,0\n"
+            "user1@example.com,New,Name\n"
+            "invalid,New,Name\n"
+        )
+        runner = CliRunner()
+
+        dry_run = runner.invoke(update, ["--from-file", str(path), "--dry-run"])
+        result = runner.invoke(update, ["--from-file", str(path), "--batch-size", "1"])
+
+        assert "1 users to update." in dry_run.output
+        assert result.exit_code == 0, result.output
+        assert "1 users updated." in result.stdout
+        assert "Line 4: email:" in result.stderr
+
+    def test_update_where_dry_run(self, stored_users, file_database):
+        """Test that a dry run counts the matching users whose names would change."""
+        runner = CliRunner()
+        arguments = ["--email-domain", "example.org", "--last-name", "1", "--dry-run"]
+        result = runner.invoke(update, arguments)
+
+        assert result.exit_code == 0, result.output
+        assert "2 users to update." in result.output
+        with file_database.connect() as conn:
+            rows = conn.execute(
+                select(users_table.c.last_name).where(users_table.c.last_name == "1")
+            )
+            assert len(rows.all()) == 2
+
+    def test_update_from_file_with_names(self, tmp_path):
+        """Test that new names and a file of names cannot be combined."""
+        path = tmp_path / "names.csv"
+        path.write_text("email,first_name,last_name\n")
+        runner = CliRunner()
+        result = runner.invoke(update, ["--from-file", str(path), "--first-name", "New"])
+
+        assert result.exit_code == 2
+        assert "cannot be used with --from-file" in result.output
+
+    def test_update_filter_without_names(self):
+        """Test that a filtered update needs new names."""
+        runner = CliRunner()
+        result = runner.invoke(update, ["--email-domain", "example.com"])
+
+        assert result.exit_code != 0
+        assert "Missing option '--first-name' or '--last-name'" in result.output
+
+    def test_invalid_where(self):
+        """Test that an unknown --where field is rejected."""
+        runner = CliRunner()
+        result = runner.invoke(delete, ["--where", "id=1"])
+
+        assert result.exit_code != 0
+        assert "is not FIELD=VALUE" in result.output
+
+    def test_email_and_filter_are_exclusive(self):
+        """Test that a single email and a filter cannot be combined."""
+        runner = CliRunner()
+        result = runner.invoke(delete, ["user@example.com", "--email-domain", "example.com"])
+
+        assert result.exit_code != 0
+        assert "Missing argument 'EMAIL', or else" in result.output
+
+
 class TestWithAsyncDatabaseConnectionDecorator:
     """Tests for the with_async_database_connection decorator."""
 
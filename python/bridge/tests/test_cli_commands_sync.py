@@ -0,0 +1,152 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from bridge.cli.commands.sync import mirror
+from bridge.cli.commands.sync import pull
+from bridge.cli.commands.sync import sync
+from bridge.config import UpstreamConfig
+from bridge.database.tables.users import users as users_table
+from bridge.upstream.core import get_client
+from tests.conftest import StandInUpstream
+from tests.test_cli_commands import stored_emails
+
+CONFIG = UpstreamConfig(url="http://upstream.test", max_retries=1, backoff=0, page_size=10)
+
+
+@pytest.fixture
+def serve_upstream():
+    """Serve the upstream API of the sync commands with the given stand-in, over ASGI."""
+
+    def serve(app: StandInUpstream):
+        def client(config, concurrency):
+            return get_client(config, concurrency, transport=httpx.ASGITransport(app=app))
+
+        return patch.multiple("bridge.cli.commands.sync", upstream=CONFIG, get_client=client)
+
+    return serve
+
+
+class TestSyncGroup:
+    """Tests for the sync command group."""
+
+    def test_sync_group_help(self):
+        """Test that the sync group lists its commands."""
+        runner = CliRunner()
+        result = runner.invoke(sync, ["--help"])
+
+        assert result.exit_code == 0
+        assert "pull" in result.output
+
+    @pytest.mark.parametrize("command", [pull, mirror])
+    def test_batch_size_must_be_positive(self, command):
+        """Test that the sync commands reject an empty batch."""
+        runner = CliRunner()
+        result = runner.invoke(command, ["--batch-size", "0"])
+
+        assert result.exit_code == 2
+        assert "Invalid value for '--batch-size'" in result.output
+
+
+class TestPullUsersCommand:
+    """Tests for the pull users command."""
+
+    def test_pull_users(self, file_database, serve_upstream, upstream_users):
+        """Test pulling every upstream user, then pulling again without changes."""
+        app = StandInUpstream(upstream_users)
+        runner = CliRunner()
+
+        with serve_upstream(app):
+            first = runner.invoke(pull, ["--concurrency", "3", "--batch-size", "10"])
+            second = runner.invoke(pull, [])
+
+        assert first.exit_code == 0, first.output
+        assert "25 users received, 25 created or updated." in first.output
+        assert "25 users received, 0 created or updated." in second.output
+        assert {request["limit"] for request in app.requests} == {"10"}
+        assert stored_emails(file_database) == sorted(user.email for user in upstream_users)
+
+    def test_pull_users_upstream_error(self, file_database, serve_upstream, upstream_users):
+        """Test that an upstream failing after retries fails the command."""
+        app = StandInUpstream(upstream_users, statuses=(503, 503))
+        runner = CliRunner()
+
+        with serve_upstream(app):
+            result = runner.invoke(pull, [])
+
+        assert result.exit_code == 1
+        assert "failed after 2 attempts: 503" in result.output
+        assert stored_emails(file_database) == []
+
+
+class TestMirrorUsersCommand:
+    """Tests for the mirror users command."""
+
+    @pytest.fixture
+    def stored_users(self, file_database, upstream_users):
+        """Provides users stored in the database file: upstream ones, and one gone upstream."""
+        with file_database.begin() as conn:
+            conn.execute(
+                users_table.insert(),
+                [
+                    {
+                        "id": user.id,
+                        "email": user.email,
+                        "first_name": user.first_name,
+                        "last_name": user.last_name,
+                        "content_hash": user.content_hash,
+                    }
+                    for user in upstream_users[:10]
+                ]
+                + [
+                    {
+                        "id": upstream_users[10].id,
+                        "email": upstream_users[10].email,
+                        "first_name": "Old",
+                        "last_name": "Name",
+                        "content_hash": None,
+                    },
+                    {
+                        "id": uuid4(),
+                        "email": "gone@example.com",
+                        "first_name": "Gone",
+                        "last_name": "User",
+                        "content_hash": None,
+                    },
+                ],
+            )
+
+    def test_mirror_users(self, stored_users, file_database, serve_upstream, upstream_users):
+        """Test applying the changes, then mirroring again without any change."""
+        app = StandInUpstream(upstream_users)
+        runner = CliRunner()
+
+        with serve_upstream(app):
+            dry_run = runner.invoke(mirror, ["--dry-run"])
+            emails_after_dry_run = stored_emails(file_database)
+            first = runner.invoke(mirror, ["--batch-size", "4", "--concurrency", "2"])
+            second = runner.invoke(mirror, [])
+
+        assert dry_run.exit_code == 0, dry_run.output
+        assert "14 users to insert, 1 to update, 1 to delete, 10 unchanged." in dry_run.output
+        assert "gone@example.com" in emails_after_dry_run
+        assert first.exit_code == 0, first.output
+        assert "14 users inserted, 1 updated, 1 deleted, 10 unchanged." in first.output
+        assert "0 users inserted, 0 updated, 0 deleted, 25 unchanged." in second.output
+        assert {request["sortBy"] for request in app.requests} == {"email"}
+        assert stored_emails(file_database) == sorted(user.email for user in upstream_users)
+
+    def test_mirror_users_upstream_error(self, stored_users, file_database, serve_upstream):
+        """Test that an upstream failing after retries fails the command, deleting nothing."""
+        app = StandInUpstream([], statuses=(503, 503))
+        runner = CliRunner()
+
+        with serve_upstream(app):
+            result = runner.invoke(mirror, [])
+
+        assert result.exit_code == 1
+        assert "failed after 2 attempts: 503" in result.output
+        assert "gone@example.com" in stored_emails(file_database)
@@ -0,0 +1,125 @@
+import io
+import json
+
+import pytest
+
+from bridge.cli.user_files import Checkpoint
+from bridge.cli.user_files import file_format
+from bridge.cli.user_files import read_rows
+from bridge.cli.user_files import user_writer
+from bridge.domain.users.models.user import User
+from bridge.domain.users.services.create_user import CreateUser
+
+
+class TestFileFormat:
+    """Tests for the import file format detection."""
+
+    def test_format_from_extension(self, tmp_path):
+        """Test that the format is guessed from the file extension."""
+        assert file_format(tmp_path / "users.CSV") == "csv"
+        assert file_format(tmp_path / "users.jsonl") == "jsonl"
+
+    def test_explicit_format(self, tmp_path):
+        """Test that an explicit format wins over the file extension."""
+        assert file_format(tmp_path / "users.txt", "jsonl") == "jsonl"
+
+    def test_unknown_format(self, tmp_path):
+        """Test that an unknown extension is an error."""
+        with pytest.raises(ValueError, match="Unknown file format"):
+            file_format(tmp_path / "users.xml")
+
+
+class TestReadRows:
+    """Tests for reading the rows of an import file."""
+
+    def test_read_csv(self, tmp_path):
+        """Test reading a CSV file, validating each row."""
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,first_name,last_name,role\n"
+            " ada@example.com ,Ada,Lovelace,admin\n"
+            "not-an-email,Alan,Turing,\n"
+            "grace@example.com,,Hopper,\n"
+        )
+
+        rows = list(read_rows(path, "csv"))
+
+        assert [row.line for row in rows] == [2, 3, 4]
+        assert rows[0].user == CreateUser("ada@example.com", "Ada", "Lovelace")
+        assert rows[1].user is None and rows[1].error.startswith("email:")
+        assert rows[2].user is None and rows[2].error.startswith("first_name:")
+
+    def test_read_jsonl(self, tmp_path):
+        """Test reading a JSONL file, skipping blank lines."""
+        path = tmp_path / "users.jsonl"
+        path.write_text(
+            '{"email": "ada@example.com", "first_name": "Ada", "last_name": "Lovelace"}\n'
+            "\n"
+            "{not json\n"
+            '{"email": "alan@example.com", "first_name": "Alan"}\n'
+        )
+
+        rows = list(read_rows(path, "jsonl"))
+
+        assert [row.line for row in rows] == [1, 3, 4]
+        assert rows[0].user == CreateUser("ada@example.com", "Ada", "Lovelace")
+        assert rows[1].error.startswith("Invalid JSON")
+        assert rows[2].error == "last_name: Field required"
+
+    def test_skip_rows(self, tmp_path):
+        """Test that the rows already processed are skipped."""
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,first_name,last_name\n"
+            "ada@example.com,Ada,Lovelace\n"
+            "alan@example.com,Alan,Turing\n"
+        )
+
+        rows = list(read_rows(path, "csv", skip=1))
+
+        assert [row.user.email for row in rows] == ["alan@example.com"]
+
+
+class TestUserWriter:
+    """Tests for writing users to an export file."""
+
+    def test_write_csv(self):
+        """Test writing users as CSV, with a header."""
+        output = io.StringIO()
+        user = User(email="ada@example.com", first_name="Ada", last_name="King, Lovelace")
+
+        user_writer(output, "csv")(user)
+
+        assert output.getvalue() == (
+            "id,email,first_name,last_name\n" f'{user.id},ada@example.com,Ada,"King, Lovelace"\n'
+        )
+
+    def test_write_jsonl(self):
+        """Test writing users as JSONL."""
+        output = io.StringIO()
+        user = User(email="ada@example.com", first_name="Ada", last_name="Lovelace")
+
+        user_writer(output, "jsonl")(user)
+
+        assert json.loads(output.getvalue()) == {
+            "id": str(user.id),
+            "email": "ada@example.com",
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+        }
+
+
+class TestCheckpoint:
+    """Tests for the import checkpoint."""
+
+    def test_save_load_clear(self, tmp_path):
+        """Test that the progress is saved, loaded back, then cleared."""
+        checkpoint = Checkpoint(tmp_path / "users.csv.checkpoint")
+        assert checkpoint.load() == 0
+
+        checkpoint.save(1000)
+        assert checkpoint.load() == 1000
+
+        checkpoint.clear()
+        assert checkpoint.load() == 0
+        assert list(tmp_path.iterdir()) == []
@@ -2,6 +2,7 @@ import os
 from unittest.mock import patch
 
 from bridge.config import DatabaseConfig
+from bridge.config import UpstreamConfig
 
 
 class TestDatabaseConfig:
@@ -59,3 +60,22 @@ class TestDatabaseConfig:
         """Test is_memory returns False for paths containing 'memory'."""
         config = DatabaseConfig(path="/tmp/memory.db")
         assert config.is_memory is False
+
+
+class TestUpstreamConfig:
+    """Tests for UpstreamConfig class."""
+
+    def test_defaults(self):
+        """Test that the upstream defaults to the public DummyJSON API."""
+        with patch.dict(os.environ, {}, clear=True):
+            config = UpstreamConfig()
+            assert config.url == "https://dummyjson.com"
+            assert config.page_size == 100
+
+    def test_from_env(self):
+        """Test that the upstream settings come from environment variables."""
+        env = {"UPSTREAM_URL": "http://localhost:8080", "UPSTREAM_CONCURRENCY": "8"}
+        with patch.dict(os.environ, env):
+            config = UpstreamConfig()
+            assert config.url == "http://localhost:8080"
+            assert config.concurrency == 8
@@ -1,8 +1,18 @@
+from datetime import UTC
+from datetime import datetime
+from uuid import uuid4
+
 import pytest
 from faker import Faker
+from sqlalchemy import event
+from sqlalchemy import text
+from sqlalchemy import update
 
 from bridge.database.storages.user import PostgresUserStorage
+from bridge.database.tables.users import users as users_table
 from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_cursor import UserCursor
+from bridge.domain.users.models.user_filter import UserFilter
 
 fake = Faker()
 
@@ -145,13 +155,19 @@ class TestPostgresUserStorage:
         assert len(users) <= 2
 
     @pytest.mark.asyncio
-    async def test_fetch_all_ordered_by_created_at(self, postgres_user_storage):
+    async def test_fetch_all_ordered_by_created_at(self, postgres_user_storage, async_connection):
         """Test that fetch_all returns users ordered by creation time."""
         user1 = User(email="first@example.com", first_name="First", last_name="User")
         user2 = User(email="second@example.com", first_name="Second", last_name="User")
 
         await postgres_user_storage.insert(user2)
         await postgres_user_storage.insert(user1)
+        # creation times are to the second: make sure they differ
+        await async_connection.execute(
+            update(users_table)
+            .where(users_table.c.id == user2.id)
+            .values(created_at=datetime(2000, 1, 1, tzinfo=UTC))
+        )
 
         users = await postgres_user_storage.fetch_all(limit=10, offset=0)
 
@@ -159,6 +175,53 @@ class TestPostgresUserStorage:
         assert users[0].email == user2.email
         assert users[1].email == user1.email
 
+    @pytest.mark.asyncio
+    async def test_fetch_all_ties_ordered_by_id(self, postgres_user_storage, sample_users):
+        """Test that users created the same second are ordered by id."""
+        for user in reversed(sample_users):
+            await postgres_user_storage.insert(user)
+
+        users = await postgres_user_storage.fetch_all(limit=10, offset=0)
+
+        assert users == sorted(sample_users, key=lambda user: user.id)
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_after_cursor(self, postgres_user_storage, sample_users):
+        """Test that the pages after a cursor match the offset pages."""
+        await postgres_user_storage.insert_many(sample_users)
+        listed = await postgres_user_storage.fetch_all(limit=10, offset=0)
+
+        pages, after = [], None
+        while page := await postgres_user_storage.fetch_all(limit=2, offset=0, after=after):
+            pages.append(page)
+            after = UserCursor.of(page[-1])
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [user for page in pages for user in page] == listed
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_after_deleted_cursor(self, postgres_user_storage, sample_users):
+        """Test that the page after the cursor of a deleted user still comes."""
+        await postgres_user_storage.insert_many(sample_users)
+        listed = await postgres_user_storage.fetch_all(limit=10, offset=0)
+        after = UserCursor.of(listed[1])
+
+        await postgres_user_storage.delete(listed[1])
+
+        assert await postgres_user_storage.fetch_all(limit=10, offset=0, after=after) == listed[2:]
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_after_cursor_same_second(self, postgres_user_storage, sample_users):
+        """Test that a cursor keeps the users created the same second after it."""
+        await postgres_user_storage.insert_many(sample_users)
+        listed = await postgres_user_storage.fetch_all(limit=10, offset=0)
+        after = UserCursor.of(listed[0])
+
+        users = await postgres_user_storage.fetch_all(limit=10, offset=0, after=after)
+
+        assert {user.created_at for user in listed} == {after.created_at}
+        assert users == listed[1:]
+
     @pytest.mark.asyncio
     async def test_delete_existing_user(self, postgres_user_storage, sample_user):
         """Test deleting an existing user."""
@@ -208,6 +271,269 @@ class TestPostgresUserStorage:
         with pytest.raises(Exception):
             await postgres_user_storage.insert(user2)
 
+    @pytest.mark.asyncio
+    async def test_insert_many_rejects_duplicate_emails(self, postgres_user_storage, sample_users):
+        """Test that inserting many users rejects the duplicate emails, storing the others."""
+        stored, *new_users = sample_users
+        await postgres_user_storage.insert(stored)
+        duplicate = User(email=stored.email, first_name="Other", last_name="User")
+        repeated = User(email=new_users[0].email, first_name="Again", last_name="User")
+
+        rejected = await postgres_user_storage.insert_many([duplicate, *new_users, repeated])
+
+        assert rejected == [duplicate, repeated]
+        for user in new_users:
+            assert await postgres_user_storage.fetch_by(user.email) == user
+        assert await postgres_user_storage.fetch_by(stored.email) == stored
+
+    @pytest.mark.asyncio
+    async def test_insert_many_empty_batch(self, postgres_user_storage):
+        """Test that inserting an empty batch is a no-op."""
+        assert await postgres_user_storage.insert_many([]) == []
+
+    @pytest.mark.asyncio
+    async def test_upsert_many(self, postgres_user_storage, sample_users):
+        """Test that upserting inserts new emails, and updates the names that changed."""
+        renamed, unchanged, *others = sample_users
+        await postgres_user_storage.insert_many([renamed, unchanged])
+        new_names = User(email=renamed.email, first_name="New", last_name="Name")
+        same_names = User(
+            email=unchanged.email, first_name=unchanged.first_name, last_name=unchanged.last_name
+        )
+
+        changed = await postgres_user_storage.upsert_many([new_names, same_names, *others])
+
+        assert changed == 1 + len(others)
+        updated = await postgres_user_storage.fetch_by(renamed.email)
+        assert (updated.id, updated.first_name, updated.last_name) == (renamed.id, "New", "Name")
+        assert await postgres_user_storage.fetch_by(unchanged.email) == unchanged
+        for user in others:
+            assert await postgres_user_storage.fetch_by(user.email) == user
+
+    @pytest.mark.asyncio
+    async def test_upsert_many_repeated_email(self, postgres_user_storage, sample_user):
+        """Test that an email repeated in a batch is stored once, with its last names."""
+        again = User(email=sample_user.email, first_name="Again", last_name="User")
+
+        assert await postgres_user_storage.upsert_many([sample_user, again]) == 1
+        assert (await postgres_user_storage.fetch_by(sample_user.email)).first_name == "Again"
+
+    @pytest.mark.asyncio
+    async def test_upsert_many_empty_batch(self, postgres_user_storage):
+        """Test that upserting an empty batch is a no-op."""
+        assert await postgres_user_storage.upsert_many([]) == 0
+
+    @pytest.mark.asyncio
+    async def test_iter_all_by_batches(self, postgres_user_storage, sample_users):
+        """Test iterating over every user by id, with batches smaller than the table."""
+        await postgres_user_storage.insert_many(sample_users)
+
+        users = [user async for user in postgres_user_storage.iter_all(batch_size=2)]
+
+        assert users == sorted(sample_users, key=lambda user: user.id)
+
+    @pytest.mark.asyncio
+    async def test_iter_all_empty_storage(self, postgres_user_storage):
+        """Test iterating over an empty storage."""
+        assert [user async for user in postgres_user_storage.iter_all(batch_size=2)] == []
+
+    @staticmethod
+    async def total_changes(connection):
+        """The number of rows written by a connection so far."""
+        result = await connection.execute(text("SELECT total_changes()"))
+        return result.scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_update_by_email(self, postgres_user_storage, async_connection, sample_user):
+        """Test updating the given names of a user, in one statement."""
+        await postgres_user_storage.insert(sample_user)
+        statements = []
+
+        def record(*args):
+            statements.append(args[2])
+
+        event.listen(async_connection.sync_connection, "before_cursor_execute", record)
+        updated = await postgres_user_storage.update_by_email(sample_user.email, first_name="New")
+        event.remove(async_connection.sync_connection, "before_cursor_execute", record)
+
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE users SET first_name=?")
+        assert updated.id == sample_user.id
+        assert updated.first_name == "New"
+        assert updated.last_name == sample_user.last_name
+        assert await postgres_user_storage.fetch_by(sample_user.email) == updated
+
+    @pytest.mark.asyncio
+    async def test_update_by_email_skips_no_op(
+        self, postgres_user_storage, async_connection, sample_user
+    ):
+        """Test that an update changing nothing writes nothing."""
+        await postgres_user_storage.insert(sample_user)
+        written = await self.total_changes(async_connection)
+
+        same = await postgres_user_storage.update_by_email(
+            sample_user.email, first_name=sample_user.first_name
+        )
+        unchanged = await postgres_user_storage.update_by_email(sample_user.email)
+
+        assert same == unchanged == sample_user
+        assert await self.total_changes(async_connection) == written
+
+    @pytest.mark.asyncio
+    async def test_update_by_unknown_email(self, postgres_user_storage):
+        """Test that updating an unknown user returns None."""
+        assert await postgres_user_storage.update_by_email("no@example.com", last_name="X") is None
+
+    @pytest.mark.asyncio
+    async def test_delete_by_email(self, postgres_user_storage, sample_users):
+        """Test deleting a user by email, returning it."""
+        await postgres_user_storage.insert_many(sample_users)
+
+        deleted = await postgres_user_storage.delete_by_email(sample_users[0].email)
+
+        assert deleted == sample_users[0]
+        assert await postgres_user_storage.fetch_by(sample_users[0].email) is None
+        assert await postgres_user_storage.fetch_by(sample_users[1].email) == sample_users[1]
+
+    @pytest.mark.asyncio
+    async def test_delete_by_unknown_email(self, postgres_user_storage):
+        """Test that deleting an unknown user returns None."""
+        assert await postgres_user_storage.delete_by_email("no@example.com") is None
+
+    @pytest.fixture
+    def domain_users(self):
+        """Provides users of two email domains."""
+        return [
+            User(email=f"user{i}@{domain}", first_name="User", last_name=str(i))
+            for domain in ("example.com", "example.org")
+            for i in range(5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_count_where(self, postgres_user_storage, domain_users):
+        """Test counting the users matching a filter."""
+        await postgres_user_storage.insert_many(domain_users)
+
+        assert await postgres_user_storage.count_where(UserFilter()) == 10
+        assert await postgres_user_storage.count_where(UserFilter(email_domain="EXAMPLE.com")) == 5
+        assert await postgres_user_storage.count_where(UserFilter(email_domain="example_com")) == 0
+        assert await postgres_user_storage.count_where(UserFilter(last_name="1")) == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_where_by_batches(self, postgres_user_storage, domain_users):
+        """Test deleting the matching users by batches, each after the previous one."""
+        await postgres_user_storage.insert_many(domain_users)
+        matching = UserFilter(email_domain="example.com")
+
+        first = await postgres_user_storage.delete_where(matching, limit=3)
+        second = await postgres_user_storage.delete_where(matching, limit=3, after=max(first))
+
+        assert len(first) == 3 and len(second) == 2
+        assert max(first) < min(second)
+        assert await postgres_user_storage.count_where(matching) == 0
+        assert await postgres_user_storage.count_where(UserFilter()) == 5
+
+    @pytest.mark.asyncio
+    async def test_update_where_changed_users_only(self, postgres_user_storage, domain_users):
+        """Test that updating the matching users writes the changed ones only."""
+        await postgres_user_storage.insert_many(domain_users)
+        await postgres_user_storage.update_by_email("user0@example.org", first_name="Renamed")
+
+        changed = await postgres_user_storage.update_where(
+            UserFilter(email_domain="example.org"), limit=10, first_name="Renamed"
+        )
+
+        assert len(changed) == 4
+        assert await postgres_user_storage.count_where(UserFilter(first_name="Renamed")) == 5
+
+    @pytest.mark.asyncio
+    async def test_count_where_changes(self, postgres_user_storage, domain_users):
+        """Test that given names, only the matching users to change are counted."""
+        await postgres_user_storage.insert_many(domain_users)
+        await postgres_user_storage.update_by_email("user0@example.org", first_name="Renamed")
+        matching = UserFilter(email_domain="example.org")
+
+        assert await postgres_user_storage.count_where(matching, first_name="Renamed") == 4
+        assert await postgres_user_storage.count_where(matching) == 5
+
+    @pytest.mark.asyncio
+    async def test_update_many_and_count_changes(self, postgres_user_storage, domain_users):
+        """Test updating users by email, counting the changed ones."""
+        await postgres_user_storage.insert_many(domain_users)
+        batch = [
+            User(email="user0@example.com", first_name="User", last_name="0"),
+            User(email="user1@example.com", first_name="New", last_name="Name"),
+            User(email="nobody@example.com", first_name="No", last_name="Body"),
+        ]
+
+        assert await postgres_user_storage.count_changes(batch) == 1
+        assert await postgres_user_storage.update_many(batch) == 1
+        assert await postgres_user_storage.count_changes(batch) == 0
+        assert await postgres_user_storage.fetch_by("user1@example.com") == User(
+            email="user1@example.com", first_name="New", last_name="Name", id_=domain_users[1].id
+        )
+
+    @pytest.mark.asyncio
+    async def test_iter_digests_by_email(self, postgres_user_storage, domain_users):
+        """Test iterating over the digests of every user by email, by batches."""
+        await postgres_user_storage.insert_many(domain_users)
+
+        digests = [digest async for digest in postgres_user_storage.iter_digests(batch_size=3)]
+
+        assert [digest.email for digest in digests] == sorted(u.email for u in domain_users)
+        by_email = {user.email: user for user in domain_users}
+        for digest in digests:
+            assert digest.id == by_email[digest.email].id
+            assert digest.content_hash == by_email[digest.email].content_hash
+
+    @pytest.mark.asyncio
+    async def test_content_hash_follows_writes(self, postgres_user_storage, domain_users):
+        """Test that the content hash is kept, or made unknown by the set-based updates."""
+        await postgres_user_storage.insert_many(domain_users)
+        renamed = User(email="user1@example.com", first_name="New", last_name="Name")
+        await postgres_user_storage.update_many([renamed])
+        await postgres_user_storage.update_by_email("user2@example.com", "Both", "Names")
+        await postgres_user_storage.update_by_email("user3@example.com", first_name="One")
+        await postgres_user_storage.update_where(
+            UserFilter(email_domain="example.org"), limit=10, last_name="Org"
+        )
+
+        digests = {
+            digest.email: digest.content_hash
+            async for digest in postgres_user_storage.iter_digests(batch_size=100)
+        }
+
+        assert digests["user0@example.com"] == domain_users[0].content_hash
+        assert digests["user1@example.com"] == renamed.content_hash
+        assert (
+            digests["user2@example.com"] == User("user2@example.com", "Both", "Names").content_hash
+        )
+        assert digests["user3@example.com"] is None
+        assert {digests[f"user{i}@example.org"] for i in range(5)} == {None}
+
+    @pytest.mark.asyncio
+    async def test_upsert_many_fills_unknown_hashes(self, postgres_user_storage, domain_users):
+        """Test that upserting unchanged names writes the users whose hash is unknown."""
+        await postgres_user_storage.insert_many(domain_users)
+        await postgres_user_storage.update_by_email("user0@example.com", first_name="Renamed")
+        renamed = await postgres_user_storage.fetch_by("user0@example.com")
+
+        assert await postgres_user_storage.upsert_many([renamed, domain_users[1]]) == 1
+        digests = [d async for d in postgres_user_storage.iter_digests(batch_size=100)]
+        assert None not in {digest.content_hash for digest in digests}
+
+    @pytest.mark.asyncio
+    async def test_delete_many(self, postgres_user_storage, domain_users):
+        """Test deleting users by id, unknown ids being ignored."""
+        await postgres_user_storage.insert_many(domain_users)
+
+        deleted = await postgres_user_storage.delete_many([domain_users[0].id, uuid4()])
+
+        assert deleted == 1
+        assert await postgres_user_storage.fetch_by(domain_users[0].email) is None
+        assert await postgres_user_storage.count_where(UserFilter()) == 9
+        assert await postgres_user_storage.delete_many([]) == 0
+
     @pytest.mark.asyncio
     async def test_storage_isolation_with_connection(self, async_connection):
         """Test that storage instances with same connection share data."""
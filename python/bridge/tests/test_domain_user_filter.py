@@ -0,0 +1,26 @@
+from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_filter import UserFilter
+
+
+class TestUserFilter:
+    """Tests for UserFilter domain model."""
+
+    def test_empty_filter_matches_every_user(self):
+        """Test that a filter without criteria matches every user."""
+        user = User(email="ada@example.com", first_name="Ada", last_name="Lovelace")
+
+        assert UserFilter().matches(user)
+
+    def test_email_domain_is_case_insensitive(self):
+        """Test that the email domain matches whatever its case."""
+        user = User(email="ada@Example.com", first_name="Ada", last_name="Lovelace")
+
+        assert UserFilter(email_domain="example.COM").matches(user)
+        assert not UserFilter(email_domain="ample.com").matches(user)
+
+    def test_criteria_are_combined(self):
+        """Test that every criterion must match."""
+        user = User(email="ada@example.com", first_name="Ada", last_name="Lovelace")
+
+        assert UserFilter(email_domain="example.com", first_name="Ada").matches(user)
+        assert not UserFilter(email_domain="example.com", last_name="Byron").matches(user)
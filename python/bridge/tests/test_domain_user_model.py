@@ -84,3 +84,15 @@ class TestUser:
         assert "Test" in repr_str
         assert "User" in repr_str
         assert str(user_id) in repr_str
+
+    def test_content_hash(self):
+        """Test that the content hash depends on the synchronised fields only."""
+        user = User(email="test@example.com", first_name="Test", last_name="User")
+        same = User(email="test@example.com", first_name="Test", last_name="User", id_=uuid4())
+        renamed = User(email="test@example.com", first_name="Test", last_name="Users")
+        shifted = User(email="test@example.com", first_name="TestU", last_name="ser")
+
+        assert len(user.content_hash) == 32
+        assert user.content_hash == same.content_hash
+        assert user.content_hash != renamed.content_hash
+        assert user.content_hash != shifted.content_hash
@@ -0,0 +1,105 @@
+import pytest
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_filter import UserFilter
+from bridge.domain.users.services.create_user import CreateUser
+from bridge.domain.users.services.delete_users import DeleteUsers
+from bridge.domain.users.services.delete_users import DeleteUsersHandler
+from bridge.domain.users.services.update_users import UpdateUsers
+from bridge.domain.users.services.update_users import UpdateUsersByEmail
+from bridge.domain.users.services.update_users import UpdateUsersByEmailHandler
+from bridge.domain.users.services.update_users import UpdateUsersHandler
+from bridge.domain.users.storages.in_memory import InMemoryUserStorage
+
+
+@pytest.fixture
+def storage():
+    """Provides an in-memory storage with users of two email domains."""
+    return InMemoryUserStorage(
+        *(
+            User(email=f"user{i}@{domain}", first_name="User", last_name=str(i))
+            for domain in ("example.com", "example.org")
+            for i in range(5)
+        )
+    )
+
+
+class TestDeleteUsersHandler:
+    """Tests for DeleteUsersHandler."""
+
+    @pytest.mark.asyncio
+    async def test_handle_deletes_by_batches(self, storage):
+        """Test deleting the matching users, a batch at a time."""
+        handler = DeleteUsersHandler(storage)
+        command = DeleteUsers(filter=UserFilter(email_domain="example.com"), batch_size=2)
+
+        counts = [count async for count in handler.handle(command)]
+
+        assert counts == [2, 2, 1]
+        assert {user.email.split("@")[1] for user in storage.items} == {"example.org"}
+
+    @pytest.mark.asyncio
+    async def test_handle_dry_run(self, storage):
+        """Test that a dry run counts the matching users, deleting nothing."""
+        handler = DeleteUsersHandler(storage)
+        command = DeleteUsers(UserFilter(email_domain="example.com"), batch_size=2, dry_run=True)
+
+        counts = [count async for count in handler.handle(command)]
+
+        assert counts == [5]
+        assert len(storage.items) == 10
+
+
+class TestUpdateUsersHandler:
+    """Tests for UpdateUsersHandler."""
+
+    @pytest.mark.asyncio
+    async def test_handle_updates_by_batches(self, storage):
+        """Test updating the matching users, a batch at a time, skipping unchanged ones."""
+        handler = UpdateUsersHandler(storage)
+        await storage.update_by_email("user0@example.org", first_name="Renamed")
+        command = UpdateUsers(
+            UserFilter(email_domain="example.org"), "Renamed", None, batch_size=3
+        )
+
+        counts = [count async for count in handler.handle(command)]
+
+        assert counts == [3, 1]
+        assert {user.first_name for user in storage.items if "org" in user.email} == {"Renamed"}
+        assert {user.first_name for user in storage.items if "com" in user.email} == {"User"}
+
+    @pytest.mark.asyncio
+    async def test_handle_dry_run(self, storage):
+        """Test that a dry run counts the users to change only, changing nothing."""
+        handler = UpdateUsersHandler(storage)
+        await storage.update_by_email("user0@example.org", first_name="Renamed")
+        command = UpdateUsers(
+            UserFilter(email_domain="example.org"), "Renamed", None, batch_size=3, dry_run=True
+        )
+
+        counts = [count async for count in handler.handle(command)]
+
+        assert counts == [4]
+        assert await storage.count_where(UserFilter(first_name="Renamed")) == 1
+
+
+class TestUpdateUsersByEmailHandler:
+    """Tests for UpdateUsersByEmailHandler."""
+
+    @pytest.mark.asyncio
+    async def test_handle_updates_changed_users(self, storage):
+        """Test that only the known users with new names are changed."""
+        handler = UpdateUsersByEmailHandler(storage)
+        command = UpdateUsersByEmail(
+            users=[
+                CreateUser("user0@example.com", "User", "0"),
+                CreateUser("user1@example.com", "New", "Name"),
+                CreateUser("nobody@example.com", "No", "Body"),
+            ]
+        )
+
+        assert await handler.handle(UpdateUsersByEmail(command.users, dry_run=True)) == 1
+        assert (await storage.fetch_by("user1@example.com")).first_name == "User"
+        assert await handler.handle(command) == 1
+        assert (await storage.fetch_by("user1@example.com")).first_name == "New"
+        assert await storage.fetch_by("nobody@example.com") is None
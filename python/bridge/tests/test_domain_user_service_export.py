@@ -0,0 +1,25 @@
+import pytest
+
+from bridge.domain.users.services.export_users import ExportUsers
+from bridge.domain.users.services.export_users import ExportUsersHandler
+from bridge.domain.users.storages.in_memory import InMemoryUserStorage
+
+
+class TestExportUsersHandler:
+    """Tests for ExportUsersHandler."""
+
+    @pytest.mark.asyncio
+    async def test_handle_streams_every_user(self, sample_users):
+        """Test that every user is streamed, by id."""
+        handler = ExportUsersHandler(InMemoryUserStorage(*sample_users))
+
+        users = [user async for user in handler.handle(ExportUsers(batch_size=2))]
+
+        assert users == sorted(sample_users, key=lambda user: user.id)
+
+    @pytest.mark.asyncio
+    async def test_handle_empty_storage(self, in_memory_user_storage):
+        """Test exporting an empty storage."""
+        handler = ExportUsersHandler(in_memory_user_storage)
+
+        assert [user async for user in handler.handle(ExportUsers(batch_size=2))] == []
@@ -2,6 +2,7 @@ import pytest
 from faker import Faker
 
 from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_cursor import UserCursor
 from bridge.domain.users.services.fetch_all_users import FetchAllUsers
 from bridge.domain.users.services.fetch_all_users import FetchAllUsersHandler
 from bridge.domain.users.storages.in_memory import InMemoryUserStorage
@@ -122,6 +123,15 @@ class TestFetchAllUsersHandler:
 
         assert len(users) == 2
 
+    @pytest.mark.asyncio
+    async def test_handle_after_cursor(self, handler_with_users, sample_users):
+        """Test fetching the users after a cursor."""
+        query = FetchAllUsers(limit=2, offset=0, after=UserCursor.of(sample_users[0]))
+
+        users = await handler_with_users.handle(query)
+
+        assert users == sample_users[1:3]
+
     @pytest.mark.asyncio
     async def test_handle_limit_larger_than_available(self, handler_with_users, sample_users):
         """Test fetching with limit larger than available users."""
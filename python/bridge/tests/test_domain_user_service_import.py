@@ -0,0 +1,39 @@
+import pytest
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.services.create_user import CreateUser
+from bridge.domain.users.services.import_users import ImportUsers
+from bridge.domain.users.services.import_users import ImportUsersHandler
+from bridge.domain.users.storages.in_memory import InMemoryUserStorage
+
+
+class TestImportUsersHandler:
+    """Tests for ImportUsersHandler."""
+
+    @pytest.mark.asyncio
+    async def test_handle_imports_batch(self, in_memory_user_storage, multiple_user_data):
+        """Test importing a batch of users."""
+        handler = ImportUsersHandler(in_memory_user_storage)
+        command = ImportUsers(users=[CreateUser(**data) for data in multiple_user_data])
+
+        result = await handler.handle(command)
+
+        assert result.rejected == []
+        assert [user.email for user in result.users] == [
+            data["email"] for data in multiple_user_data
+        ]
+        assert len(in_memory_user_storage.items) == len(multiple_user_data)
+
+    @pytest.mark.asyncio
+    async def test_handle_rejects_existing_emails(self, multiple_user_data):
+        """Test that users already stored are rejected, without aborting the batch."""
+        existing = User(**multiple_user_data[0])
+        storage = InMemoryUserStorage(existing)
+        handler = ImportUsersHandler(storage)
+        command = ImportUsers(users=[CreateUser(**data) for data in multiple_user_data])
+
+        result = await handler.handle(command)
+
+        assert [user.email for user in result.rejected] == [existing.email]
+        assert result.rejected == [result.users[0]]
+        assert len(storage.items) == len(multiple_user_data)
@@ -0,0 +1,83 @@
+import pytest
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.services.pull_users import PullUsers
+from bridge.domain.users.services.pull_users import PullUsersHandler
+from bridge.domain.users.sources.interface import UserSource
+from bridge.domain.users.sources.interface import UsersPage
+from bridge.domain.users.storages.in_memory import InMemoryUserStorage
+
+
+class ListUserSource(UserSource):
+    """A source of users held in a list, failing at the given offset if any."""
+
+    def __init__(self, users: list[User], fail_at: int | None = None):
+        self.users = users
+        self.fail_at = fail_at
+        self.offsets: list[int] = []
+
+    async def fetch_page(self, offset: int, limit: int) -> UsersPage:
+        self.offsets.append(offset)
+        if offset == self.fail_at:
+            raise RuntimeError("Upstream down")
+        return UsersPage(users=self.users[offset:][:limit], total=len(self.users))
+
+
+class TestPullUsersHandler:
+    """Tests for the PullUsersHandler class."""
+
+    @pytest.mark.asyncio
+    async def test_pull_users_by_batches(self, upstream_users):
+        """Test that every page is fetched once, and its users stored by batches."""
+        storage = InMemoryUserStorage()
+        source = ListUserSource(upstream_users)
+        handler = PullUsersHandler(storage, source)
+
+        command = PullUsers(page_size=4, concurrency=3, batch_size=10)
+        batches = [batch async for batch in handler.handle(command)]
+
+        assert sorted(source.offsets) == list(range(0, 25, 4))
+        assert [batch.received for batch in batches[:-1]] == [12] * (len(batches) - 1)
+        assert sum(batch.received for batch in batches) == 25
+        assert sum(batch.changed for batch in batches) == 25
+        assert {user.email for user in storage.items} == {user.email for user in upstream_users}
+
+    @pytest.mark.asyncio
+    async def test_pull_users_updates_changed_names(self, upstream_users):
+        """Test that stored users are updated by email, only when their names changed."""
+        stored = User(email=upstream_users[0].email, first_name="Old", last_name="Name")
+        unchanged = User(
+            email=upstream_users[1].email,
+            first_name=upstream_users[1].first_name,
+            last_name=upstream_users[1].last_name,
+        )
+        storage = InMemoryUserStorage(stored, unchanged)
+        handler = PullUsersHandler(storage, ListUserSource(upstream_users))
+
+        command = PullUsers(page_size=10, concurrency=2, batch_size=100)
+        batches = [batch async for batch in handler.handle(command)]
+
+        assert sum(batch.changed for batch in batches) == 24
+        assert len(storage.items) == 25
+        updated = await storage.fetch_by(stored.email)
+        assert updated.id == stored.id
+        assert updated.first_name == upstream_users[0].first_name
+
+    @pytest.mark.asyncio
+    async def test_pull_users_empty_source(self):
+        """Test pulling from a source without users."""
+        handler = PullUsersHandler(InMemoryUserStorage(), ListUserSource([]))
+
+        command = PullUsers(page_size=10, concurrency=2, batch_size=100)
+
+        assert [batch async for batch in handler.handle(command)] == []
+
+    @pytest.mark.asyncio
+    async def test_pull_users_fetch_error(self, upstream_users):
+        """Test that a page failing to be fetched fails the pull."""
+        handler = PullUsersHandler(InMemoryUserStorage(), ListUserSource(upstream_users, 10))
+
+        command = PullUsers(page_size=5, concurrency=2, batch_size=100)
+        with pytest.raises(RuntimeError, match="Upstream down"):
+            async for _ in handler.handle(command):
+                pass
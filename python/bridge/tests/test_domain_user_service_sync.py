@@ -0,0 +1,87 @@
+import pytest
+
+from bridge.domain.users.models.user import User
+from bridge.domain.users.services.sync_users import SyncUsers
+from bridge.domain.users.services.sync_users import SyncUsersHandler
+from bridge.domain.users.storages.in_memory import InMemoryUserStorage
+from tests.test_domain_user_service_pull import ListUserSource
+
+
+def copy(user: User, **names: str) -> User:
+    """A stored copy of an upstream user, with the given names changed."""
+    return User(
+        email=user.email,
+        first_name=names.get("first_name", user.first_name),
+        last_name=names.get("last_name", user.last_name),
+    )
+
+
+class TestSyncUsersHandler:
+    """Tests for the SyncUsersHandler class."""
+
+    @pytest.fixture
+    def storage(self, upstream_users):
+        """Provides stored users: some upstream ones, one renamed, and two gone upstream."""
+        return InMemoryUserStorage(
+            User(email="aaron@example.com", first_name="Gone", last_name="Before"),
+            *(copy(user) for user in upstream_users[:10]),
+            copy(upstream_users[10], last_name="Renamed"),
+            User(email="user10b@example.com", first_name="Gone", last_name="Between"),
+        )
+
+    @pytest.mark.asyncio
+    async def test_sync_users(self, storage, upstream_users):
+        """Test that only the changes are applied, unchanged users kept as they are."""
+        unchanged = {user.email: user for user in storage.items if user.first_name != "Gone"}
+        handler = SyncUsersHandler(storage, ListUserSource(upstream_users))
+
+        command = SyncUsers(page_size=4, concurrency=3, batch_size=5)
+        batches = [batch async for batch in handler.handle(command)]
+
+        assert sum(batch.inserted for batch in batches) == 14
+        assert sum(batch.updated for batch in batches) == 1
+        assert sum(batch.deleted for batch in batches) == 2
+        assert sum(batch.unchanged for batch in batches) == 10
+        assert all(batch.inserted + batch.updated + batch.deleted <= 5 for batch in batches)
+        assert sorted(user.email for user in storage.items) == [u.email for u in upstream_users]
+        for user in upstream_users[:10]:
+            assert await storage.fetch_by(user.email) is unchanged[user.email]
+        updated = await storage.fetch_by(upstream_users[10].email)
+        assert updated.id == unchanged[updated.email].id
+        assert updated.last_name == upstream_users[10].last_name
+
+    @pytest.mark.asyncio
+    async def test_sync_users_dry_run(self, storage, upstream_users):
+        """Test that a dry run counts the changes without applying them."""
+        stored = sorted(storage.items, key=lambda user: user.email)
+        handler = SyncUsersHandler(storage, ListUserSource(upstream_users))
+
+        command = SyncUsers(page_size=10, concurrency=2, batch_size=1000, dry_run=True)
+        batches = [batch async for batch in handler.handle(command)]
+
+        assert [(b.inserted, b.updated, b.deleted, b.unchanged) for b in batches] == [
+            (14, 1, 2, 10)
+        ]
+        assert sorted(storage.items, key=lambda user: user.email) == stored
+
+    @pytest.mark.asyncio
+    async def test_sync_users_empty_source(self, storage):
+        """Test that syncing with an empty upstream deletes every stored user."""
+        handler = SyncUsersHandler(storage, ListUserSource([]))
+
+        command = SyncUsers(page_size=10, concurrency=2, batch_size=5)
+        batches = [batch async for batch in handler.handle(command)]
+
+        assert sum(batch.deleted for batch in batches) == 13
+        assert storage.items == []
+
+    @pytest.mark.asyncio
+    async def test_sync_users_unsorted_source(self, upstream_users):
+        """Test that an upstream not sorted by email fails the sync."""
+        source = ListUserSource(list(reversed(upstream_users)))
+        handler = SyncUsersHandler(InMemoryUserStorage(), source)
+
+        command = SyncUsers(page_size=10, concurrency=2, batch_size=5)
+        with pytest.raises(ValueError, match="not sorted by email"):
+            async for _ in handler.handle(command):
+                pass
@@ -1,6 +1,9 @@
+from uuid import uuid4
+
 import pytest
 
 from bridge.domain.users.models.user import User
+from bridge.domain.users.models.user_cursor import UserCursor
 from bridge.domain.users.storages.in_memory import InMemoryUserStorage
 
 
@@ -43,6 +46,57 @@ class TestInMemoryUserStorage:
         for user in sample_users:
             assert user in empty_storage.items
 
+    @pytest.mark.asyncio
+    async def test_insert_many_rejects_duplicate_emails(self, storage_with_users, sample_users):
+        """Test that inserting many users rejects the already stored emails."""
+        duplicate = User(email=sample_users[0].email, first_name="Other", last_name="User")
+        new_user = User(email="new@example.com", first_name="New", last_name="User")
+        repeated = User(email="new@example.com", first_name="Again", last_name="User")
+
+        rejected = await storage_with_users.insert_many([duplicate, new_user, repeated])
+
+        assert rejected == [duplicate, repeated]
+        assert new_user in storage_with_users.items
+        assert len(storage_with_users.items) == len(sample_users) + 1
+
+    @pytest.mark.asyncio
+    async def test_iter_digests_by_email(self, storage_with_users, sample_users):
+        """Test iterating over the digests of every user by email."""
+        digests = [digest async for digest in storage_with_users.iter_digests(batch_size=2)]
+
+        assert [digest.email for digest in digests] == sorted(u.email for u in sample_users)
+        assert {(digest.id, digest.content_hash) for digest in digests} == {
+            (user.id, user.content_hash) for user in sample_users
+        }
+
+    @pytest.mark.asyncio
+    async def test_delete_many(self, storage_with_users, sample_users):
+        """Test deleting users by id, unknown ids being ignored."""
+        deleted = await storage_with_users.delete_many([sample_users[0].id, uuid4()])
+
+        assert deleted == 1
+        assert await storage_with_users.fetch_by(sample_users[0].email) is None
+        assert len(storage_with_users.items) == len(sample_users) - 1
+
+    @pytest.mark.asyncio
+    async def test_upsert_many(self, storage_with_users, sample_users):
+        """Test that upserting inserts new emails, and updates the names that changed."""
+        renamed = User(email=sample_users[0].email, first_name="New", last_name="Name")
+        unchanged = User(
+            email=sample_users[1].email,
+            first_name=sample_users[1].first_name,
+            last_name=sample_users[1].last_name,
+        )
+        new_user = User(email="new@example.com", first_name="New", last_name="User")
+
+        changed = await storage_with_users.upsert_many([renamed, unchanged, new_user])
+
+        assert changed == 2
+        updated = await storage_with_users.fetch_by(renamed.email)
+        assert (updated.id, updated.first_name) == (sample_users[0].id, "New")
+        assert new_user in storage_with_users.items
+        assert len(storage_with_users.items) == len(sample_users) + 1
+
     @pytest.mark.asyncio
     async def test_update_existing_user(self, storage_with_users, sample_users):
         """Test updating an existing user."""
@@ -109,12 +163,38 @@ class TestInMemoryUserStorage:
         for user in expected_users:
             assert user in users
 
+    @pytest.mark.asyncio
+    async def test_fetch_all_after_cursor(self, storage_with_users, sample_users):
+        """Test fetching the users after a given one."""
+        after = UserCursor.of(sample_users[1])
+
+        users = await storage_with_users.fetch_all(limit=2, offset=0, after=after)
+
+        assert users == sample_users[2:4]
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_after_deleted_cursor(self, storage_with_users, sample_users):
+        """Test that the page after the cursor of a deleted user still comes."""
+        after = UserCursor.of(sample_users[1])
+
+        await storage_with_users.delete(sample_users[1])
+
+        users = await storage_with_users.fetch_all(limit=2, offset=0, after=after)
+        assert users == sample_users[2:4]
+
     @pytest.mark.asyncio
     async def test_fetch_all_empty_storage(self, empty_storage):
         """Test fetching from empty storage."""
         users = await empty_storage.fetch_all(limit=10, offset=0)
         assert len(users) == 0
 
+    @pytest.mark.asyncio
+    async def test_iter_all(self, storage_with_users, sample_users):
+        """Test iterating over every user by id."""
+        users = [user async for user in storage_with_users.iter_all(batch_size=2)]
+
+        assert users == sorted(sample_users, key=lambda user: user.id)
+
     @pytest.mark.asyncio
     async def test_delete_existing_user(self, storage_with_users, sample_users):
         """Test deleting an existing user."""
@@ -142,6 +222,105 @@ class TestInMemoryUserStorage:
 
         assert len(storage_with_users.items) == initial_count
 
+    @pytest.mark.asyncio
+    async def test_insert_existing_id_raises_error(self, storage_with_users, sample_users):
+        """Test that inserting a user twice raises an error, like the database storage."""
+        with pytest.raises(RuntimeError, match="User already exists"):
+            await storage_with_users.insert(sample_users[0])
+
+    @pytest.mark.asyncio
+    async def test_insert_duplicate_email_raises_error(self, storage_with_users, sample_users):
+        """Test that inserting a duplicate email raises an error, like the database storage."""
+        duplicate = User(email=sample_users[0].email, first_name="Other", last_name="User")
+
+        with pytest.raises(RuntimeError, match="Email already exists"):
+            await storage_with_users.insert(duplicate)
+
+        assert await storage_with_users.fetch_by(duplicate.email) == sample_users[0]
+
+    @pytest.mark.asyncio
+    async def test_update_email_keeps_index_in_sync(self, storage_with_users, sample_users):
+        """Test that a user is fetched by its new email only, once updated."""
+        user = sample_users[0]
+        previous_email = user.email
+        user.email = "changed@example.com"
+
+        await storage_with_users.update(user)
+
+        assert await storage_with_users.fetch_by("changed@example.com") == user
+        assert await storage_with_users.fetch_by(previous_email) is None
+
+    @pytest.mark.asyncio
+    async def test_update_to_used_email_raises_error(self, storage_with_users, sample_users):
+        """Test that taking the email of another user raises an error."""
+        user = User(
+            email=sample_users[1].email,
+            first_name=sample_users[0].first_name,
+            last_name=sample_users[0].last_name,
+            id_=sample_users[0].id,
+        )
+
+        with pytest.raises(RuntimeError, match="Email already exists"):
+            await storage_with_users.update(user)
+
+    @pytest.mark.asyncio
+    async def test_delete_frees_email(self, storage_with_users, sample_users):
+        """Test that the email of a deleted user can be used again."""
+        await storage_with_users.delete(sample_users[0])
+        user = User(email=sample_users[0].email, first_name="New", last_name="User")
+
+        await storage_with_users.insert(user)
+
+        assert await storage_with_users.fetch_by(user.email) == user
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_pages_after_deletes(self, storage_with_users, sample_users):
+        """Test that pages skip deleted users, by offset or after a cursor."""
+        await storage_with_users.delete(sample_users[1])
+        await storage_with_users.delete(sample_users[3])
+        user = User(email="new@example.com", first_name="New", last_name="User")
+        await storage_with_users.insert(user)
+        expected = [sample_users[0], sample_users[2], sample_users[4], user]
+
+        cursor = UserCursor.of(sample_users[0])
+        after = await storage_with_users.fetch_all(limit=2, offset=1, after=cursor)
+        by_offset = await storage_with_users.fetch_all(limit=10, offset=1)
+
+        assert after == expected[2:4]
+        assert by_offset == expected[1:]
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_keeps_insertion_order_on_update(
+        self, storage_with_users, sample_users
+    ):
+        """Test that updating a user keeps its place, like its creation time in the database."""
+        sample_users[0].first_name = "Updated"
+
+        await storage_with_users.update(sample_users[0])
+
+        assert await storage_with_users.fetch_all(limit=10, offset=0) == sample_users
+
+    @pytest.mark.asyncio
+    async def test_update_by_email(self, storage_with_users, sample_users):
+        """Test updating the given names of a user."""
+        user = sample_users[0]
+        last_name = user.last_name
+
+        updated = await storage_with_users.update_by_email(user.email, first_name="New")
+
+        assert updated.first_name == "New"
+        assert updated.last_name == last_name
+        assert await storage_with_users.fetch_by(user.email) == updated
+
+    @pytest.mark.asyncio
+    async def test_delete_by_email(self, storage_with_users, sample_users):
+        """Test deleting a user by email, returning it."""
+        deleted = await storage_with_users.delete_by_email(sample_users[0].email)
+
+        assert deleted == sample_users[0]
+        assert await storage_with_users.fetch_by(sample_users[0].email) is None
+        assert await storage_with_users.delete_by_email(sample_users[0].email) is None
+
     def test_items_property_returns_list(self, storage_with_users, sample_users):
         """Test that items property returns a list."""
         items = storage_with_users.items
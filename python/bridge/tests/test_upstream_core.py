@@ -0,0 +1,77 @@
+import pytest
+
+from bridge.upstream.core import CircuitBreaker
+from bridge.upstream.core import CircuitOpenError
+
+
+class Clock:
+    """A clock moved by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker class."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens after `threshold` failures in a row."""
+        breaker = CircuitBreaker(threshold=3, reset_timeout=10, clock=Clock())
+
+        breaker.failure()
+        breaker.failure()
+        breaker.check()
+        breaker.failure()
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+    def test_success_resets_failures(self):
+        """Test that a success resets the count of consecutive failures."""
+        breaker = CircuitBreaker(threshold=2, reset_timeout=10, clock=Clock())
+
+        breaker.failure()
+        breaker.success()
+        breaker.failure()
+
+        assert breaker.state == "closed"
+
+    def test_half_open_after_reset_timeout(self):
+        """Test that the circuit lets calls through again once the reset timeout passed."""
+        clock = Clock()
+        breaker = CircuitBreaker(threshold=1, reset_timeout=10, clock=clock)
+        breaker.failure()
+
+        clock.now = 10
+
+        assert breaker.state == "half-open"
+        breaker.check()
+
+    def test_half_open_success_closes(self):
+        """Test that a success closes a half-open circuit."""
+        clock = Clock()
+        breaker = CircuitBreaker(threshold=1, reset_timeout=10, clock=clock)
+        breaker.failure()
+        clock.now = 10
+
+        breaker.success()
+
+        assert breaker.state == "closed"
+
+    def test_half_open_failure_reopens(self):
+        """Test that a failure reopens a half-open circuit, for another reset timeout."""
+        clock = Clock()
+        breaker = CircuitBreaker(threshold=3, reset_timeout=10, clock=clock)
+        for _ in range(3):
+            breaker.failure()
+        clock.now = 10
+
+        breaker.failure()
+
+        assert breaker.state == "open"
+        clock.now = 19
+        assert breaker.state == "open"
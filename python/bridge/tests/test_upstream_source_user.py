@@ -0,0 +1,148 @@
+from dataclasses import replace
+
+import httpx
+import pytest
+
+from bridge.config import UpstreamConfig
+from bridge.upstream.core import CircuitOpenError
+from bridge.upstream.core import UpstreamError
+from bridge.upstream.core import get_client
+from bridge.upstream.sources.user import DummyJsonUserSource
+from tests.conftest import StandInUpstream
+
+CONFIG = UpstreamConfig(
+    url="http://upstream.test", max_retries=3, backoff=0, failure_threshold=3, reset_timeout=60
+)
+
+
+def source_for(app, config: UpstreamConfig = CONFIG) -> DummyJsonUserSource:
+    """A source of users served by the given stand-in upstream (an ASGI application)."""
+    client = get_client(config, concurrency=2, transport=httpx.ASGITransport(app=app))
+    return DummyJsonUserSource(client, config, concurrency=2)
+
+
+class TestDummyJsonUserSource:
+    """Tests for the DummyJsonUserSource class."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_page(self, upstream_users):
+        """Test fetching a page of users, with the total number of users."""
+        app = StandInUpstream(upstream_users)
+
+        page = await source_for(app).fetch_page(offset=10, limit=10)
+
+        assert page.total == 25
+        assert [user.email for user in page.users] == [
+            user.email for user in upstream_users[10:20]
+        ]
+        assert page.users[0].first_name == upstream_users[10].first_name
+        assert app.requests == [
+            {
+                "limit": "10",
+                "skip": "10",
+                "select": "firstName,lastName,email",
+                "sortBy": "email",
+                "order": "asc",
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_retries_rate_limited_requests(self, upstream_users):
+        """Test that rate limited requests are retried after their Retry-After delay."""
+        app = StandInUpstream(upstream_users, statuses=(429, 429))
+
+        page = await source_for(app).fetch_page(offset=0, limit=10)
+
+        assert len(page.users) == 10
+        assert len(app.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_retries_server_errors(self, upstream_users):
+        """Test that server errors are retried, until the upstream answers."""
+        app = StandInUpstream(upstream_users, statuses=(503, 500))
+
+        page = await source_for(app).fetch_page(offset=20, limit=10)
+
+        assert len(page.users) == 5
+        assert len(app.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_gives_up_after_retries(self, upstream_users):
+        """Test that a request failing `max_retries + 1` times raises an UpstreamError."""
+        app = StandInUpstream(upstream_users, statuses=(429,) * 4)
+        config = replace(CONFIG, failure_threshold=5)
+
+        with pytest.raises(UpstreamError, match="after 4 attempts: 429"):
+            await source_for(app, config).fetch_page(offset=0, limit=10)
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_waits_the_whole_retry_after(self, upstream_users, monkeypatch):
+        """Test that a Retry-After delay within `max_backoff` is waited for in full."""
+        app = StandInUpstream(upstream_users, statuses=(429,), retry_after="25")
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr("bridge.upstream.sources.user.asyncio.sleep", sleep)
+        await source_for(app, replace(CONFIG, backoff=1, max_backoff=25)).fetch_page(0, 10)
+
+        assert delays == [25]
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_retry_after_beyond_max_backoff(self, upstream_users):
+        """Test that a Retry-After delay longer than `max_backoff` fails without waiting."""
+        app = StandInUpstream(upstream_users, statuses=(429,), retry_after="120")
+
+        with pytest.raises(UpstreamError, match="retry after 120s exceeds 30s"):
+            await source_for(app).fetch_page(offset=0, limit=10)
+
+        assert len(app.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_rate_limits_open_circuit(self, upstream_users):
+        """Test that consecutive rate limited requests open the circuit."""
+        app = StandInUpstream(upstream_users, statuses=(429,) * 3)
+
+        with pytest.raises(CircuitOpenError):
+            await source_for(app).fetch_page(offset=0, limit=10)
+
+        assert len(app.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_opens_circuit(self, upstream_users):
+        """Test that consecutive server errors open the circuit, failing the next calls fast."""
+        app = StandInUpstream(upstream_users, statuses=(503,) * 3)
+        source = source_for(app)
+
+        with pytest.raises(CircuitOpenError):
+            await source.fetch_page(offset=0, limit=10)
+        with pytest.raises(CircuitOpenError):
+            await source.fetch_page(offset=0, limit=10)
+
+        assert len(app.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_client_errors_not_retried(self, upstream_users):
+        """Test that client errors raise an UpstreamError without retrying."""
+        app = StandInUpstream(upstream_users, statuses=(404,))
+
+        with pytest.raises(UpstreamError, match="404 Not Found"):
+            await source_for(app).fetch_page(offset=0, limit=10)
+
+        assert len(app.requests) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "body",
+        [b'{"users": [{"email": "ada@example.com"}], "total": 1}', b'{"users": null}', b"<html>"],
+    )
+    async def test_fetch_page_malformed_body(self, body):
+        """Test that a malformed response body raises an UpstreamError."""
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": body})
+
+        with pytest.raises(UpstreamError, match="Upstream response to /users is"):
+            await source_for(app).fetch_page(offset=0, limit=10)
@@ -0,0 +1,71 @@
+"""Throughput of invoice creation per numbering mode, through the group-commit writer.
+
+Usage: python benchmarks/numbering.py [--invoices 20000] [--concurrency 256]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+
+from invoices.core.config import DatabaseConfig
+from invoices.core.config import WriterConfig
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+from invoices.database.core import metadata
+from invoices.database.storages.invoices import WriterInvoiceStorage
+from invoices.database.writer import DatabaseWriter
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.services.numbering import InvoiceNumbering
+from invoices.domain.services.numbering import NumberingMode
+
+
+async def run(mode: NumberingMode | None, invoices: int, concurrency: int, block_size: int):
+    """Create invoices from concurrent tasks, returning the invoices created per second."""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = await get_async_engine(DatabaseConfig(path=str(Path(directory) / "bench.db")))
+        async with engine.begin() as connection:
+            await connection.run_sync(metadata.create_all)
+        writer = DatabaseWriter(partial(get_connection, engine), WriterConfig())
+        numbering = InvoiceNumbering("OT", mode or NumberingMode.BLOCK, block_size)
+
+        async with get_connection(engine) as connection:
+            storage = WriterInvoiceStorage(connection, writer)
+
+            async def create(count: int):
+                for _ in range(count):
+                    if mode is None:
+                        await storage.insert(Invoice())
+                    else:
+                        await numbering.insert(storage, Invoice())
+
+            start = time.perf_counter()
+            await asyncio.gather(*(create(invoices // concurrency) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+
+        await writer.stop()
+        await engine.dispose()
+    return invoices // concurrency * concurrency / elapsed
+
+
+async def main():
+    """Print the throughput of each numbering mode."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--invoices", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--block-size", type=int, default=100)
+    args = parser.parse_args()
+
+    for label, mode in [
+        ("unnumbered", None),
+        ("block", NumberingMode.BLOCK),
+        ("strict", NumberingMode.STRICT),
+    ]:
+        rate = await run(mode, args.invoices, args.concurrency, args.block_size)
+        print(f"{label:>10}: {rate:10,.0f} invoices/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
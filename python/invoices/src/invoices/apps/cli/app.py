@@ -1,6 +1,10 @@
 from click import Group
 
+from invoices.apps.cli.commands.archive import archive
+from invoices.apps.cli.commands.changes import changes
 from invoices.apps.cli.commands.database import database
+from invoices.apps.cli.commands.server import serve
+from invoices.apps.cli.commands.worker import worker
 
 
 def create_app() -> Group:
@@ -12,4 +16,8 @@ def create_app() -> Group:
 
 def configure_commands(app: Group):
     """Configure the application's commands."""
+    app.add_command(archive)
+    app.add_command(changes)
     app.add_command(database)
+    app.add_command(serve)
+    app.add_command(worker)
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+import click
+
+from invoices.core.config import archive as archive_config
+from invoices.core.config import database as database_config
+from invoices.core.uuid7 import uuid7_lower_bound
+from invoices.database.archives import archive_invoices
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+
+
+async def _archive(before: datetime, directory: Path, chunk_size: int) -> int:
+    """Archive the invoices of the configured database created before the given moment."""
+    engine = await get_async_engine(database_config)
+    try:
+        async with get_connection(engine) as connection:
+            connection = await connection.execution_options(sqlite_immediate=True)
+            return await archive_invoices(
+                connection,
+                before=uuid7_lower_bound(before),
+                directory=directory,
+                chunk_size=chunk_size,
+            )
+    finally:
+        await engine.dispose()
+
+
+@click.command()
+@click.option(
+    "--older-than-days",
+    type=click.IntRange(min=0),
+    default=archive_config.older_than_days,
+    show_default=True,
+    help="Archive the invoices created more than this many days ago.",
+)
+@click.option(
+    "--directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=archive_config.directory,
+    show_default=True,
+    help="Directory of the per-month archive databases.",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=archive_config.chunk_size,
+    show_default=True,
+    help="Number of invoices moved per transaction.",
+)
+def archive(older_than_days, directory, chunk_size):
+    """Move old invoices to per-month archive databases"""
+    if database_config.is_memory:
+        raise click.UsageError("An in-memory database cannot be archived.")
+    before = datetime.now(UTC) - timedelta(days=older_than_days)
+    moved = asyncio.run(_archive(before, directory, chunk_size))
+    click.echo(f"Archived {moved} invoices created before {before:%Y-%m-%d %H:%M:%S}.")
@@ -0,0 +1,45 @@
+import asyncio
+from datetime import timedelta
+
+import click
+
+from invoices.core.config import changes as changes_config
+from invoices.core.config import database as database_config
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.domain.services.compact_invoice_changes import CompactInvoiceChanges
+from invoices.domain.services.compact_invoice_changes import CompactInvoiceChangesHandler
+
+
+async def _compact(retention: timedelta) -> int:
+    """Compact the change feed of the configured database."""
+    engine = await get_async_engine(database_config)
+    try:
+        async with get_connection(engine) as connection:
+            connection = await connection.execution_options(sqlite_immediate=True)
+            handler = CompactInvoiceChangesHandler(DatabaseInvoiceStorage(connection))
+            removed = await handler.handle(CompactInvoiceChanges(retention=retention))
+            await connection.commit()
+            return removed
+    finally:
+        await engine.dispose()
+
+
+@click.group()
+def changes():
+    """Manage the invoice change feed"""
+
+
+@changes.command()
+@click.option(
+    "--retention-days",
+    type=click.IntRange(min=0),
+    default=changes_config.retention_days,
+    show_default=True,
+    help="Keep the entries recorded within this many days.",
+)
+def compact(retention_days):
+    """Delete the change feed entries older than the retention period"""
+    removed = asyncio.run(_compact(timedelta(days=retention_days)))
+    click.echo(f"Removed {removed} change feed entries.")
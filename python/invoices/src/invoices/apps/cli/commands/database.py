@@ -1,8 +1,20 @@
+import time
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
 import click
 from alembic import command
 from alembic.config import Config
 from alembic.util.exc import CommandError
 
+from invoices.core.config import archive as archive_config
+from invoices.core.config import database as database_config
+from invoices.core.config import numbering as numbering_config
+from invoices.database.core import get_sync_engine
+from invoices.database.seed import InvoiceSeeder
+
 config = Config()
 config.set_main_option("script_location", "invoices:database:migrations")
 config.set_main_option("file_template", "%%(year)d%%(month).2d%%(day).2d_%%(rev)s")
@@ -83,3 +95,50 @@ def history(rev_range, indicate_current):
         command.history(config, rev_range=rev_range, indicate_current=indicate_current)
     except CommandError as error:
         click.echo(str(error))
+
+
+@database.command()
+@click.option(
+    "--rows",
+    type=click.IntRange(min=1),
+    required=True,
+    help="Number of invoices to create.",
+)
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    default=365,
+    show_default=True,
+    help="Spread the invoices over this many days up to now.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=100_000,
+    show_default=True,
+    help="Number of invoices inserted per transaction.",
+)
+@click.option("--random-seed", type=int, help="Seed of the generator, for reproducible ids.")
+@click.option("--unnumbered", is_flag=True, help="Leave the invoices without a legal number.")
+def seed(rows, days, batch_size, random_seed, unnumbered):
+    """Bulk load synthetic invoices, for scale testing (stop the server first)"""
+    if database_config.is_memory:
+        raise click.UsageError("An in-memory database cannot be seeded.")
+    engine = get_sync_engine(database_config)
+    prefix = None if unnumbered else numbering_config.prefix
+    started = time.perf_counter()
+    try:
+        seeder = InvoiceSeeder(
+            engine,
+            prefix,
+            batch_size,
+            archive_directory=Path(archive_config.directory),
+            archive_before=datetime.now(UTC) - timedelta(days=archive_config.older_than_days),
+        )
+        inserted = seeder.seed(rows, days, seed=random_seed)
+    finally:
+        engine.dispose()
+    elapsed = time.perf_counter() - started
+    click.echo(
+        f"Seeded {inserted} invoices in {elapsed:.1f}s ({inserted / elapsed * 60:,.0f}/min)."
+    )
@@ -0,0 +1,100 @@
+import gc
+from typing import Any
+
+import click
+from gunicorn.app.base import BaseApplication
+
+from invoices.core.config import ServerConfig
+from invoices.core.config import server as server_config
+
+WORKER_CLASS = "uvicorn_worker.UvicornWorker"
+
+
+def pre_fork(_server, _worker):
+    """Move every object allocated by the master into the permanent generation.
+
+    Objects the preloaded application created are then never visited by the workers'
+    garbage collector, so their memory pages are not dirtied and stay shared
+    (copy-on-write) between the master and all of its workers.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def build_options(config: ServerConfig) -> dict[str, Any]:
+    """Translate the server configuration into gunicorn settings."""
+    return {
+        "bind": config.bind,
+        "workers": config.workers,
+        "worker_class": WORKER_CLASS,
+        "preload_app": True,
+        "max_requests": config.max_requests,
+        "max_requests_jitter": config.max_requests_jitter,
+        "graceful_timeout": config.graceful_timeout,
+        "timeout": config.timeout,
+        "keepalive": config.keepalive,
+        "pre_fork": pre_fork,
+    }
+
+
+class Server(BaseApplication):
+    """Gunicorn application running the invoices server with uvicorn workers."""
+
+    def __init__(self, options: dict[str, Any]):
+        self._options = options
+        super().__init__()
+
+    def load_config(self):
+        """Load the settings into gunicorn's configuration."""
+        for key, value in self._options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        """Import the ASGI application (once, in the master when preloading)."""
+        # pylint: disable=import-outside-toplevel
+        from invoices.apps.server.asgi import application
+
+        return application
+
+
+@click.command()
+@click.option("--host", default=server_config.host, show_default=True, help="Bind address.")
+@click.option("--port", default=server_config.port, show_default=True, help="Bind port.")
+@click.option(
+    "-w",
+    "--workers",
+    default=server_config.workers,
+    show_default=True,
+    help="Number of worker processes.",
+)
+@click.option(
+    "--max-requests",
+    default=server_config.max_requests,
+    show_default=True,
+    help="Recycle a worker after this many requests (0 to disable).",
+)
+@click.option(
+    "--max-requests-jitter",
+    default=server_config.max_requests_jitter,
+    show_default=True,
+    help="Random extra requests added per worker so they do not all recycle at once.",
+)
+@click.option(
+    "--graceful-timeout",
+    default=server_config.graceful_timeout,
+    show_default=True,
+    help="Seconds given to in-flight requests to drain on shutdown or recycle.",
+)
+def serve(host, port, workers, max_requests, max_requests_jitter, graceful_timeout):
+    """Run the server with multiple worker processes."""
+    config = ServerConfig(
+        host=host,
+        port=port,
+        workers=workers,
+        max_requests=max_requests,
+        max_requests_jitter=max_requests_jitter,
+        graceful_timeout=graceful_timeout,
+        timeout=server_config.timeout,
+        keepalive=server_config.keepalive,
+    )
+    Server(build_options(config)).run()
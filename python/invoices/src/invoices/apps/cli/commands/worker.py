@@ -0,0 +1,46 @@
+import asyncio
+import signal
+from dataclasses import replace
+from functools import partial
+
+import click
+
+from invoices.apps.worker.tasks import tasks
+from invoices.apps.worker.worker import JobWorker
+from invoices.core.config import JobsConfig
+from invoices.core.config import database as database_config
+from invoices.core.config import jobs as jobs_config
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+
+
+async def _work(config: JobsConfig):
+    """Run the jobs of the configured database until interrupted."""
+    engine = await get_async_engine(database_config)
+    try:
+        worker = JobWorker(partial(get_connection, engine), tasks, config)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, worker.stop)
+        await worker.run()
+    finally:
+        await engine.dispose()
+
+
+@click.command()
+@click.option(
+    "-c",
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=jobs_config.concurrency,
+    show_default=True,
+    help="Number of jobs run at once.",
+)
+def worker(concurrency):
+    """Run the queued background jobs, until interrupted"""
+    if database_config.is_memory:
+        raise click.UsageError("An in-memory database cannot be shared with a worker.")
+    config = replace(jobs_config, concurrency=concurrency)
+    click.echo(f"Running jobs, {concurrency} at a time. Press Ctrl+C to stop.")
+    asyncio.run(_work(config))
+    click.echo("Stopped.")
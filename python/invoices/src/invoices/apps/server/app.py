@@ -1,15 +1,45 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from starlette.applications import Starlette
 
+from invoices.apps.server.extensions import concurrency
+from invoices.apps.server.extensions import database as database_extension
+from invoices.apps.server.extensions import documents
+from invoices.apps.server.extensions import events
+from invoices.apps.server.extensions import idempotency
 from invoices.apps.server.extensions import injections
+from invoices.apps.server.extensions import rate_limit
+from invoices.apps.server.extensions import snapshot
 from invoices.apps.server.resources.errors.handlers import handlers
 from invoices.apps.server.resources.routes import routes
 from invoices.core.config import DatabaseConfig
+from invoices.core.config import concurrency as concurrency_config
 from invoices.core.config import database
+from invoices.core.config import documents as documents_config
+from invoices.core.config import events as events_config
+from invoices.core.config import idempotency as idempotency_config
+from invoices.core.config import rate_limit as rate_limit_config
+from invoices.core.config import snapshot as snapshot_config
+from invoices.core.config import writer as writer_config
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette) -> AsyncIterator[None]:
+    """Release the worker's resources when it shuts down."""
+    try:
+        yield
+    finally:
+        await events.shutdown(app)
+        await idempotency.shutdown(app)
+        await documents.shutdown(app)
+        await rate_limit.shutdown(app)
+        await database_extension.shutdown(app)
 
 
 def create_app(config: DatabaseConfig | None = None) -> Starlette:
     """Create and configure the Starlette application instance."""
-    app = Starlette(routes=routes)
+    app = Starlette(routes=routes, lifespan=lifespan)
 
     configure_extensions(app, config or database)
     configure_errors(app)
@@ -20,6 +50,13 @@ def create_app(config: DatabaseConfig | None = None) -> Starlette:
 def configure_extensions(app: Starlette, config: DatabaseConfig):
     """Configure the application's extensions."""
     injections.init_app(app, config)
+    database_extension.init_app(app, config, writer_config)
+    snapshot.init_app(app, snapshot_config)
+    events.init_app(app, events_config)
+    idempotency.init_app(app, idempotency_config)
+    documents.init_app(app, documents_config)
+    concurrency.init_app(app, concurrency_config, exempt_paths={"/invoices/events"})
+    rate_limit.init_app(app, rate_limit_config)
 
 
 def configure_errors(app: Starlette):
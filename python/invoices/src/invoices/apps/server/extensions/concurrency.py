@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from http import HTTPStatus
+from typing import Iterable
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.responses import Response
+from starlette.types import ASGIApp
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from invoices.apps.server.resources.errors.components import Error
+from invoices.apps.server.resources.errors.components import ErrorKind
+from invoices.core.config import ConcurrencyConfig
+
+LONG_RTT_WEIGHT = 0.05
+MIN_GRADIENT = 0.5
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted from observed latencies.
+
+    Implements a gradient scheme: the limit is multiplied by the ratio between the
+    long-term latency baseline and the latest latency (shrinking as soon as requests
+    start to queue behind the database), then grown by a `sqrt(limit)` headroom while
+    latencies stay flat. Requests above the limit wait in a bounded FIFO queue.
+    """
+
+    def __init__(self, config: ConcurrencyConfig):
+        self._config = config
+        self._limit = float(config.initial_limit)
+        self._in_flight = 0
+        self._long_rtt: float | None = None
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit."""
+        return max(self._config.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently holding a slot."""
+        return self._in_flight
+
+    async def acquire(self) -> bool:
+        """Acquire a slot, waiting at most `queue_timeout` seconds.
+
+        Returns `False` when the request should be shed.
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return True
+
+        if len(self._waiters) >= self._config.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self._config.queue_timeout)
+        except (TimeoutError, asyncio.CancelledError):
+            if waiter.done() and not waiter.cancelled():
+                # a slot was handed over just as we gave up: give it back
+                self._in_flight -= 1
+                self._wake()
+            self._discard(waiter)
+            if not asyncio.current_task().cancelling():  # type: ignore[union-attr]
+                return False
+            raise
+        return True
+
+    def release(self, rtt: float):
+        """Release a slot and feed the request latency (in seconds) to the limit."""
+        self._update(rtt)
+        self._in_flight -= 1
+        self._wake()
+
+    def _update(self, rtt: float):
+        """Recompute the limit from a new latency sample."""
+        if rtt <= 0:
+            return
+        if self._long_rtt is None:
+            self._long_rtt = rtt
+        else:
+            self._long_rtt += (rtt - self._long_rtt) * LONG_RTT_WEIGHT
+            # let the baseline recover quickly after a period of high latency
+            if self._long_rtt > 2 * rtt:
+                self._long_rtt *= 0.95
+
+        gradient = max(MIN_GRADIENT, min(1.0, self._long_rtt / rtt))
+        new_limit = self._limit * gradient + math.sqrt(self._limit)
+        # do not inflate the limit while the server is far from using it
+        if self._in_flight < self._limit / 2:
+            new_limit = min(new_limit, self._limit)
+
+        smoothing = self._config.smoothing
+        new_limit = self._limit * (1 - smoothing) + new_limit * smoothing
+        self._limit = max(self._config.min_limit, min(self._config.max_limit, new_limit))
+
+    def _wake(self):
+        """Hand free slots over to the oldest waiters."""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _discard(self, waiter: asyncio.Future[None]):
+        """Remove a waiter from the queue if still present."""
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+def overloaded_response(retry_after: int) -> Response:
+    """Render, once, the response returned to shed requests."""
+    error = Error(
+        code="EH-503",
+        message="service overloaded",
+        status=HTTPStatus.SERVICE_UNAVAILABLE,
+        exception=None,
+        details=None,
+        kind=ErrorKind.UNAVAILABLE,
+    )
+    return JSONResponse(
+        error.model_dump(by_alias=True, exclude_none=True),
+        status_code=error.status,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+class ConcurrencyLimitMiddleware:
+    """ASGI middleware limiting the number of requests processed concurrently.
+
+    Requests to the exempt paths (long-lived streams, whose duration says nothing
+    about the server's latency) are neither limited nor measured.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        config: ConcurrencyConfig,
+        exempt_paths: Iterable[str] = (),
+    ):
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+        self.limiter = AdaptiveLimiter(config)
+        self.rejection = overloaded_response(config.retry_after)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.acquire():
+            await self.rejection(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release(time.perf_counter() - start)
+
+
+def init_app(app: Starlette, config: ConcurrencyConfig, exempt_paths: Iterable[str] = ()):
+    """Protect the Starlette app with an adaptive concurrency limit."""
+    app.add_middleware(ConcurrencyLimitMiddleware, config=config, exempt_paths=exempt_paths)
@@ -0,0 +1,83 @@
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator
+
+from injector import singleton
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.applications import Starlette
+
+from invoices.core.config import DatabaseConfig
+from invoices.core.config import WriterConfig
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+from invoices.database.storages.invoices import WriterInvoiceStorage
+from invoices.database.writer import DatabaseWriter
+from invoices.domain.storages.interface import InvoiceStorage
+
+
+async def get_engine(app: Starlette) -> AsyncEngine:
+    """Return the process-local engine, creating it on first use.
+
+    The engine is never created at import time: when the application is preloaded in
+    a master process, each forked worker builds its own engine (and its own SQLite
+    connections) on its first request.
+    """
+    engine: AsyncEngine | None = getattr(app.state, "engine", None)
+    if engine is None:
+        config = app.state.injector.get(DatabaseConfig)
+        engine = app.state.engine = await get_async_engine(config)
+    return engine
+
+
+async def dispose_engine(app: Starlette):
+    """Dispose the process-local engine, if any."""
+    engine: AsyncEngine | None = getattr(app.state, "engine", None)
+    if engine is not None:
+        app.state.engine = None
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def _writer_connection(app: Starlette) -> AsyncIterator[AsyncConnection]:
+    """Yield a connection of the worker's engine, owned by the writer."""
+    engine = await get_engine(app)
+    async with get_connection(engine) as connection:
+        yield connection
+
+
+@asynccontextmanager
+async def connect(app: Starlette) -> AsyncIterator[AsyncConnection]:
+    """Yield a connection for work done outside of a request (the pinned one, in tests)."""
+    pinned_connection = getattr(app.state, "pinned_connection", None)
+    if pinned_connection:
+        yield pinned_connection
+        return
+
+    engine = await get_engine(app)
+    async with get_connection(engine) as connection:
+        yield connection
+
+
+async def shutdown(app: Starlette):
+    """Flush the pending writes, then release the worker's database resources."""
+    writer: DatabaseWriter | None = getattr(app.state, "writer", None)
+    if writer is not None:
+        await writer.stop()
+    await dispose_engine(app)
+
+
+def init_app(app: Starlette, config: DatabaseConfig, writer_config: WriterConfig):
+    """Initialize the group-commit writer of the Starlette app.
+
+    An in-memory database lives in a single shared connection, which the writer cannot
+    own apart from the requests: writes then go straight through the request's
+    connection. The writer task itself is started in the worker, on the first write.
+    """
+    if config.is_memory:
+        return
+
+    writer = DatabaseWriter(partial(_writer_connection, app), writer_config)
+    app.state.writer = writer
+    app.state.injector.binder.bind(DatabaseWriter, to=writer, scope=singleton)
+    app.state.injector.binder.bind(InvoiceStorage, to=WriterInvoiceStorage)
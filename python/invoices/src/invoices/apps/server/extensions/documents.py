@@ -0,0 +1,22 @@
+from injector import singleton
+from starlette.applications import Starlette
+
+from invoices.core.config import DocumentsConfig
+from invoices.core.content_cache import ContentCache
+from invoices.domain.services.render_invoice_document import DOCUMENT_SUFFIX
+from invoices.domain.services.render_invoice_document import DocumentRenderer
+
+
+async def shutdown(app: Starlette):
+    """Stop the rendering processes of the worker."""
+    app.state.documents.close()
+
+
+def init_app(app: Starlette, config: DocumentsConfig):
+    """Initialize the invoice document renderer of the Starlette app.
+
+    Its process pool is started in the worker, on the first document to render.
+    """
+    renderer = DocumentRenderer(ContentCache(config.directory, DOCUMENT_SUFFIX), config.processes)
+    app.state.documents = renderer
+    app.state.injector.binder.bind(DocumentRenderer, to=renderer, scope=singleton)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator
+from typing import Callable
+
+from injector import singleton
+from starlette.applications import Starlette
+
+from invoices.apps.server.extensions import database as database_extension
+from invoices.core.config import EventsConfig
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.domain.models.invoice_change import InvoiceChange
+from invoices.domain.storages.interface import InvoiceStorage
+
+logger = logging.getLogger(__name__)
+
+OpenStorage = Callable[[], AbstractAsyncContextManager[InvoiceStorage]]
+
+
+class Subscription:
+    """Bounded queue of the changes published to one subscriber."""
+
+    def __init__(self, after: int, size: int):
+        self.after = after
+        self._queue: asyncio.Queue[InvoiceChange | None] = asyncio.Queue(size)
+
+    def publish(self, change: InvoiceChange) -> bool:
+        """Queue a change, returning `False` if the subscriber is lagging too far behind."""
+        try:
+            self._queue.put_nowait(change)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def close(self):
+        """End the subscription, dropping the changes not delivered yet."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> InvoiceChange | None:
+        """Wait for the next change, or `None` once the subscription is closed."""
+        return await self._queue.get()
+
+
+class Broadcaster:
+    """Per-worker fan-out of the invoice change feed to the event stream subscribers.
+
+    A single task tails the change feed, so the database sees one query per poll
+    interval and per worker however many clients are listening. A subscriber whose
+    queue is full is disconnected: it resumes from its last event, read back from the
+    change feed, when it reconnects.
+    """
+
+    def __init__(self, open_storage: OpenStorage, config: EventsConfig):
+        self._open_storage = open_storage
+        self._config = config
+        self._subscribers: set[Subscription] = set()
+        self._last_seq = 0
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def subscribers(self) -> int:
+        """Number of subscribers currently listening."""
+        return len(self._subscribers)
+
+    async def listen(self, since: int | None = None) -> AsyncIterator[InvoiceChange | None]:
+        """Yield the changes following `since` (the new ones only, if `None`).
+
+        `None` is yielded whenever no change was published for a heartbeat interval,
+        so that the caller can keep the connection alive.
+        """
+        subscription = await self.subscribe()
+        try:
+            if since is not None:
+                async for change in self._replay(since, subscription.after):
+                    yield change
+
+            while True:
+                try:
+                    change = await asyncio.wait_for(subscription.get(), self._config.heartbeat)
+                except TimeoutError:
+                    yield None
+                    continue
+                if change is None:
+                    return
+                if since is None or change.seq > since:
+                    yield change
+        finally:
+            self.unsubscribe(subscription)
+
+    async def subscribe(self) -> Subscription:
+        """Register a subscriber to the changes following the last one published."""
+        await self._start()
+        subscription = Subscription(self._last_seq, self._config.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Unregister a subscriber."""
+        self._subscribers.discard(subscription)
+
+    async def stop(self):
+        """Stop tailing the change feed and end every subscription."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for subscription in self._subscribers:
+            subscription.close()
+        self._subscribers.clear()
+
+    async def _start(self):
+        """Start tailing the change feed from its current end, if not already started."""
+        if self._task is not None and not self._task.done():
+            return
+        async with self._open_storage() as storage:
+            last_seq = await storage.last_change_seq()
+        if self._task is None or self._task.done():
+            self._last_seq = last_seq
+            self._task = asyncio.create_task(self._run(), name="invoice-events")
+
+    async def _run(self):
+        """Poll the change feed and publish its new entries, while anyone listens."""
+        while True:
+            await asyncio.sleep(self._config.poll_interval)
+            if not self._subscribers:
+                continue
+            try:
+                await self._poll()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Failed to read the invoice change feed")
+
+    async def _poll(self):
+        """Publish the entries appended to the change feed since the last poll."""
+        while True:
+            async with self._open_storage() as storage:
+                changes = await storage.fetch_changes(self._last_seq, self._config.batch_size)
+            for change in changes:
+                self._publish(change)
+            if len(changes) < self._config.batch_size:
+                return
+
+    def _publish(self, change: InvoiceChange):
+        """Hand a change to every subscriber, disconnecting the lagging ones."""
+        self._last_seq = change.seq
+        for subscription in list(self._subscribers):
+            if not subscription.publish(change):
+                subscription.close()
+                self.unsubscribe(subscription)
+
+    async def _replay(self, since: int, until: int) -> AsyncIterator[InvoiceChange]:
+        """Read back the changes following `since` up to `until`, from the change feed."""
+        while since < until:
+            async with self._open_storage() as storage:
+                changes = await storage.fetch_changes(since, self._config.batch_size)
+            if not changes:
+                return
+            for change in changes:
+                if change.seq > until:
+                    return
+                yield change
+            since = changes[-1].seq
+
+
+@asynccontextmanager
+async def _open_storage(app: Starlette) -> AsyncIterator[InvoiceStorage]:
+    """Yield a storage reading the change feed outside of any request."""
+    async with database_extension.connect(app) as connection:
+        yield DatabaseInvoiceStorage(connection)
+
+
+async def shutdown(app: Starlette):
+    """End the event streams of the worker."""
+    await app.state.broadcaster.stop()
+
+
+def init_app(app: Starlette, config: EventsConfig):
+    """Initialize the invoice events broadcaster of the Starlette app.
+
+    The broadcaster task itself is started in the worker, on the first subscription.
+    """
+    broadcaster = Broadcaster(partial(_open_storage, app), config)
+    app.state.broadcaster = broadcaster
+    app.state.injector.binder.bind(Broadcaster, to=broadcaster, scope=singleton)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import UTC
+from functools import partial
+from functools import wraps
+from http import HTTPStatus
+from typing import Awaitable
+from typing import Callable
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+from invoices.apps.server.extensions import database as database_extension
+from invoices.core.cache import LRUCache
+from invoices.core.config import IdempotencyConfig
+from invoices.core.singleflight import SingleFlight
+from invoices.database.idempotency import claim_key
+from invoices.database.idempotency import complete_key
+from invoices.database.idempotency import delete_expired_keys
+from invoices.database.idempotency import fetch_key
+from invoices.database.idempotency import release_key
+
+logger = logging.getLogger(__name__)
+
+HEADER = "idempotency-key"
+MAX_KEY_LENGTH = 255
+
+Connect = Callable[[], AbstractAsyncContextManager[AsyncConnection]]
+Endpoint = Callable[[Request], Awaitable[Response]]
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """The response of the first request made with an idempotency key."""
+
+    fingerprint: str
+    status_code: int
+    media_type: str | None
+    body: bytes
+    expires_at: float
+
+    @staticmethod
+    def from_row(row: Row) -> StoredResponse:
+        """Create a `StoredResponse` from a completed record of the idempotency keys."""
+        return StoredResponse(
+            fingerprint=row.fingerprint,
+            status_code=row.status_code,
+            media_type=row.media_type,
+            body=row.body,
+            expires_at=row.expires_at.replace(tzinfo=UTC).timestamp(),
+        )
+
+    def response(self, replayed: bool) -> Response:
+        """A new response with the stored status and bytes."""
+        return Response(
+            self.body,
+            status_code=self.status_code,
+            media_type=self.media_type,
+            headers={"Idempotent-Replayed": "true"} if replayed else None,
+        )
+
+
+class IdempotencyStore:
+    """Per-worker store of the responses of the requests made with an `Idempotency-Key`.
+
+    Responses are kept in the `idempotency_keys` table, shared by the workers, behind an
+    LRU cache: a replay returns the stored bytes without running the endpoint again.
+    Keys are scoped to the client, told apart by its API key or its IP address without
+    one: a client can neither replay nor block the requests of another.
+    Concurrent requests with the same key join the first one in flight in this worker,
+    or poll the table while another worker handles it. Server errors are not stored, so
+    that the request can be retried.
+    """
+
+    def __init__(self, connect: Connect, config: IdempotencyConfig):
+        self._connect = connect
+        self._config = config
+        self._cache: LRUCache[tuple[str, str], StoredResponse] = LRUCache(config.cache_size)
+        self._flights: SingleFlight[tuple[StoredResponse, bool]] = SingleFlight()
+        self._task: asyncio.Task[None] | None = None
+
+    async def execute(self, request: Request, key: str, endpoint: Endpoint) -> Response:
+        """Respond to a request made with an idempotency key, running the endpoint once."""
+        self._start()
+        body = await request.body()
+        fingerprint = hashlib.sha256(
+            b"\0".join([request.method.encode(), request.url.path.encode(), body])
+        ).hexdigest()
+        scope = self._scope(request)
+
+        stored, replayed = self._cache.get((scope, key)), True
+        if stored is not None and stored.expires_at < time.time():
+            self._cache.pop((scope, key))
+            stored = None
+        if stored is None:
+            leader = (scope, key) not in self._flights
+            stored, ran = await self._flights.do(
+                (scope, key), partial(self._run, request, scope, key, fingerprint, endpoint)
+            )
+            replayed = not (leader and ran)
+        if stored.fingerprint != fingerprint:
+            raise HTTPException(
+                HTTPStatus.UNPROCESSABLE_ENTITY, "Idempotency-Key reused for another request"
+            )
+        return stored.response(replayed)
+
+    async def stop(self):
+        """Stop cleaning up the expired keys."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _scope(self, request: Request) -> str:
+        """The client an idempotency key belongs to: a hash of its API key, or its IP address."""
+        if api_key := request.headers.get(self._config.api_key_header):
+            return f"key:{hashlib.sha256(api_key.encode()).hexdigest()}"
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    async def _run(
+        self, request: Request, scope: str, key: str, fingerprint: str, endpoint: Endpoint
+    ) -> tuple[StoredResponse, bool]:
+        """Read the stored response of a key, or claim the key and run the endpoint.
+
+        Returns the response, and whether the endpoint ran.
+        """
+        deadline = time.monotonic() + self._config.wait_timeout
+        while True:
+            async with self._connect() as connection:
+                row = await fetch_key(connection, scope, key)
+                claimed = row is None and await claim_key(
+                    connection, scope, key, fingerprint, self._config.lock_timeout
+                )
+                await connection.commit()
+            if claimed:
+                return await self._respond(request, scope, key, fingerprint, endpoint), True
+            if row is None:  # claimed by another worker in the meantime
+                continue
+            if row.status_code is not None:
+                stored = StoredResponse.from_row(row)
+                self._cache.put((scope, key), stored)
+                return stored, False
+            if row.fingerprint != fingerprint:
+                raise HTTPException(
+                    HTTPStatus.UNPROCESSABLE_ENTITY, "Idempotency-Key reused for another request"
+                )
+            if time.monotonic() > deadline:
+                raise HTTPException(
+                    HTTPStatus.CONFLICT, "A request with this Idempotency-Key is in progress"
+                )
+            await asyncio.sleep(self._config.poll_interval)
+
+    async def _respond(
+        self, request: Request, scope: str, key: str, fingerprint: str, endpoint: Endpoint
+    ) -> StoredResponse:
+        """Run the endpoint for a claimed key and store its response."""
+        try:
+            response = await endpoint(request)
+        except Exception:
+            await self._release(scope, key)
+            raise
+
+        stored = StoredResponse(
+            fingerprint=fingerprint,
+            status_code=response.status_code,
+            media_type=response.media_type,
+            body=bytes(response.body),
+            expires_at=time.time() + self._config.ttl,
+        )
+        if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            await self._release(scope, key)
+            return stored
+        async with self._connect() as connection:
+            await complete_key(
+                connection,
+                scope,
+                key,
+                stored.status_code,
+                stored.media_type,
+                stored.body,
+                self._config.ttl,
+            )
+            await connection.commit()
+        self._cache.put((scope, key), stored)
+        return stored
+
+    async def _release(self, scope: str, key: str):
+        """Forget a key whose request failed."""
+        async with self._connect() as connection:
+            await release_key(connection, scope, key)
+            await connection.commit()
+
+    def _start(self):
+        """Start cleaning up the expired keys in the background, if not already started."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._cleanup(), name="idempotency-cleanup")
+
+    async def _cleanup(self):
+        """Delete the expired keys every cleanup interval."""
+        while True:
+            await asyncio.sleep(self._config.cleanup_interval)
+            try:
+                async with self._connect() as connection:
+                    deleted = await delete_expired_keys(connection)
+                    await connection.commit()
+                logger.debug("Deleted %d expired idempotency keys", deleted)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Failed to delete the expired idempotency keys")
+
+
+def idempotent(endpoint: Endpoint) -> Endpoint:
+    """Decorator running an endpoint once per `Idempotency-Key` header value."""
+
+    @wraps(endpoint)
+    async def wrapper(request: Request) -> Response:
+        key = request.headers.get(HEADER)
+        if key is None:
+            return await endpoint(request)
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            raise HTTPException(HTTPStatus.BAD_REQUEST, "Invalid Idempotency-Key")
+        store: IdempotencyStore = request.app.state.idempotency
+        return await store.execute(request, key, endpoint)
+
+    return wrapper
+
+
+async def shutdown(app: Starlette):
+    """Stop the background cleanup of the worker."""
+    await app.state.idempotency.stop()
+
+
+def init_app(app: Starlette, config: IdempotencyConfig):
+    """Initialize the idempotency key store of the Starlette app.
+
+    Its cleanup task is started in the worker, on the first request with a key.
+    """
+    app.state.idempotency = IdempotencyStore(partial(database_extension.connect, app), config)
@@ -1,4 +1,6 @@
+from contextlib import asynccontextmanager
 from functools import wraps
+from typing import AsyncIterator
 from typing import Awaitable
 from typing import Callable
 
@@ -11,10 +13,18 @@ from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import Response
 
+from invoices.apps.server.extensions.database import connect
+from invoices.apps.server.extensions.database import get_engine
 from invoices.core.config import DatabaseConfig
-from invoices.database.core import get_async_engine
+from invoices.core.config import lookup
+from invoices.core.config import numbering
+from invoices.core.singleflight import SingleFlight
 from invoices.database.core import get_connection
 from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.domain.services.fetch_invoice_stats import InvoiceStatsCache
+from invoices.domain.services.fetch_many_invoices import InvoiceCache
+from invoices.domain.services.numbering import InvoiceNumbering
+from invoices.domain.services.numbering import NumberingMode
 from invoices.domain.storages.interface import InvoiceStorage
 
 
@@ -29,6 +39,16 @@ class ApplicationModule(Module):
         """Bind the application's dependencies."""
         binder.bind(InvoiceStorage, to=DatabaseInvoiceStorage)
         binder.bind(DatabaseConfig, to=self._config, scope=singleton)
+        binder.bind(SingleFlight, to=SingleFlight(), scope=singleton)
+        binder.bind(InvoiceStatsCache, to=InvoiceStatsCache(), scope=singleton)
+        binder.bind(InvoiceCache, to=InvoiceCache(lookup.cache_size), scope=singleton)
+        binder.bind(
+            InvoiceNumbering,
+            to=InvoiceNumbering(
+                numbering.prefix, NumberingMode(numbering.mode), numbering.block_size
+            ),
+            scope=singleton,
+        )
 
 
 def injected(func: Callable[..., Awaitable[Response]]) -> Callable[[Request], Awaitable[Response]]:
@@ -45,9 +65,8 @@ def injected(func: Callable[..., Awaitable[Response]]) -> Callable[[Request], Aw
             injector.binder.bind(AsyncConnection, to=pinned_connection)
             return await injector.call_with_injection(inject(func))
 
-        # Otherwise create a new connection
-        config = injector.get(DatabaseConfig)
-        engine = await get_async_engine(config)
+        # Otherwise borrow a connection from the worker's engine
+        engine = await get_engine(request.app)
         async with get_connection(engine) as connection:
             injector.binder.bind(AsyncConnection, to=connection)
             response = await injector.call_with_injection(inject(func))
@@ -57,6 +76,19 @@ def injected(func: Callable[..., Awaitable[Response]]) -> Callable[[Request], Aw
     return wrapper
 
 
+@asynccontextmanager
+async def detached(app: Starlette) -> AsyncIterator[Injector]:
+    """Yield a child injector bound to a connection of its own.
+
+    For work that may outlive the request starting it, such as a computation shared by
+    concurrent requests: the request's connection is released as soon as it returns.
+    """
+    async with connect(app) as connection:
+        injector = app.state.injector.create_child_injector()
+        injector.binder.bind(AsyncConnection, to=connection)
+        yield injector
+
+
 def init_app(app: Starlette, config: DatabaseConfig):
     """Initialize the Starlette app with dependency injection modules."""
     injector = Injector(ApplicationModule(config))
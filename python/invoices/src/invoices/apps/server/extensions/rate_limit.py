@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.responses import Response
+from starlette.routing import compile_path
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from invoices.apps.server.resources.errors.components import Error
+from invoices.apps.server.resources.errors.components import ErrorKind
+from invoices.core.config import RateLimitConfig
+from invoices.core.token_bucket import Decision
+from invoices.core.token_bucket import MemoryTokenBuckets
+from invoices.core.token_bucket import SharedTokenBuckets
+from invoices.core.token_bucket import TokenBuckets
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Rate limit of the requests of each client to a route."""
+
+    method: str
+    path: str
+    rate: float
+    burst: int
+    pattern: re.Pattern
+
+    @staticmethod
+    def parse(rule: str) -> RateLimitRule:
+        """Parse a `METHOD /path=rate:burst` rule (`*` matching any method).
+
+        The rate must be positive, and the burst at least 1.
+
+        Examples:
+            >>> rule = RateLimitRule.parse("DELETE /invoices/{invoice_id}=0.5:5")
+            >>> rule.rate, rule.burst, rule.matches("DELETE", "/invoices/42")
+            (0.5, 5, True)
+            >>> RateLimitRule.parse("POST /invoices=0:5")
+            Traceback (most recent call last):
+            ...
+            ValueError: Invalid rate limit rule 'POST /invoices=0:5': rate must be positive
+        """
+        route, limit = rule.strip().rsplit("=", 1)
+        method, path = route.split()
+        rate, burst = limit.split(":")
+        pattern, _, _ = compile_path(path)
+        parsed = RateLimitRule(method.upper(), path, float(rate), int(burst), pattern)
+        if not parsed.rate > 0:
+            raise ValueError(f"Invalid rate limit rule {rule.strip()!r}: rate must be positive")
+        if parsed.burst < 1:
+            raise ValueError(f"Invalid rate limit rule {rule.strip()!r}: burst must be at least 1")
+        return parsed
+
+    def matches(self, method: str, path: str) -> bool:
+        """Whether the rule applies to a request."""
+        return self.method in ("*", method) and self.pattern.match(path) is not None
+
+
+def parse_rules(rules: str) -> list[RateLimitRule]:
+    """Parse `;`-separated rules, the first matching a request applying to it."""
+    return [RateLimitRule.parse(rule) for rule in rules.split(";") if rule.strip()]
+
+
+def _error_body() -> bytes:
+    """Render, once, the body of the responses to limited requests."""
+    error = Error(
+        code="EH-429",
+        message="too many requests",
+        status=HTTPStatus.TOO_MANY_REQUESTS,
+        exception=None,
+        details=None,
+        kind=ErrorKind.RATE_LIMITED,
+    )
+    return JSONResponse(error.model_dump(by_alias=True, exclude_none=True)).body
+
+
+def _headers(decision: Decision) -> dict[str, str]:
+    """The `RateLimit-*` headers of a decision."""
+    return {
+        "RateLimit-Limit": str(decision.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(decision.reset),
+    }
+
+
+class RateLimitMiddleware:
+    """ASGI middleware limiting the request rate of each client, per route.
+
+    Clients are told apart by their API key, or their IP address without one. Each
+    client gets a token bucket per rule: requests take a token, and are answered with a
+    429 when the bucket is empty, without reaching the application.
+    """
+
+    def __init__(
+        self, app: ASGIApp, rules: list[RateLimitRule], buckets: TokenBuckets, api_key_header: str
+    ):
+        self.app = app
+        self.rules = rules
+        self.buckets = buckets
+        self.api_key_header = api_key_header
+        self.error_body = _error_body()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rule = next((r for r in self.rules if r.matches(scope["method"], scope["path"])), None)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = self.buckets.take(
+            f"{rule.method} {rule.path}\0{self._client(scope)}", rule.rate, rule.burst
+        )
+        headers = _headers(decision)
+        if not decision.allowed:
+            headers["Retry-After"] = str(decision.retry_after)
+            response = Response(
+                self.error_body, HTTPStatus.TOO_MANY_REQUESTS, headers, "application/json"
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _client(self, scope: Scope) -> str:
+        """The API key of the client, or its IP address."""
+        if api_key := Headers(scope=scope).get(self.api_key_header):
+            return f"key:{api_key}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+
+async def shutdown(app: Starlette):
+    """Release the token buckets of the worker, if rate limiting."""
+    buckets: TokenBuckets | None = getattr(app.state, "rate_limit_buckets", None)
+    if buckets is not None:
+        app.state.rate_limit_buckets = None
+        buckets.close()
+
+
+def init_app(app: Starlette, config: RateLimitConfig):
+    """Rate limit the clients of the Starlette app, if any rule is configured.
+
+    With a shared path, the buckets live in a memory-mapped file shared by the workers
+    (best on a tmpfs such as `/dev/shm`); otherwise each worker limits on its own.
+    """
+    rules = parse_rules(config.rules)
+    if not rules:
+        return
+    buckets: TokenBuckets
+    if config.shared_path:
+        buckets = SharedTokenBuckets(config.shared_path, config.shared_slots)
+    else:
+        buckets = MemoryTokenBuckets(config.max_clients)
+    app.state.rate_limit_buckets = buckets
+    app.add_middleware(
+        RateLimitMiddleware, rules=rules, buckets=buckets, api_key_header=config.api_key_header
+    )
@@ -0,0 +1,29 @@
+from injector import CallableProvider
+from injector import singleton
+from starlette.applications import Starlette
+
+from invoices.core.config import SnapshotConfig
+from invoices.database.snapshot import InvoiceSnapshot
+from invoices.database.storages.snapshot import SnapshotInvoiceStorage
+from invoices.domain.storages.interface import InvoiceStorage
+
+
+def init_app(app: Starlette, config: SnapshotConfig):
+    """Serve the invoice listings of the Starlette app from the snapshot, if configured.
+
+    The storage bound so far keeps handling everything else: the snapshot storage wraps
+    it, so this extension is initialized after the database one.
+    """
+    if config.path is None:
+        return
+
+    injector = app.state.injector
+    snapshot = InvoiceSnapshot(config.path)
+    inner, _ = injector.binder.get_binding(InvoiceStorage)
+
+    def storage() -> InvoiceStorage:
+        return SnapshotInvoiceStorage(inner.provider.get(injector), snapshot, config.max_age)
+
+    app.state.snapshot = snapshot
+    injector.binder.bind(InvoiceSnapshot, to=snapshot, scope=singleton)
+    injector.binder.bind(InvoiceStorage, to=CallableProvider(storage))
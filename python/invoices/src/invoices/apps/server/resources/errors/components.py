@@ -21,6 +21,8 @@ class ErrorKind(StrEnum):
     FORBIDDEN = "forbidden"
     INTERNAL = "internal"
     NOT_FOUND = "not-found"
+    RATE_LIMITED = "rate-limited"
+    UNAVAILABLE = "unavailable"
     UNKNOWN = "unknown"
     VALIDATION = "validation"
 
@@ -38,8 +40,12 @@ class ErrorKind(StrEnum):
                 return ErrorKind.FORBIDDEN
             case 422:
                 return ErrorKind.VALIDATION
+            case 429:
+                return ErrorKind.RATE_LIMITED
             case 500:
                 return ErrorKind.INTERNAL
+            case 503:
+                return ErrorKind.UNAVAILABLE
             case _:
                 return ErrorKind.UNKNOWN
 
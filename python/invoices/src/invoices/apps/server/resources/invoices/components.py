@@ -1,27 +1,140 @@
+from datetime import datetime
+from typing import Annotated
+from typing import Any
+from uuid import UUID
+
+from pydantic import BeforeValidator
+from pydantic import Field
+
 from invoices.apps.server.resources.shared.components import Component
 from invoices.apps.server.resources.shared.components import QueryParams
 from invoices.apps.server.resources.shared.fields import UUID7
 from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_change import InvoiceChange
+from invoices.domain.models.invoice_change import InvoiceOperation
+from invoices.domain.models.invoice_stats import BucketCount
+from invoices.domain.models.invoice_stats import StatsBucket
 
 DEFAULT_OFFSET = 0
 DEFAULT_LIMIT = 100
+MAX_CHANGES_LIMIT = 1000
+MAX_LOOKUP_IDS = 1000
 
 
 class InvoiceComponent(Component):
     """Component for invoice-related data."""
 
     id: UUID7
+    number: str | None = None
 
     @staticmethod
     def from_invoice(invoice: Invoice):
-        """Create an `InvoiceComponent` from an `Invoice`."""
+        """Create an `InvoiceComponent` from an `Invoice` (its number only once known)."""
+        if invoice.number is None:
+            return InvoiceComponent(id=invoice.id)
         return InvoiceComponent(
             id=invoice.id,
+            number=invoice.number,
         )
 
 
+def _split_ids(value: Any) -> Any:
+    """Split a comma-separated list of ids."""
+    return value.split(",") if isinstance(value, str) else value
+
+
+LookupIds = Annotated[
+    list[UUID7], BeforeValidator(_split_ids), Field(min_length=1, max_length=MAX_LOOKUP_IDS)
+]
+
+
 class GetInvoicesQueryParams(QueryParams):
-    """Query parameters for fetching invoices."""
+    """Query parameters for fetching invoices, or some of them by id (comma-separated)."""
 
     offset: int = DEFAULT_OFFSET
     limit: int = DEFAULT_LIMIT
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    ids: LookupIds | None = None
+
+
+class LookupInvoicesBody(Component):
+    """Body of a lookup of invoices by id, for lists too long for a query string."""
+
+    ids: LookupIds
+
+
+class InvoiceLookupComponent(Component):
+    """Component for the invoices found by a lookup, and the requested ids not found."""
+
+    invoices: list[InvoiceComponent]
+    missing: list[UUID7]
+
+    @staticmethod
+    def from_lookup(invoice_ids: list[UUID], invoices: list[Invoice | None]):
+        """Create an `InvoiceLookupComponent` from the invoices looked up for some ids."""
+        return InvoiceLookupComponent(
+            invoices=[InvoiceComponent.from_invoice(invoice) for invoice in invoices if invoice],
+            missing=[
+                invoice_id for invoice_id, invoice in zip(invoice_ids, invoices) if invoice is None
+            ],
+        )
+
+
+class InvoicePathParams(QueryParams):
+    """Path parameters identifying one invoice."""
+
+    invoice_id: UUID7
+
+
+class InvoiceChangeComponent(Component):
+    """Component for an entry of the invoice change feed."""
+
+    seq: int
+    invoice_id: UUID7
+    operation: InvoiceOperation
+    recorded_at: datetime
+
+    @staticmethod
+    def from_invoice_change(change: InvoiceChange):
+        """Create an `InvoiceChangeComponent` from an `InvoiceChange`."""
+        return InvoiceChangeComponent(
+            seq=change.seq,
+            invoice_id=change.invoice_id,
+            operation=change.operation,
+            recorded_at=change.recorded_at,
+        )
+
+
+class GetInvoiceChangesQueryParams(QueryParams):
+    """Query parameters for reading the invoice change feed."""
+
+    since: int = Field(default=0, ge=0)
+    limit: int = Field(default=DEFAULT_LIMIT, ge=1, le=MAX_CHANGES_LIMIT)
+
+
+class GetInvoiceEventsParams(QueryParams):
+    """Parameters for streaming the invoice events, `since` coming from `Last-Event-ID`."""
+
+    since: int | None = Field(default=None, ge=0)
+
+
+class BucketCountComponent(Component):
+    """Component for the number of invoices created within a time bucket."""
+
+    start: datetime
+    count: int
+
+    @staticmethod
+    def from_bucket_count(bucket_count: BucketCount):
+        """Create a `BucketCountComponent` from a `BucketCount`."""
+        return BucketCountComponent(
+            start=bucket_count.start,
+            count=bucket_count.count,
+        )
+
+
+class GetInvoiceStatsQueryParams(QueryParams):
+    """Query parameters for counting invoices per time bucket."""
+
+    bucket: StatsBucket = StatsBucket.DAY
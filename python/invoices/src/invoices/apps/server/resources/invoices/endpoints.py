@@ -1,33 +1,225 @@
 from __future__ import annotations
 
 from http import HTTPStatus
+from typing import AsyncIterator
+from uuid import UUID
 
+from starlette.exceptions import HTTPException
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.responses import Response
+from starlette.responses import StreamingResponse
 
+from invoices.apps.server.extensions.events import Broadcaster
+from invoices.apps.server.extensions.idempotency import idempotent
+from invoices.apps.server.extensions.injections import detached
 from invoices.apps.server.extensions.injections import injected
+from invoices.apps.server.resources.invoices.components import BucketCountComponent
+from invoices.apps.server.resources.invoices.components import GetInvoiceChangesQueryParams
+from invoices.apps.server.resources.invoices.components import GetInvoiceEventsParams
 from invoices.apps.server.resources.invoices.components import GetInvoicesQueryParams
+from invoices.apps.server.resources.invoices.components import GetInvoiceStatsQueryParams
+from invoices.apps.server.resources.invoices.components import InvoiceChangeComponent
 from invoices.apps.server.resources.invoices.components import InvoiceComponent
+from invoices.apps.server.resources.invoices.components import InvoiceLookupComponent
+from invoices.apps.server.resources.invoices.components import InvoicePathParams
+from invoices.apps.server.resources.invoices.components import LookupInvoicesBody
 from invoices.apps.server.resources.shared.components import ListComponent
+from invoices.core.singleflight import SingleFlight
+from invoices.domain.services.create_invoice import CreateInvoice
+from invoices.domain.services.create_invoice import CreateInvoiceHandler
+from invoices.domain.services.delete_invoice import DeleteInvoice
+from invoices.domain.services.delete_invoice import DeleteInvoiceHandler
 from invoices.domain.services.fetch_all_invoices import FetchAllInvoices
 from invoices.domain.services.fetch_all_invoices import FetchAllInvoicesHandler
+from invoices.domain.services.fetch_invoice_changes import FetchInvoiceChanges
+from invoices.domain.services.fetch_invoice_changes import FetchInvoiceChangesHandler
+from invoices.domain.services.fetch_invoice_stats import FetchInvoiceStats
+from invoices.domain.services.fetch_invoice_stats import FetchInvoiceStatsHandler
+from invoices.domain.services.fetch_many_invoices import FetchManyInvoices
+from invoices.domain.services.fetch_many_invoices import FetchManyInvoicesHandler
+from invoices.domain.services.render_invoice_document import RenderInvoiceDocument
+from invoices.domain.services.render_invoice_document import RenderInvoiceDocumentHandler
+
+
+async def _lookup_invoices(
+    invoice_ids: list[UUID], fetch_many_invoices_handler: FetchManyInvoicesHandler
+) -> Response:
+    """Respond with the invoices of the given ids, in the requested order, and the missing ids."""
+    invoices = await fetch_many_invoices_handler.handle(FetchManyInvoices(tuple(invoice_ids)))
+    response = InvoiceLookupComponent.from_lookup(invoice_ids, invoices)
+    return JSONResponse(
+        response.model_dump(),
+        status_code=HTTPStatus.OK,
+    )
 
 
 @injected
 async def get_invoices(
     request: Request,
-    fetch_all_invoices_handler: FetchAllInvoicesHandler,
+    fetch_many_invoices_handler: FetchManyInvoicesHandler,
+    flights: SingleFlight,
 ) -> Response:
-    """Handles `GET /invoices` requests."""
+    """Handles `GET /invoices` requests.
+
+    Identical concurrent requests share a single query and serialization. A request
+    joining a query already in flight may not see writes committed after that query
+    started, including the caller's own. With `?ids=`, looks the given invoices up instead.
+    """
     query_params = GetInvoicesQueryParams.model_validate(request.query_params)
+    if query_params.ids is not None:
+        return await _lookup_invoices(query_params.ids, fetch_many_invoices_handler)
+
     fetch_all_invoices = FetchAllInvoices(
         limit=query_params.limit,
         offset=query_params.offset,
+        created_after=query_params.created_after,
+        created_before=query_params.created_before,
+    )
+
+    async def render() -> bytes:
+        # the flight may outlive this request, and its connection: it reads on its own
+        async with detached(request.app) as injector:
+            handler = injector.get(FetchAllInvoicesHandler)
+            invoices = await handler.handle(fetch_all_invoices)
+        response = ListComponent.mapped(InvoiceComponent.from_invoice, invoices)
+        return response.model_dump_json().encode()
+
+    content = await flights.do(("get_invoices", fetch_all_invoices), render)
+    return Response(
+        content,
+        status_code=HTTPStatus.OK,
+        media_type="application/json",
+    )
+
+
+@injected
+async def lookup_invoices(
+    request: Request,
+    fetch_many_invoices_handler: FetchManyInvoicesHandler,
+) -> Response:
+    """Handles `POST /invoices/lookup` requests, for id lists too long for a query string."""
+    body = LookupInvoicesBody.model_validate(await request.json())
+    return await _lookup_invoices(body.ids, fetch_many_invoices_handler)
+
+
+@idempotent
+@injected
+async def create_invoice(create_invoice_handler: CreateInvoiceHandler) -> Response:
+    """Handles `POST /invoices` requests, once per `Idempotency-Key`."""
+    invoice = await create_invoice_handler.handle(CreateInvoice())
+    response = InvoiceComponent.from_invoice(invoice)
+    return JSONResponse(
+        response.model_dump(),
+        status_code=HTTPStatus.CREATED,
+    )
+
+
+@idempotent
+@injected
+async def delete_invoice(
+    request: Request,
+    delete_invoice_handler: DeleteInvoiceHandler,
+) -> Response:
+    """Handles `DELETE /invoices/{invoice_id}` requests, once per `Idempotency-Key`."""
+    path_params = InvoicePathParams.model_validate(request.path_params)
+    invoice = await delete_invoice_handler.handle(DeleteInvoice(invoice_id=path_params.invoice_id))
+    if invoice is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND, "Invoice not found")
+    return Response(status_code=HTTPStatus.NO_CONTENT)
+
+
+@injected
+async def get_invoice_document(
+    request: Request,
+    render_invoice_document_handler: RenderInvoiceDocumentHandler,
+) -> Response:
+    """Handles `GET /invoices/{invoice_id}/document` requests.
+
+    Documents are cached by the hash of their content, which is also their `ETag`: a
+    client revalidating with `If-None-Match` gets a `304` while the document is the same.
+    """
+    path_params = InvoicePathParams.model_validate(request.path_params)
+    document = await render_invoice_document_handler.handle(
+        RenderInvoiceDocument(invoice_id=path_params.invoice_id)
+    )
+    if document is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND, "Invoice not found")
+    headers = {"ETag": f'"{document.key}"', "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(
+        document.content,
+        status_code=HTTPStatus.OK,
+        media_type="text/html",
+        headers=headers,
+    )
+
+
+@injected
+async def get_invoice_changes(
+    request: Request,
+    fetch_invoice_changes_handler: FetchInvoiceChangesHandler,
+) -> Response:
+    """Handles `GET /invoices/changes` requests.
+
+    Consumers pass the `seq` of the last entry they have seen as `since`. Entries older
+    than the retention period are compacted: a consumer lagging further behind must
+    re-read `/invoices` before following the feed again.
+    """
+    query_params = GetInvoiceChangesQueryParams.model_validate(request.query_params)
+    changes = await fetch_invoice_changes_handler.handle(
+        FetchInvoiceChanges(since=query_params.since, limit=query_params.limit)
     )
-    invoices = await fetch_all_invoices_handler.handle(fetch_all_invoices)
-    response = ListComponent.mapped(InvoiceComponent.from_invoice, invoices)
+    response = ListComponent.mapped(InvoiceChangeComponent.from_invoice_change, changes)
     return JSONResponse(
         response.model_dump(),
         status_code=HTTPStatus.OK,
     )
+
+
+@injected
+async def get_invoice_events(request: Request, broadcaster: Broadcaster) -> Response:
+    """Handles `GET /invoices/events` requests.
+
+    Streams the invoice changes as server-sent events whose ID is their `seq`: a client
+    reconnecting with `Last-Event-ID` (or `?since=`) first receives what it missed.
+    """
+    params = GetInvoiceEventsParams.model_validate(
+        {"since": request.headers.get("last-event-id", request.query_params.get("since"))}
+    )
+
+    async def stream() -> AsyncIterator[bytes]:
+        async for change in broadcaster.listen(params.since):
+            if change is None:
+                yield b": keep-alive\n\n"
+                continue
+            data = InvoiceChangeComponent.from_invoice_change(change).model_dump_json()
+            yield f"id: {change.seq}\nevent: {change.operation.value}\ndata: {data}\n\n".encode()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@injected
+async def get_invoice_stats(request: Request, flights: SingleFlight) -> Response:
+    """Handles `GET /invoices/stats` requests."""
+    query_params = GetInvoiceStatsQueryParams.model_validate(request.query_params)
+    fetch_invoice_stats = FetchInvoiceStats(bucket=query_params.bucket)
+
+    async def render() -> bytes:
+        async with detached(request.app) as injector:
+            handler = injector.get(FetchInvoiceStatsHandler)
+            bucket_counts = await handler.handle(fetch_invoice_stats)
+        response = ListComponent.mapped(BucketCountComponent.from_bucket_count, bucket_counts)
+        return response.model_dump_json().encode()
+
+    content = await flights.do(("get_invoice_stats", fetch_invoice_stats), render)
+    return Response(
+        content,
+        status_code=HTTPStatus.OK,
+        media_type="application/json",
+    )
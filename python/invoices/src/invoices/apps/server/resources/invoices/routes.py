@@ -1,7 +1,21 @@
 from starlette.routing import Route
 
+from .endpoints import create_invoice
+from .endpoints import delete_invoice
+from .endpoints import get_invoice_changes
+from .endpoints import get_invoice_document
+from .endpoints import get_invoice_events
+from .endpoints import get_invoice_stats
 from .endpoints import get_invoices
+from .endpoints import lookup_invoices
 
 routes = [
     Route("/invoices", get_invoices, methods=["GET"]),
+    Route("/invoices", create_invoice, methods=["POST"]),
+    Route("/invoices/changes", get_invoice_changes, methods=["GET"]),
+    Route("/invoices/events", get_invoice_events, methods=["GET"]),
+    Route("/invoices/lookup", lookup_invoices, methods=["POST"]),
+    Route("/invoices/stats", get_invoice_stats, methods=["GET"]),
+    Route("/invoices/{invoice_id}", delete_invoice, methods=["DELETE"]),
+    Route("/invoices/{invoice_id}/document", get_invoice_document, methods=["GET"]),
 ]
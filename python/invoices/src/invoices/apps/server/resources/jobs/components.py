@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import Field
+
+from invoices.apps.server.resources.shared.components import Component
+from invoices.apps.server.resources.shared.components import QueryParams
+from invoices.core.config import jobs as jobs_config
+from invoices.domain.models.job import Job
+from invoices.domain.models.job import JobStatus
+
+MAX_ATTEMPTS = 100
+
+
+class EnqueueJobBody(Component):
+    """Body of a request queueing a background job; higher priorities run first."""
+
+    kind: str
+    payload: dict[str, Any] = Field(default_factory=dict)
+    priority: int = 0
+    max_attempts: int = Field(default=jobs_config.max_attempts, ge=1, le=MAX_ATTEMPTS)
+
+
+class JobComponent(Component):
+    """Component for a background job and its outcome."""
+
+    id: int
+    kind: str
+    status: JobStatus
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    result: Any = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    @staticmethod
+    def from_job(job: Job):
+        """Create a `JobComponent` from a `Job`."""
+        return JobComponent(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            priority=job.priority,
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+            run_at=job.run_at,
+            result=job.result,
+            error=job.error,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
+
+
+class JobPathParams(QueryParams):
+    """Path parameters identifying one job."""
+
+    job_id: int
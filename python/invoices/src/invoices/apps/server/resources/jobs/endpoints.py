@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.responses import Response
+
+from invoices.apps.server.extensions.idempotency import idempotent
+from invoices.apps.server.extensions.injections import injected
+from invoices.apps.server.resources.jobs.components import EnqueueJobBody
+from invoices.apps.server.resources.jobs.components import JobComponent
+from invoices.apps.server.resources.jobs.components import JobPathParams
+from invoices.apps.worker.tasks import tasks
+from invoices.database.jobs import enqueue_job
+from invoices.database.jobs import fetch_job
+
+
+@idempotent
+@injected
+async def create_job(request: Request, connection: AsyncConnection) -> Response:
+    """Handles `POST /jobs` requests, queueing a job for the workers (`invoices worker`)."""
+    body = EnqueueJobBody.model_validate(await request.json())
+    if body.kind not in tasks:
+        raise HTTPException(HTTPStatus.UNPROCESSABLE_ENTITY, f"Unknown job kind: {body.kind}")
+    job = await enqueue_job(connection, body.kind, body.payload, body.priority, body.max_attempts)
+    return JSONResponse(
+        JobComponent.from_job(job).model_dump(),
+        status_code=HTTPStatus.ACCEPTED,
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
+@injected
+async def get_job(request: Request, connection: AsyncConnection) -> Response:
+    """Handles `GET /jobs/{job_id}` requests, reporting the status of a job."""
+    path_params = JobPathParams.model_validate(request.path_params)
+    job = await fetch_job(connection, path_params.job_id)
+    if job is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND, "Job not found")
+    return JSONResponse(
+        JobComponent.from_job(job).model_dump(),
+        status_code=HTTPStatus.OK,
+    )
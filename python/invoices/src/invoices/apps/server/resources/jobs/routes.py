@@ -0,0 +1,9 @@
+from starlette.routing import Route
+
+from .endpoints import create_job
+from .endpoints import get_job
+
+routes = [
+    Route("/jobs", create_job, methods=["POST"]),
+    Route("/jobs/{job_id:int}", get_job, methods=["GET"]),
+]
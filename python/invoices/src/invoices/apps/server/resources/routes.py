@@ -1,5 +1,7 @@
 from invoices.apps.server.resources.invoices import routes as invoices
+from invoices.apps.server.resources.jobs import routes as jobs
 
 routes = [
     *invoices.routes,
+    *jobs.routes,
 ]
@@ -23,7 +23,6 @@ def _shared_defaults(**kwargs):
     """Set default kwargs for `model_dump` and `model_dump_json`."""
     kwargs.setdefault("exclude_unset", True)
     kwargs.setdefault("by_alias", True)
-    kwargs.setdefault("mode", "json")
     return kwargs
 
 
@@ -42,6 +41,7 @@ class Component(BaseModel):
     def model_dump(self, *args, **kwargs):
         """Override to always set exclude_unset=True by default."""
         kwargs = _shared_defaults(**kwargs)
+        kwargs.setdefault("mode", "json")
         return super().model_dump(*args, **kwargs)
 
     def model_dump_json(self, *args, **kwargs):
@@ -66,6 +66,7 @@ class ListComponent(RootModel[list[C]]):
     def model_dump(self, *args, **kwargs):
         """Override to always set exclude_unset=True by default."""
         kwargs = _shared_defaults(**kwargs)
+        kwargs.setdefault("mode", "json")
         return super().model_dump(*args, **kwargs)
 
     def model_dump_json(self, *args, **kwargs):
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from invoices.core.config import archive as archive_config
+from invoices.core.config import changes as changes_config
+from invoices.core.config import documents as documents_config
+from invoices.core.content_cache import ContentCache
+from invoices.core.uuid7 import uuid7_lower_bound
+from invoices.database.archives import archive_invoices
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.domain.services.compact_invoice_changes import CompactInvoiceChanges
+from invoices.domain.services.compact_invoice_changes import CompactInvoiceChangesHandler
+from invoices.domain.services.render_invoice_document import DOCUMENT_SUFFIX
+from invoices.domain.services.render_invoice_document import DocumentRenderer
+from invoices.domain.services.render_invoice_document import RenderInvoiceDocuments
+from invoices.domain.services.render_invoice_document import RenderInvoiceDocumentsHandler
+
+
+@dataclass(frozen=True)
+class Task:
+    """The coroutine function running the jobs of a kind.
+
+    It runs on the worker's event loop, called with a database connection (committed
+    once it returns) and the job payload. Tasks writing from their first statement may
+    be `immediate`, their transaction then taking the write lock upfront; the others
+    commit each unit of their work, so that other writers are not blocked meanwhile.
+    """
+
+    kind: str
+    function: Callable[..., Any]
+    immediate: bool = False
+
+
+class TaskRegistry:
+    """The tasks the job workers know how to run, by job kind."""
+
+    def __init__(self):
+        self._tasks: dict[str, Task] = {}
+
+    def register(
+        self, kind: str, immediate: bool = False
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator registering the function running the jobs of a kind."""
+
+        def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+            self._tasks[kind] = Task(kind, function, immediate)
+            return function
+
+        return decorator
+
+    def get(self, kind: str) -> Task | None:
+        """The task running the jobs of a kind, if any."""
+        return self._tasks.get(kind)
+
+    def __contains__(self, kind: str) -> bool:
+        return kind in self._tasks
+
+
+tasks = TaskRegistry()
+
+
+@tasks.register("compact-changes", immediate=True)
+async def compact_changes(connection: AsyncConnection, payload: dict[str, Any]) -> dict[str, int]:
+    """Compact the change feed, keeping `retention_days` days of entries."""
+    retention_days = payload.get("retention_days", changes_config.retention_days)
+    handler = CompactInvoiceChangesHandler(DatabaseInvoiceStorage(connection))
+    removed = await handler.handle(CompactInvoiceChanges(retention=timedelta(days=retention_days)))
+    return {"removed": removed}
+
+
+@tasks.register("archive-invoices")
+async def archive(connection: AsyncConnection, payload: dict[str, Any]) -> dict[str, int]:
+    """Archive the invoices created more than `older_than_days` days ago."""
+    older_than_days = payload.get("older_than_days", archive_config.older_than_days)
+    archived = await archive_invoices(
+        connection,
+        before=uuid7_lower_bound(datetime.now(UTC) - timedelta(days=older_than_days)),
+        directory=Path(archive_config.directory),
+        chunk_size=archive_config.chunk_size,
+    )
+    return {"archived": archived}
+
+
+@tasks.register("render-month")
+async def render_month(connection: AsyncConnection, payload: dict[str, Any]) -> dict[str, int]:
+    """Render the missing documents of the invoices created in a `month` (`YYYY-MM`).
+
+    The documents are rendered by as many processes as there are cores. The task only
+    reads the database: it is not immediate, other writers going on meanwhile.
+    """
+    start = datetime.strptime(payload["month"], "%Y-%m").replace(tzinfo=UTC)
+    end = (start + timedelta(days=31)).replace(day=1)
+    cache = ContentCache(documents_config.directory, DOCUMENT_SUFFIX)
+    renderer = DocumentRenderer(cache, os.cpu_count() or 1)
+    try:
+        handler = RenderInvoiceDocumentsHandler(DatabaseInvoiceStorage(connection), renderer)
+        invoices, rendered = await handler.handle(
+            RenderInvoiceDocuments(
+                lower_id=uuid7_lower_bound(start), upper_id=uuid7_lower_bound(end)
+            )
+        )
+    finally:
+        await asyncio.to_thread(renderer.close)
+    return {"invoices": invoices, "rendered": rendered}
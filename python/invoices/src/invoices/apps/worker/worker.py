@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from invoices.apps.worker.tasks import Task
+from invoices.apps.worker.tasks import TaskRegistry
+from invoices.core.config import JobsConfig
+from invoices.database.jobs import claim_jobs
+from invoices.database.jobs import complete_job
+from invoices.database.jobs import extend_leases
+from invoices.database.jobs import fail_job
+from invoices.database.jobs import retry_job
+from invoices.domain.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+Connect = Callable[[], AbstractAsyncContextManager[AsyncConnection]]
+
+
+def retry_delay(attempts: int, base: float, maximum: float) -> float:
+    """Seconds to wait before running a job again after its `attempts`-th failed run.
+
+    Examples:
+        >>> [retry_delay(attempts, base=2, maximum=10) for attempts in range(1, 6)]
+        [2, 4, 8, 10, 10]
+    """
+    return min(maximum, base * 2 ** (attempts - 1))
+
+
+class JobWorker:
+    """Claims the queued jobs and runs them on the event loop, up to `concurrency` at a time.
+
+    Claimed jobs are leased, the leases of the running jobs being renewed until they
+    finish: a job whose worker died is claimed again by another one once its lease
+    expires. Failed runs are retried with an exponential backoff, until the job runs out
+    of attempts. The write lock is taken upfront only to claim jobs, to record their
+    outcome, and for the tasks registered as `immediate`.
+    """
+
+    def __init__(self, connect: Connect, registry: TaskRegistry, config: JobsConfig):
+        self._connect = connect
+        self._registry = registry
+        self._config = config
+        self._running: dict[int, asyncio.Task[None]] = {}
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    async def run(self):
+        """Run the jobs until stopped, then wait for the running ones to finish."""
+        heartbeat = asyncio.create_task(self._heartbeat(), name="jobs-heartbeat")
+        try:
+            while not self._stopping.is_set():
+                free = self._config.concurrency - len(self._running)
+                claimed = await self._claim(free) if free else []
+                for job in claimed:
+                    self._running[job.id] = asyncio.create_task(
+                        self._execute(job), name=f"job-{job.id}"
+                    )
+                if len(claimed) < free or not free:  # queue drained, or no free slot
+                    await self._idle()
+        finally:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+            heartbeat.cancel()
+
+    def stop(self):
+        """Stop claiming jobs."""
+        self._stopping.set()
+        self._wakeup.set()
+
+    async def _idle(self):
+        """Wait for the poll interval, a free slot or the stop, whichever comes first."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self._config.poll_interval)
+        except TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _claim(self, limit: int) -> list[Job]:
+        """Claim up to `limit` jobs, taking the write lock upfront."""
+        try:
+            async with self._connect() as connection:
+                connection = await connection.execution_options(sqlite_immediate=True)
+                claimed = await claim_jobs(connection, limit, self._config.lease)
+                await connection.commit()
+                return claimed
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to claim jobs")
+            return []
+
+    async def _execute(self, job: Job):
+        """Run a claimed job and record its outcome."""
+        try:
+            task = self._registry.get(job.kind)
+            if task is None:
+                await self._finish(fail_job, job, f"unknown job kind: {job.kind}")
+            elif job.attempts > job.max_attempts:
+                await self._finish(fail_job, job, job.error or "abandoned by its workers")
+            else:
+                await self._attempt(task, job)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to record the outcome of job %d", job.id)
+        finally:
+            del self._running[job.id]
+            self._wakeup.set()
+
+    async def _attempt(self, task: Task, job: Job):
+        """Run a job once, retrying it later if it fails with attempts left."""
+        try:
+            result = await self._call(task, job)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.exception("Job %d (%s) failed on attempt %d", job.id, job.kind, job.attempts)
+            error = f"{type(exc).__name__}: {exc}"
+            if job.attempts >= job.max_attempts:
+                await self._finish(fail_job, job, error)
+            else:
+                delay = retry_delay(
+                    job.attempts, self._config.backoff_base, self._config.backoff_max
+                )
+                await self._finish(retry_job, job, error, delay)
+        else:
+            await self._finish(complete_job, job, result)
+
+    async def _call(self, task: Task, job: Job) -> Any:
+        """Call the task of a job, taking the write lock upfront if it is `immediate`."""
+        async with self._connect() as connection:
+            if task.immediate:
+                connection = await connection.execution_options(sqlite_immediate=True)
+            result = await task.function(connection, job.payload)
+            await connection.commit()
+            return result
+
+    async def _finish(self, record: Callable[..., Any], job: Job, *args: Any):
+        """Record the outcome of a job with one of the `*_job` functions."""
+        async with self._connect() as connection:
+            connection = await connection.execution_options(sqlite_immediate=True)
+            if not await record(connection, job, *args):
+                logger.warning("Job %d was claimed again before it finished", job.id)
+            await connection.commit()
+
+    async def _heartbeat(self):
+        """Renew the leases of the running jobs three times per lease."""
+        while True:
+            await asyncio.sleep(self._config.lease / 3)
+            if not self._running:
+                continue
+            try:
+                async with self._connect() as connection:
+                    await extend_leases(connection, list(self._running), self._config.lease)
+                    await connection.commit()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Failed to extend the job leases")
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Generic
+from typing import Hashable
+from typing import TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Mapping bounded to `maxsize` entries, evicting the least recently used first.
+
+    Examples:
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.put("a", 1)
+        >>> cache.put("b", 2)
+        >>> cache.get("a")
+        1
+        >>> cache.put("c", 3)
+        >>> cache.get("b") is None
+        True
+    """
+
+    _entries: OrderedDict[K, V]
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """The value of a key, marked as the most recently used, `None` if missing."""
+        if (value := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V):
+        """Store the value of a key, evicting the least recently used one if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """Drop a key, returning its value if it was cached."""
+        return self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
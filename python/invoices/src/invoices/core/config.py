@@ -8,6 +8,9 @@ class DatabaseConfig:
     """Configuration for the database connection."""
 
     path: str = field(default_factory=lambda: os.getenv("SQLITE_DATABASE", ":memory:"))
+    busy_timeout: int = field(
+        default_factory=lambda: int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+    )
 
     @property
     def async_url(self) -> str:
@@ -25,4 +28,201 @@ class DatabaseConfig:
         return self.path == ":memory:"
 
 
+@dataclass(frozen=True)
+class ServerConfig:
+    """Configuration for the production (multi-worker) server."""
+
+    host: str = field(default_factory=lambda: os.getenv("SERVER_HOST", "127.0.0.1"))
+    port: int = field(default_factory=lambda: int(os.getenv("SERVER_PORT", "8080")))
+    workers: int = field(
+        default_factory=lambda: int(os.getenv("SERVER_WORKERS", str(os.cpu_count() or 1)))
+    )
+    max_requests: int = field(
+        default_factory=lambda: int(os.getenv("SERVER_MAX_REQUESTS", "10000"))
+    )
+    max_requests_jitter: int = field(
+        default_factory=lambda: int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "1000"))
+    )
+    graceful_timeout: int = field(
+        default_factory=lambda: int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+    )
+    timeout: int = field(default_factory=lambda: int(os.getenv("SERVER_TIMEOUT", "60")))
+    keepalive: int = field(default_factory=lambda: int(os.getenv("SERVER_KEEPALIVE", "5")))
+
+    @property
+    def bind(self) -> str:
+        """Construct the address the server listens on."""
+        return f"{self.host}:{self.port}"
+
+
+@dataclass(frozen=True)
+class ConcurrencyConfig:
+    """Configuration for the adaptive concurrency limiter."""
+
+    initial_limit: int = field(
+        default_factory=lambda: int(os.getenv("CONCURRENCY_INITIAL_LIMIT", "20"))
+    )
+    min_limit: int = field(default_factory=lambda: int(os.getenv("CONCURRENCY_MIN_LIMIT", "1")))
+    max_limit: int = field(default_factory=lambda: int(os.getenv("CONCURRENCY_MAX_LIMIT", "200")))
+    max_queue: int = field(default_factory=lambda: int(os.getenv("CONCURRENCY_MAX_QUEUE", "100")))
+    queue_timeout: float = field(
+        default_factory=lambda: float(os.getenv("CONCURRENCY_QUEUE_TIMEOUT", "0.1"))
+    )
+    retry_after: int = field(
+        default_factory=lambda: int(os.getenv("CONCURRENCY_RETRY_AFTER", "1"))
+    )
+    smoothing: float = field(
+        default_factory=lambda: float(os.getenv("CONCURRENCY_SMOOTHING", "0.2"))
+    )
+
+
+@dataclass(frozen=True)
+class WriterConfig:
+    """Configuration for the group-commit database writer."""
+
+    max_batch_size: int = field(
+        default_factory=lambda: int(os.getenv("WRITER_MAX_BATCH_SIZE", "256"))
+    )
+    max_batch_delay: float = field(
+        default_factory=lambda: float(os.getenv("WRITER_MAX_BATCH_DELAY", "0.002"))
+    )
+
+
+@dataclass(frozen=True)
+class ChangesConfig:
+    """Configuration for the invoice change feed."""
+
+    retention_days: int = field(
+        default_factory=lambda: int(os.getenv("INVOICE_CHANGES_RETENTION_DAYS", "30"))
+    )
+
+
+@dataclass(frozen=True)
+class EventsConfig:
+    """Configuration for the server-sent invoice events."""
+
+    poll_interval: float = field(
+        default_factory=lambda: float(os.getenv("EVENTS_POLL_INTERVAL", "0.5"))
+    )
+    queue_size: int = field(default_factory=lambda: int(os.getenv("EVENTS_QUEUE_SIZE", "256")))
+    heartbeat: float = field(default_factory=lambda: float(os.getenv("EVENTS_HEARTBEAT", "15")))
+    batch_size: int = field(default_factory=lambda: int(os.getenv("EVENTS_BATCH_SIZE", "500")))
+
+
+@dataclass(frozen=True)
+class ArchiveConfig:
+    """Configuration for the archival of old invoices."""
+
+    directory: str = field(default_factory=lambda: os.getenv("ARCHIVE_DIRECTORY", "archives"))
+    older_than_days: int = field(
+        default_factory=lambda: int(os.getenv("ARCHIVE_OLDER_THAN_DAYS", "365"))
+    )
+    chunk_size: int = field(default_factory=lambda: int(os.getenv("ARCHIVE_CHUNK_SIZE", "1000")))
+
+
+@dataclass(frozen=True)
+class SnapshotConfig:
+    """Configuration for the memory-mapped snapshot of the invoice ids (off if no path)."""
+
+    path: str | None = field(default_factory=lambda: os.getenv("SNAPSHOT_PATH"))
+    max_age: float = field(default_factory=lambda: float(os.getenv("SNAPSHOT_MAX_AGE", "1.0")))
+
+
+@dataclass(frozen=True)
+class LookupConfig:
+    """Configuration for the lookups of invoices by ID."""
+
+    cache_size: int = field(default_factory=lambda: int(os.getenv("LOOKUP_CACHE_SIZE", "10000")))
+
+
+@dataclass(frozen=True)
+class NumberingConfig:
+    """Configuration for the legal invoice numbers (`block` or `strict` mode)."""
+
+    prefix: str = field(default_factory=lambda: os.getenv("NUMBERING_PREFIX", "OT"))
+    mode: str = field(default_factory=lambda: os.getenv("NUMBERING_MODE", "block"))
+    block_size: int = field(default_factory=lambda: int(os.getenv("NUMBERING_BLOCK_SIZE", "100")))
+
+
+@dataclass(frozen=True)
+class IdempotencyConfig:
+    """Configuration for the `Idempotency-Key` support of the write endpoints."""
+
+    ttl: float = field(default_factory=lambda: float(os.getenv("IDEMPOTENCY_TTL", "86400")))
+    cache_size: int = field(
+        default_factory=lambda: int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    )
+    lock_timeout: float = field(
+        default_factory=lambda: float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", "60"))
+    )
+    wait_timeout: float = field(
+        default_factory=lambda: float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "10"))
+    )
+    poll_interval: float = field(
+        default_factory=lambda: float(os.getenv("IDEMPOTENCY_POLL_INTERVAL", "0.05"))
+    )
+    cleanup_interval: float = field(
+        default_factory=lambda: float(os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL", "300"))
+    )
+    api_key_header: str = field(
+        default_factory=lambda: os.getenv("IDEMPOTENCY_API_KEY_HEADER", "x-api-key")
+    )
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    """Per-client rate limits of the routes.
+
+    Rules read `METHOD /path=rate:burst`, separated by `;`: e.g. `POST /invoices=5:20`
+    lets each client create 5 invoices per second, in bursts of up to 20.
+    """
+
+    rules: str = field(default_factory=lambda: os.getenv("RATE_LIMIT_RULES", ""))
+    api_key_header: str = field(
+        default_factory=lambda: os.getenv("RATE_LIMIT_API_KEY_HEADER", "x-api-key")
+    )
+    max_clients: int = field(
+        default_factory=lambda: int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "100000"))
+    )
+    shared_path: str | None = field(default_factory=lambda: os.getenv("RATE_LIMIT_SHARED_PATH"))
+    shared_slots: int = field(
+        default_factory=lambda: int(os.getenv("RATE_LIMIT_SHARED_SLOTS", "65536"))
+    )
+
+
+@dataclass(frozen=True)
+class JobsConfig:
+    """Configuration for the background job queue and its workers."""
+
+    concurrency: int = field(default_factory=lambda: int(os.getenv("JOBS_CONCURRENCY", "4")))
+    poll_interval: float = field(
+        default_factory=lambda: float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+    )
+    lease: float = field(default_factory=lambda: float(os.getenv("JOBS_LEASE", "60")))
+    max_attempts: int = field(default_factory=lambda: int(os.getenv("JOBS_MAX_ATTEMPTS", "5")))
+    backoff_base: float = field(default_factory=lambda: float(os.getenv("JOBS_BACKOFF_BASE", "2")))
+    backoff_max: float = field(default_factory=lambda: float(os.getenv("JOBS_BACKOFF_MAX", "600")))
+
+
+@dataclass(frozen=True)
+class DocumentsConfig:
+    """Configuration for the rendering of the invoice documents."""
+
+    directory: str = field(default_factory=lambda: os.getenv("DOCUMENTS_DIRECTORY", "documents"))
+    processes: int = field(default_factory=lambda: int(os.getenv("DOCUMENTS_PROCESSES", "2")))
+
+
 database = DatabaseConfig()
+server = ServerConfig()
+concurrency = ConcurrencyConfig()
+writer = WriterConfig()
+changes = ChangesConfig()
+events = EventsConfig()
+archive = ArchiveConfig()
+snapshot = SnapshotConfig()
+lookup = LookupConfig()
+numbering = NumberingConfig()
+idempotency = IdempotencyConfig()
+rate_limit = RateLimitConfig()
+jobs = JobsConfig()
+documents = DocumentsConfig()
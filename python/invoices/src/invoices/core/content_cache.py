@@ -0,0 +1,44 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_atomically(path: Path, content: bytes):
+    """Write a file through a temporary sibling renamed over it, never leaving it partial."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class ContentCache:
+    """On-disk cache of contents addressed by the hash of what they are made from.
+
+    A key always names the same content, so entries are never invalidated: they are
+    written once, atomically, and any process can read or write them concurrently.
+    Files are spread over 256 subdirectories by the first two characters of their key.
+    """
+
+    def __init__(self, directory: str | Path, suffix: str):
+        self.directory = Path(directory)
+        self.suffix = suffix
+
+    def path(self, key: str) -> Path:
+        """The file of a key."""
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> bytes | None:
+        """The content of a key, if cached."""
+        try:
+            return self.path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, content: bytes):
+        """Cache the content of a key."""
+        write_atomically(self.path(key), content)
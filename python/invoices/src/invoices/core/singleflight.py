@@ -0,0 +1,50 @@
+import asyncio
+from functools import partial
+from typing import Awaitable
+from typing import Callable
+from typing import Generic
+from typing import Hashable
+from typing import TypeVar
+
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[V]):
+    """Deduplicate concurrent calls sharing the same key.
+
+    The first caller for a key starts the computation in a task owned by the
+    `SingleFlight`; every caller arriving while it is in flight awaits the same result
+    (or exception) instead of running it again. A cancelled caller only stops waiting:
+    the computation carries on for the others. Once it completes, the key is
+    forgotten: nothing is cached.
+
+    Examples:
+        >>> flights = SingleFlight()
+        >>> async def compute():
+        ...     return 42
+        >>> asyncio.run(flights.do("answer", compute))
+        42
+    """
+
+    _calls: dict[Hashable, asyncio.Task[V]]
+
+    def __init__(self):
+        self._calls = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[V]]) -> V:
+        """Run `func`, or join the in-flight call for the same key."""
+        if (task := self._calls.get(key)) is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(partial(self._forget, key))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[V]):
+        """Drop a completed call, marking its exception as retrieved."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import time
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+from invoices.core.cache import LRUCache
+
+SLOT = struct.Struct("<Qdd")  # key hash, tokens, last refill (unix time)
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of taking a token from a bucket."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int  # seconds until a token is available, 0 if allowed
+    reset: int  # seconds until the bucket is full again
+
+
+def take(tokens: float, elapsed: float, rate: float, burst: int) -> tuple[float, Decision]:
+    """Refill a bucket for the elapsed seconds, then try to take a token out of it.
+
+    Returns the tokens left in the bucket and the decision.
+
+    Examples:
+        >>> take(0.5, elapsed=0.25, rate=1.0, burst=10)
+        (0.75, Decision(allowed=False, limit=10, remaining=0, retry_after=1, reset=10))
+        >>> take(3.0, elapsed=1.0, rate=1.0, burst=3)
+        (2.0, Decision(allowed=True, limit=3, remaining=2, retry_after=0, reset=1))
+    """
+    tokens = min(float(burst), tokens + max(elapsed, 0.0) * rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    decision = Decision(
+        allowed=allowed,
+        limit=burst,
+        remaining=int(tokens),
+        retry_after=0 if allowed else math.ceil((1 - tokens) / rate),
+        reset=math.ceil((burst - tokens) / rate),
+    )
+    return tokens, decision
+
+
+class TokenBuckets(ABC):
+    """Token buckets of the clients, each taken from in O(1)."""
+
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: int) -> Decision:
+        """Take a token from the bucket of a key, refilled at `rate` tokens per second."""
+
+    def close(self):
+        """Release the resources of the buckets, if any."""
+
+
+class MemoryTokenBuckets(TokenBuckets):
+    """Token buckets of a single process, the least recently used beyond `max_keys` dropped.
+
+    A dropped bucket comes back full.
+    """
+
+    def __init__(self, max_keys: int):
+        self._buckets: LRUCache[str, tuple[float, float]] = LRUCache(max_keys)
+
+    def take(self, key: str, rate: float, burst: int) -> Decision:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key) or (float(burst), now)
+        tokens, decision = take(tokens, now - updated, rate, burst)
+        self._buckets.put(key, (tokens, now))
+        return decision
+
+
+class SharedTokenBuckets(TokenBuckets):
+    """Token buckets shared by the processes through a memory-mapped file.
+
+    The file is a fixed-size hash table: a key hashes to one slot, updated under a lock
+    on the slot's bytes only. Two keys sharing a slot take it over in turn, each finding
+    a full bucket: collisions make the limits more lenient, never stricter.
+    """
+
+    def __init__(self, path: str | Path, slots: int):
+        self.slots = slots
+        size = slots * SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size != size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    def take(self, key: str, rate: float, burst: int) -> Decision:
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        offset = digest % self.slots * SLOT.size
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, SLOT.size, offset)
+        try:
+            now = time.time()
+            owner, tokens, updated = SLOT.unpack_from(self._map, offset)
+            if owner != digest:
+                tokens, updated = float(burst), now
+            tokens, decision = take(tokens, now - updated, rate, burst)
+            SLOT.pack_into(self._map, offset, digest, tokens, now)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, SLOT.size, offset)
+        return decision
+
+    def close(self):
+        """Unmap the file."""
+        self._map.close()
+        os.close(self._fd)
@@ -0,0 +1,44 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from uuid import UUID
+
+TIMESTAMP_SHIFT = 80
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _milliseconds(moment: datetime) -> int:
+    """Unix timestamp of a moment, in milliseconds (naive moments are taken as UTC)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return (moment - EPOCH) // timedelta(milliseconds=1)
+
+
+def uuid7_timestamp(value: UUID) -> datetime:
+    """Creation time embedded in the 48 most significant bits of a uuid7.
+
+    Examples:
+        >>> uuid7_timestamp(UUID("01a15138-a189-79b0-969c-aefcdf39d1da"))
+        datetime.datetime(2026, 10, 18, 22, 53, 48, 297000, tzinfo=datetime.timezone.utc)
+    """
+    return EPOCH + timedelta(milliseconds=value.int >> TIMESTAMP_SHIFT)
+
+
+def uuid7_lower_bound(moment: datetime) -> UUID:
+    """Bound sorting before every uuid7 created at or after the given moment.
+
+    Examples:
+        >>> uuid7_lower_bound(datetime(2026, 10, 18, 22, 53, 48, 297000, tzinfo=UTC))
+        UUID('01a15138-a189-0000-0000-000000000000')
+    """
+    return UUID(int=_milliseconds(moment) << TIMESTAMP_SHIFT)
+
+
+def uuid7_upper_bound(moment: datetime) -> UUID:
+    """Bound sorting after every uuid7 created at or before the given moment.
+
+    Examples:
+        >>> uuid7_upper_bound(datetime(2026, 10, 18, 22, 53, 48, 297000, tzinfo=UTC))
+        UUID('01a15138-a189-ffff-ffff-ffffffffffff')
+    """
+    return UUID(int=((_milliseconds(moment) + 1) << TIMESTAMP_SHIFT) - 1)
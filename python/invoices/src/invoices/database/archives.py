@@ -0,0 +1,155 @@
+from functools import cache
+from itertools import groupby
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import Column
+from sqlalchemy import MetaData
+from sqlalchemy import Row
+from sqlalchemy import Table
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.types import UUID as UUIDType
+
+from invoices.core.uuid7 import uuid7_timestamp
+from invoices.database.core import ATTACHED_DATABASES
+from invoices.database.tables.invoice_archives import invoice_archives
+from invoices.database.tables.invoices import invoices
+
+PERIOD_FORMAT = "%Y-%m"
+
+
+def archive_period(invoice_id: UUID) -> str:
+    """The archive period of an invoice: the month it was created, read from its uuid7."""
+    return uuid7_timestamp(invoice_id).strftime(PERIOD_FORMAT)
+
+
+def archive_path(directory: Path, period: str) -> Path:
+    """The file of the archive database of a period."""
+    return directory.resolve() / f"invoices-{period}.db"
+
+
+@cache
+def archive_table(period: str) -> Table:
+    """The invoices table of the archive database of a period, once attached."""
+    return Table(
+        "invoices",
+        MetaData(),
+        Column("id", UUIDType(as_uuid=True), primary_key=True),
+        schema=f"archive_{period.replace('-', '_')}",
+    )
+
+
+async def attach(connection: AsyncConnection, period: str, path: str) -> Table:
+    """Attach the archive database of a period, until the connection is checked in."""
+    table = archive_table(period)
+    attached: set[str] = connection.info.setdefault(ATTACHED_DATABASES, set())
+    if table.schema not in attached:
+        await connection.exec_driver_sql(f'ATTACH DATABASE ? AS "{table.schema}"', (path,))
+        attached.add(table.schema)
+    return table
+
+
+async def registered_archives(connection: AsyncConnection) -> list[Row]:
+    """The archives of the registry, oldest first."""
+    stmt = select(invoice_archives).order_by(invoice_archives.c.period)
+    result = await connection.execute(stmt)
+    return list(result.fetchall())
+
+
+async def find_archive(connection: AsyncConnection, invoice_id: UUID) -> Row | None:
+    """The archive whose id bounds contain the given invoice id, if any."""
+    stmt = select(invoice_archives).where(
+        invoice_archives.c.lower_id <= invoice_id,
+        invoice_archives.c.upper_id >= invoice_id,
+    )
+    result = await connection.execute(stmt)
+    return result.fetchone()
+
+
+async def delete_archived(connection: AsyncConnection, invoice_id: UUID) -> bool:
+    """Delete an invoice from its archive, returning whether it was archived."""
+    archive = await find_archive(connection, invoice_id)
+    if archive is None:
+        return False
+
+    table = await attach(connection, archive.period, archive.path)
+    result = await connection.execute(delete(table).where(table.c.id == invoice_id))
+    if result.rowcount == 0:
+        return False
+
+    stmt = (
+        update(invoice_archives)
+        .where(invoice_archives.c.period == archive.period)
+        .values(count=invoice_archives.c.count - 1)
+    )
+    await connection.execute(stmt)
+    return True
+
+
+async def archive_invoices(
+    connection: AsyncConnection,
+    before: UUID,
+    directory: Path,
+    chunk_size: int,
+) -> int:
+    """Move the invoices whose id sorts before `before` to the archive of their period.
+
+    Invoices are moved in chunks of consecutive ids, each committed on its own so that
+    writers are never blocked for long. Archives sit in separate files, which SQLite
+    does not commit atomically with the main database: an interrupted run may leave a
+    chunk in both, which the next run resumes from without counting it twice.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    moved = 0
+    while True:
+        stmt = select(invoices.c.id).where(invoices.c.id < before).order_by(invoices.c.id)
+        result = await connection.execute(stmt.limit(chunk_size))
+        ids = list(result.scalars())
+        if not ids:
+            return moved
+
+        for period, group in groupby(ids, key=archive_period):
+            period_ids = list(group)
+            path = archive_path(directory, period)
+            moved += await _move(connection, period, str(path), period_ids[0], period_ids[-1])
+        await connection.commit()
+
+
+async def _move(
+    connection: AsyncConnection, period: str, path: str, lower: UUID, upper: UUID
+) -> int:
+    """Move a range of invoice ids to the archive of a period and register it."""
+    table = await attach(connection, period, path)
+    await connection.run_sync(table.create, checkfirst=True)
+
+    in_range = invoices.c.id.between(lower, upper)
+    copy = insert(table).prefix_with("OR IGNORE")
+    result = await connection.execute(
+        copy.from_select(["id"], select(invoices.c.id).where(in_range))
+    )
+    copied = result.rowcount
+    await connection.execute(delete(invoices).where(in_range))
+
+    register = sqlite_insert(invoice_archives).values(
+        period=period,
+        path=path,
+        lower_id=lower,
+        upper_id=upper,
+        count=copied,
+    )
+    register = register.on_conflict_do_update(
+        index_elements=[invoice_archives.c.period],
+        set_={
+            "lower_id": func.min(invoice_archives.c.lower_id, register.excluded.lower_id),
+            "upper_id": func.max(invoice_archives.c.upper_id, register.excluded.upper_id),
+            "count": invoice_archives.c.count + register.excluded.count,
+        },
+    )
+    await connection.execute(register)
+    return copied
@@ -4,6 +4,7 @@ from typing import AsyncGenerator
 from sqlalchemy import Engine
 from sqlalchemy import MetaData
 from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import create_async_engine
@@ -20,6 +21,9 @@ naming_convention = {
 
 metadata = MetaData(naming_convention=naming_convention)
 
+# key of the connection info listing the databases attached while it is checked out
+ATTACHED_DATABASES = "attached_databases"
+
 
 async def _create_tables_async(engine: AsyncEngine):
     """Create all tables in the database."""
@@ -32,9 +36,50 @@ def _create_tables_sync(engine: Engine):
     metadata.create_all(engine)
 
 
+def _configure_sqlite(engine: Engine, config: DatabaseConfig):
+    """Configure every new SQLite connection for concurrent multi-process access.
+
+    WAL lets readers proceed while a writer holds the lock, and the busy timeout makes
+    a writer wait for the lock held by another worker instead of failing immediately
+    with `database is locked`.
+
+    The driver's implicit transaction handling is disabled so that SQLAlchemy emits
+    `BEGIN` itself: savepoints then behave, and connections flagged with the
+    `sqlite_immediate` execution option take the write lock upfront (`BEGIN IMMEDIATE`)
+    rather than failing to upgrade a read transaction when another worker writes.
+
+    Archive databases attached while a connection is checked out are detached when it
+    returns to the pool, its transaction being over by then.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {int(config.busy_timeout)}")
+        if not config.is_memory:
+            cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.close()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        if dbapi_connection is None:  # invalidated
+            return
+        cursor = dbapi_connection.cursor()
+        for schema in connection_record.info.pop(ATTACHED_DATABASES, ()):
+            cursor.execute(f'DETACH DATABASE "{schema}"')
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        immediate = connection.get_execution_options().get("sqlite_immediate", False)
+        connection.exec_driver_sql("BEGIN IMMEDIATE" if immediate else "BEGIN")
+
+
 async def get_async_engine(config: DatabaseConfig) -> AsyncEngine:
     """Create a new async engine."""
     engine = create_async_engine(config.async_url)
+    _configure_sqlite(engine.sync_engine, config)
     if config.is_memory:
         await _create_tables_async(engine)
     return engine
@@ -43,6 +88,7 @@ async def get_async_engine(config: DatabaseConfig) -> AsyncEngine:
 def get_sync_engine(config: DatabaseConfig) -> Engine:
     """Create a new engine."""
     engine = create_engine(config.sync_url)
+    _configure_sqlite(engine, config)
     if config.is_memory:
         _create_tables_sync(engine)
     return engine
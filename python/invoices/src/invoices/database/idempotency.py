@@ -0,0 +1,95 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from sqlalchemy import Row
+from sqlalchemy import delete
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from invoices.database.tables.idempotency_keys import idempotency_keys
+
+
+def _now() -> datetime:
+    """The current moment, as naive UTC (SQLite has no time zones)."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+async def fetch_key(connection: AsyncConnection, scope: str, key: str) -> Row | None:
+    """The record of an idempotency key of the given client, unless it expired."""
+    stmt = select(idempotency_keys).where(
+        idempotency_keys.c.scope == scope,
+        idempotency_keys.c.key == key,
+        idempotency_keys.c.expires_at >= _now(),
+    )
+    result = await connection.execute(stmt)
+    return result.fetchone()
+
+
+async def claim_key(
+    connection: AsyncConnection, scope: str, key: str, fingerprint: str, lock_timeout: float
+) -> bool:
+    """Record an idempotency key as in flight, returning whether this call got it.
+
+    A key whose record expired, completed or left in flight by a crashed worker, is
+    claimed again.
+    """
+    expires_at = _now() + timedelta(seconds=lock_timeout)
+    stmt = sqlite_insert(idempotency_keys).values(
+        scope=scope, key=key, fingerprint=fingerprint, expires_at=expires_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[idempotency_keys.c.scope, idempotency_keys.c.key],
+        set_={
+            "fingerprint": stmt.excluded.fingerprint,
+            "status_code": None,
+            "media_type": None,
+            "body": None,
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=idempotency_keys.c.expires_at < _now(),
+    )
+    result = await connection.execute(stmt)
+    return result.rowcount == 1
+
+
+async def complete_key(
+    connection: AsyncConnection,
+    scope: str,
+    key: str,
+    status_code: int,
+    media_type: str | None,
+    body: bytes,
+    ttl: float,
+):
+    """Store the response of the request which claimed an idempotency key."""
+    stmt = (
+        update(idempotency_keys)
+        .where(idempotency_keys.c.scope == scope, idempotency_keys.c.key == key)
+        .values(
+            status_code=status_code,
+            media_type=media_type,
+            body=body,
+            expires_at=_now() + timedelta(seconds=ttl),
+        )
+    )
+    await connection.execute(stmt)
+
+
+async def release_key(connection: AsyncConnection, scope: str, key: str):
+    """Forget an idempotency key whose request failed, so that it can be retried."""
+    stmt = delete(idempotency_keys).where(
+        idempotency_keys.c.scope == scope,
+        idempotency_keys.c.key == key,
+        idempotency_keys.c.status_code.is_(None),
+    )
+    await connection.execute(stmt)
+
+
+async def delete_expired_keys(connection: AsyncConnection) -> int:
+    """Delete the expired idempotency keys (an index range scan)."""
+    stmt = delete(idempotency_keys).where(idempotency_keys.c.expires_at < _now())
+    result = await connection.execute(stmt)
+    return result.rowcount
@@ -0,0 +1,155 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy import and_
+from sqlalchemy import insert
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from invoices.database.tables.jobs import jobs
+from invoices.domain.models.job import Job
+from invoices.domain.models.job import JobStatus
+
+
+def _now() -> datetime:
+    """The current moment, as naive UTC (SQLite has no time zones)."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _job(row: Row) -> Job:
+    """Create a `Job` from a record of the jobs table."""
+    return Job(
+        id=row.id,
+        kind=row.kind,
+        payload=row.payload,
+        priority=row.priority,
+        status=JobStatus(row.status),
+        attempts=row.attempts,
+        max_attempts=row.max_attempts,
+        run_at=row.run_at,
+        result=row.result,
+        error=row.error,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
+async def enqueue_job(
+    connection: AsyncConnection,
+    kind: str,
+    payload: dict[str, Any],
+    priority: int,
+    max_attempts: int,
+) -> Job:
+    """Queue a job, to run as soon as a worker is free."""
+    now = _now()
+    stmt = (
+        insert(jobs)
+        .values(
+            kind=kind,
+            payload=payload,
+            priority=priority,
+            status=JobStatus.QUEUED,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+        .returning(*jobs.c)
+    )
+    result = await connection.execute(stmt)
+    return _job(result.one())
+
+
+async def fetch_job(connection: AsyncConnection, job_id: int) -> Job | None:
+    """The job of the given id, if any."""
+    result = await connection.execute(select(jobs).where(jobs.c.id == job_id))
+    row = result.fetchone()
+    return _job(row) if row else None
+
+
+async def claim_jobs(connection: AsyncConnection, limit: int, lease: float) -> list[Job]:
+    """Claim up to `limit` due jobs, highest priority first, in a single statement.
+
+    The `UPDATE ... RETURNING` marks the jobs as running for the lease and hands them
+    over at once: two workers never claim the same job. Running jobs whose lease
+    expired, their worker having died, are claimed again.
+    """
+    now = _now()
+    claimable = (
+        select(jobs.c.id)
+        .where(
+            or_(
+                and_(jobs.c.status == JobStatus.QUEUED, jobs.c.run_at <= now),
+                and_(jobs.c.status == JobStatus.RUNNING, jobs.c.locked_until < now),
+            )
+        )
+        .order_by(jobs.c.priority.desc(), jobs.c.run_at, jobs.c.id)
+        .limit(limit)
+    )
+    stmt = (
+        update(jobs)
+        .where(jobs.c.id.in_(claimable.scalar_subquery()))
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=jobs.c.attempts + 1,
+            locked_until=now + timedelta(seconds=lease),
+            updated_at=now,
+        )
+        .returning(*jobs.c)
+    )
+    result = await connection.execute(stmt)
+    claimed = [_job(row) for row in result]
+    return sorted(claimed, key=lambda job: (-job.priority, job.run_at, job.id))
+
+
+async def extend_leases(connection: AsyncConnection, job_ids: list[int], lease: float):
+    """Extend the lease of jobs still running."""
+    stmt = (
+        update(jobs)
+        .where(jobs.c.id.in_(job_ids), jobs.c.status == JobStatus.RUNNING)
+        .values(locked_until=_now() + timedelta(seconds=lease))
+    )
+    await connection.execute(stmt)
+
+
+async def _finish(connection: AsyncConnection, job: Job, **values: Any) -> bool:
+    """Record the outcome of a run, unless the job was claimed again since."""
+    stmt = (
+        update(jobs)
+        .where(
+            jobs.c.id == job.id,
+            jobs.c.status == JobStatus.RUNNING,
+            jobs.c.attempts == job.attempts,
+        )
+        .values(locked_until=None, updated_at=_now(), **values)
+    )
+    result = await connection.execute(stmt)
+    return result.rowcount == 1
+
+
+async def complete_job(connection: AsyncConnection, job: Job, result: Any) -> bool:
+    """Record the result of a job which ran successfully."""
+    return await _finish(connection, job, status=JobStatus.SUCCEEDED, result=result, error=None)
+
+
+async def retry_job(connection: AsyncConnection, job: Job, error: str, delay: float) -> bool:
+    """Queue a failed job again, to run after the given delay."""
+    return await _finish(
+        connection,
+        job,
+        status=JobStatus.QUEUED,
+        error=error,
+        run_at=_now() + timedelta(seconds=delay),
+    )
+
+
+async def fail_job(connection: AsyncConnection, job: Job, error: str) -> bool:
+    """Record that a job failed for good."""
+    return await _finish(connection, job, status=JobStatus.FAILED, error=error)
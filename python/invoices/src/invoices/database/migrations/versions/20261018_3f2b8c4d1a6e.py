@@ -0,0 +1,42 @@
+"""add invoice_changes table
+
+Revision ID: 3f2b8c4d1a6e
+Revises: 55e0e2a96507
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+# fmt: off
+# pylint: disable=no-member, line-too-long
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f2b8c4d1a6e"
+down_revision: Union[str, None] = "55e0e2a96507"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade from `55e0e2a96507` to `3f2b8c4d1a6e`."""
+    op.create_table(
+        "invoice_changes",
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("invoice_id", sa.UUID(), nullable=False),
+        sa.Column("operation", sa.String(length=16), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("seq", name=op.f("pk_invoice_changes")),
+        sqlite_autoincrement=True,
+    )
+    op.create_index(
+        op.f("ix_invoice_changes_recorded_at"), "invoice_changes", ["recorded_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade from `3f2b8c4d1a6e` to `55e0e2a96507`."""
+    op.drop_index(op.f("ix_invoice_changes_recorded_at"), table_name="invoice_changes")
+    op.drop_table("invoice_changes")
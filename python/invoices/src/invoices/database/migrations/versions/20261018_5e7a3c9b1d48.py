@@ -0,0 +1,44 @@
+"""add idempotency_keys table
+
+Revision ID: 5e7a3c9b1d48
+Revises: c6d9e1f4b207
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+# fmt: off
+# pylint: disable=no-member, line-too-long
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e7a3c9b1d48"
+down_revision: Union[str, None] = "c6d9e1f4b207"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade from `c6d9e1f4b207` to `5e7a3c9b1d48`."""
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("scope", sa.String(length=255), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("media_type", sa.String(length=255), nullable=True),
+        sa.Column("body", sa.LargeBinary(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("scope", "key", name=op.f("pk_idempotency_keys")),
+    )
+    op.create_index(
+        op.f("ix_idempotency_keys_expires_at"), "idempotency_keys", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade from `5e7a3c9b1d48` to `c6d9e1f4b207`."""
+    op.drop_index(op.f("ix_idempotency_keys_expires_at"), table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
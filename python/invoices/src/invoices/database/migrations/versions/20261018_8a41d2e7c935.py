@@ -0,0 +1,38 @@
+"""add invoice_archives table
+
+Revision ID: 8a41d2e7c935
+Revises: 3f2b8c4d1a6e
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+# fmt: off
+# pylint: disable=no-member, line-too-long
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a41d2e7c935"
+down_revision: Union[str, None] = "3f2b8c4d1a6e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade from `3f2b8c4d1a6e` to `8a41d2e7c935`."""
+    op.create_table(
+        "invoice_archives",
+        sa.Column("period", sa.String(length=7), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("lower_id", sa.UUID(), nullable=False),
+        sa.Column("upper_id", sa.UUID(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("period", name=op.f("pk_invoice_archives")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade from `8a41d2e7c935` to `3f2b8c4d1a6e`."""
+    op.drop_table("invoice_archives")
@@ -0,0 +1,49 @@
+"""add jobs table
+
+Revision ID: 9d3b6f2a7c15
+Revises: 5e7a3c9b1d48
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+# fmt: off
+# pylint: disable=no-member, line-too-long
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3b6f2a7c15"
+down_revision: Union[str, None] = "5e7a3c9b1d48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade from `5e7a3c9b1d48` to `9d3b6f2a7c15`."""
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=64), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_at", sa.DateTime(), nullable=False),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_jobs")),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_jobs_claim", "jobs", ["status", "priority", "run_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade from `9d3b6f2a7c15` to `5e7a3c9b1d48`."""
+    op.drop_index("ix_jobs_claim", table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,44 @@
+"""add invoice_sequences and invoice_numbers tables
+
+Revision ID: c6d9e1f4b207
+Revises: 8a41d2e7c935
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+# fmt: off
+# pylint: disable=no-member, line-too-long
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c6d9e1f4b207"
+down_revision: Union[str, None] = "8a41d2e7c935"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade from `8a41d2e7c935` to `c6d9e1f4b207`."""
+    op.create_table(
+        "invoice_sequences",
+        sa.Column("prefix", sa.String(length=16), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("next_value", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("prefix", "year", name=op.f("pk_invoice_sequences")),
+    )
+    op.create_table(
+        "invoice_numbers",
+        sa.Column("number", sa.String(length=32), nullable=False),
+        sa.Column("invoice_id", sa.UUID(), nullable=False),
+        sa.PrimaryKeyConstraint("number", name=op.f("pk_invoice_numbers")),
+        sa.UniqueConstraint("invoice_id", name=op.f("uq_invoice_numbers_invoice_id")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade from `c6d9e1f4b207` to `8a41d2e7c935`."""
+    op.drop_table("invoice_numbers")
+    op.drop_table("invoice_sequences")
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+
+import numpy as np
+from sqlalchemy import Engine
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateTable
+
+from invoices.database.archives import PERIOD_FORMAT
+from invoices.database.archives import archive_path
+from invoices.database.archives import archive_table
+from invoices.domain.models.invoice_change import InvoiceOperation
+from invoices.domain.models.invoice_sequence import InvoiceSequence
+
+MILLISECONDS_PER_DAY = 86_400_000
+MILLISECONDS_PER_HOUR = 3_600_000
+
+# share of the invoices created per hour of the day (UTC) and per day of the week
+HOUR_WEIGHTS = np.array(
+    [1, 1, 1, 1, 1, 2, 4, 8, 14, 16, 16, 14, 10, 12, 15, 15, 13, 10, 7, 5, 4, 3, 2, 1],
+    dtype=np.float64,
+)
+WEEKDAY_WEIGHTS = np.array([1.0, 1.0, 1.0, 1.0, 0.9, 0.25, 0.1])  # Monday first
+
+# a bulk load session: no rollback journal nor fsync, the database locked for the loader
+BULK_PRAGMAS = [
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",
+]
+RESTORE_PRAGMAS = [
+    "PRAGMA synchronous = FULL",
+    "PRAGMA locking_mode = NORMAL",
+    "PRAGMA journal_mode = WAL",
+]
+
+
+def uuid7_hex(milliseconds: np.ndarray, rng: np.random.Generator) -> list[str]:
+    """Random uuid7 ids created at the given times, as the 32 hex digits SQLite stores."""
+    count = len(milliseconds)
+    words = np.empty((count, 2), dtype=">u8")
+    words[:, 0] = (
+        (milliseconds.astype(np.uint64) << np.uint64(16))
+        | np.uint64(0x7000)
+        | rng.integers(0, 1 << 12, count, dtype=np.uint64)
+    )
+    words[:, 1] = (np.uint64(0b10) << np.uint64(62)) | rng.integers(
+        0, 1 << 62, count, dtype=np.uint64
+    )
+    digits = np.frombuffer(words.tobytes().hex().encode(), dtype="S32")
+    return digits.astype("U32").tolist()
+
+
+def creation_times(
+    days: int, end: datetime, rows: int, rng: np.random.Generator
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Spread `rows` creation times over the `days` before `end`, a day at a time.
+
+    Yields the first millisecond of each day and its sorted creation times, busier on
+    working days and office hours.
+    """
+    first_day = (end - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = int(first_day.timestamp() * 1000)
+    weekdays = (np.arange(days) + first_day.weekday()) % 7
+    day_weights = WEEKDAY_WEIGHTS[weekdays]
+    per_day = rng.multinomial(rows, day_weights / day_weights.sum())
+    hour_probabilities = HOUR_WEIGHTS / HOUR_WEIGHTS.sum()
+    for day, count in enumerate(per_day):
+        day_start = start + day * MILLISECONDS_PER_DAY
+        hours = rng.choice(24, size=count, p=hour_probabilities)
+        offsets = hours * MILLISECONDS_PER_HOUR + rng.integers(0, MILLISECONDS_PER_HOUR, count)
+        yield day_start, np.sort(day_start + offsets)
+
+
+class InvoiceSeeder:
+    """Bulk loader of synthetic invoices, for scale testing.
+
+    Rows are inserted with `executemany`, in large batches each committed on its own,
+    over a raw connection tuned for bulk loads (no journal, no fsync, exclusive lock):
+    no server may use the database meanwhile, and a crash may corrupt it. The invoices
+    are numbered, in creation order within a year, unless no prefix is given. Those
+    created before `archive_before` go straight to the archive of their month, in
+    `archive_directory`. All of them are recorded in the change feed, which brings the
+    id snapshot and the cached statistics of the workers up to date.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        prefix: str | None,
+        batch_size: int,
+        archive_directory: Path,
+        archive_before: datetime | None = None,
+    ):
+        self._engine = engine
+        self._prefix = prefix
+        self._batch_size = batch_size
+        self._archive_directory = archive_directory
+        self._archive_before = archive_before
+        self._next_values: dict[int, int] = {}
+
+    def seed(
+        self, rows: int, days: int, end: datetime | None = None, seed: int | None = None
+    ) -> int:
+        """Insert `rows` invoices created over the `days` before `end` (now by default)."""
+        rng = np.random.default_rng(seed)
+        end = end or datetime.now(UTC)
+        connection = self._engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            for pragma in BULK_PRAGMAS:
+                cursor.execute(pragma)
+            archive_before = -1
+            if self._archive_before is not None:
+                archive_before = int(self._archive_before.timestamp() * 1000)
+            # the invoices of a batch, by archive period (`None` for the main table)
+            batch: list[tuple[str | None, list[str], list[str]]] = []
+            pending = inserted = 0
+            for day_start, milliseconds in creation_times(days, end, rows, rng):
+                ids = uuid7_hex(milliseconds, rng)
+                numbers = []
+                if self._prefix is not None:
+                    numbers = self._number(cursor, day_start, len(ids))
+                archived = int(np.searchsorted(milliseconds, archive_before))
+                if archived:
+                    period = datetime.fromtimestamp(day_start / 1000, UTC).strftime(PERIOD_FORMAT)
+                    batch.append((period, ids[:archived], numbers[:archived]))
+                if archived < len(ids):
+                    batch.append((None, ids[archived:], numbers[archived:]))
+                pending += len(ids)
+                if pending >= self._batch_size:
+                    inserted += self._insert(cursor, batch)
+                    batch, pending = [], 0
+            inserted += self._insert(cursor, batch)
+            for pragma in RESTORE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+        finally:
+            connection.close()
+        return inserted
+
+    def _number(self, cursor: Any, day_start: int, count: int) -> list[str]:
+        """Take the next `count` numbers of the sequence of a day's year."""
+        year = datetime.fromtimestamp(day_start / 1000, UTC).year
+        if year not in self._next_values:
+            cursor.execute(
+                "SELECT next_value FROM invoice_sequences WHERE prefix = ? AND year = ?",
+                (self._prefix, year),
+            )
+            row = cursor.fetchone()
+            self._next_values[year] = row[0] if row else 1
+        first = self._next_values[year]
+        self._next_values[year] = first + count
+        sequence = InvoiceSequence(str(self._prefix), year)
+        return [sequence.format(value) for value in range(first, first + count)]
+
+    def _insert(self, cursor: Any, batch: list[tuple[str | None, list[str], list[str]]]) -> int:
+        """Insert a batch of invoices, their numbers and changes, in one transaction.
+
+        The archives of the batch are attached beforehand: SQLite cannot attach a
+        database within a transaction.
+        """
+        if not batch:
+            return 0
+        for period in {period for period, _, _ in batch if period is not None}:
+            self._attach(cursor, period)
+        recorded_at = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")
+        inserted = 0
+        cursor.execute("BEGIN")
+        for period, ids, numbers in batch:
+            if period is None:
+                cursor.executemany("INSERT INTO invoices (id) VALUES (?)", zip(ids))
+            else:
+                self._insert_archived(cursor, period, ids)
+            cursor.executemany(
+                "INSERT INTO invoice_changes (invoice_id, operation, recorded_at) "
+                "VALUES (?, ?, ?)",
+                [(invoice_id, InvoiceOperation.CREATED.value, recorded_at) for invoice_id in ids],
+            )
+            cursor.executemany(
+                "INSERT INTO invoice_numbers (number, invoice_id) VALUES (?, ?)",
+                zip(numbers, ids),
+            )
+            inserted += len(ids)
+        if self._prefix is not None:
+            cursor.executemany(
+                "INSERT INTO invoice_sequences (prefix, year, next_value) VALUES (?, ?, ?) "
+                "ON CONFLICT (prefix, year) DO UPDATE SET next_value = excluded.next_value",
+                [(self._prefix, year, value) for year, value in self._next_values.items()],
+            )
+        cursor.execute("COMMIT")
+        return inserted
+
+    def _attach(self, cursor: Any, period: str):
+        """Attach the archive database of a period, creating its table if needed."""
+        table = archive_table(period)
+        cursor.execute("SELECT name FROM pragma_database_list WHERE name = ?", (table.schema,))
+        if cursor.fetchone() is None:
+            path = archive_path(self._archive_directory, period)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            cursor.execute(f'ATTACH DATABASE ? AS "{table.schema}"', (str(path),))
+            ddl = CreateTable(table, if_not_exists=True).compile(dialect=sqlite.dialect())
+            cursor.execute(str(ddl))
+
+    def _insert_archived(self, cursor: Any, period: str, ids: list[str]):
+        """Insert ids of a period into its archive, and register them."""
+        table = archive_table(period)
+        cursor.executemany(f'INSERT INTO "{table.schema}".invoices (id) VALUES (?)', zip(ids))
+        cursor.execute(
+            "INSERT INTO invoice_archives (period, path, lower_id, upper_id, count) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (period) DO UPDATE SET "
+            "lower_id = min(lower_id, excluded.lower_id), "
+            "upper_id = max(upper_id, excluded.upper_id), "
+            "count = count + excluded.count",
+            (
+                period,
+                str(archive_path(self._archive_directory, period)),
+                min(ids),
+                max(ids),
+                len(ids),
+            ),
+        )
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import heapq
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable
+from typing import Iterator
+from uuid import UUID
+
+from invoices.domain.models.invoice_change import InvoiceOperation
+from invoices.domain.storages.interface import InvoiceStorage
+
+MAGIC = b"INVSNAP1"
+HEADER = struct.Struct(">8sQQ8x")  # magic, last change seq, number of ids, padding
+RECORD_SIZE = 16
+PAGE_SIZE = 10_000
+
+
+class SnapshotRecords:
+    """Read-only view over the sorted ids of one mapping of the snapshot file."""
+
+    def __init__(self, buffer: mmap.mmap):
+        _, self.last_seq, count = HEADER.unpack_from(buffer)
+        # an append grows the file before updating the header, never the other way
+        self.count = min(count, (len(buffer) - HEADER.size) // RECORD_SIZE)
+        start = HEADER.size
+        self._ids = memoryview(buffer)[start:]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = index * RECORD_SIZE
+        end = start + RECORD_SIZE
+        return bytes(self._ids[start:end])
+
+    def __iter__(self) -> Iterator[bytes]:
+        return (self[index] for index in range(self.count))
+
+    def bisect(self, invoice_id: UUID) -> int:
+        """Index of the first id not lower than the given one (a binary search)."""
+        return bisect_left(self, invoice_id.bytes, hi=self.count)
+
+    def contains(self, invoice_id: UUID) -> bool:
+        """Whether the given id is in the snapshot."""
+        index = self.bisect(invoice_id)
+        return index < self.count and self[index] == invoice_id.bytes
+
+    def slice(self, start: int, end: int) -> memoryview:
+        """The ids between two indexes, without copying them."""
+        first = start * RECORD_SIZE
+        last = max(start, min(end, self.count)) * RECORD_SIZE
+        return self._ids[first:last]
+
+
+class InvoiceSnapshot:
+    """Memory-mapped file of the sorted 16-byte ids of every invoice.
+
+    The file holds a header (the last change feed entry applied and the number of ids)
+    followed by the ids, sorted. Every worker maps it read-only, so the processes share
+    its pages. The process refreshing it holds a lock: it appends the new trailing ids
+    in place, updating the header last, and rewrites the whole file, then atomically
+    replaced, when ids are removed or land in the middle.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._map: mmap.mmap | None = None
+        self._stat: tuple[int, int] | None = None
+        self._refreshed_at: float | None = None
+
+    def is_stale(self, max_age: float) -> bool:
+        """Whether this worker last refreshed the snapshot more than `max_age` seconds ago."""
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at > max_age
+
+    def invalidate(self):
+        """Have the next read refresh the snapshot first (after a write of this worker)."""
+        self._refreshed_at = None
+
+    def records(self) -> SnapshotRecords | None:
+        """The ids of the current snapshot file, `None` if it was not built yet."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        if (stat.st_ino, stat.st_size) != self._stat:
+            with open(self.path, "rb") as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._stat = (stat.st_ino, stat.st_size)
+        assert self._map is not None
+        return SnapshotRecords(self._map)
+
+    async def refresh(self, storage: InvoiceStorage) -> bool:
+        """Bring the snapshot up to date with the change feed of the storage.
+
+        Returns `False`, without waiting, if another process is already refreshing it.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "wb") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            try:
+                await self._refresh(storage)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        self._refreshed_at = time.monotonic()
+        return True
+
+    async def _refresh(self, storage: InvoiceStorage):
+        """Apply the change feed entries the snapshot misses, or rebuild it."""
+        records = self.records()
+        if records is None:
+            await self._rebuild(storage)
+            return
+
+        operations: dict[UUID, InvoiceOperation] = {}
+        last_seq = records.last_seq
+        while changes := await storage.fetch_changes(last_seq, PAGE_SIZE):
+            if changes[0].seq != last_seq + 1:  # compacted away: changes may be missing
+                await self._rebuild(storage)
+                return
+            operations.update((change.invoice_id, change.operation) for change in changes)
+            last_seq = changes[-1].seq
+        if last_seq == records.last_seq:
+            if await storage.last_change_seq() > last_seq:  # all of them compacted away
+                await self._rebuild(storage)
+            return
+
+        created = sorted(
+            invoice_id.bytes
+            for invoice_id, operation in operations.items()
+            if operation is InvoiceOperation.CREATED and not records.contains(invoice_id)
+        )
+        deleted = {
+            invoice_id.bytes
+            for invoice_id, operation in operations.items()
+            if operation is InvoiceOperation.DELETED
+        }
+        trailing = not created or not records or created[0] > records[len(records) - 1]
+        if not deleted and trailing:
+            await asyncio.to_thread(self._append, created, last_seq)
+        else:
+            kept = (record for record in records if record not in deleted)
+            await asyncio.to_thread(self._write, heapq.merge(kept, created), last_seq)
+
+    async def _rebuild(self, storage: InvoiceStorage):
+        """Write the snapshot from scratch, reading the ids page after page (keyset)."""
+        last_seq = await storage.last_change_seq()
+        records: list[bytes] = []
+        lower_id = None
+        while page := await storage.fetch_all(limit=PAGE_SIZE, lower_id=lower_id):
+            records.extend(invoice.id.bytes for invoice in page)
+            lower_id = UUID(int=page[-1].id.int + 1)
+        # the changes made while reading are applied again, idempotently, on refresh
+        await asyncio.to_thread(self._write, records, last_seq)
+
+    def _append(self, created: list[bytes], last_seq: int):
+        """Append ids sorting after all the others in place, then update the header."""
+        with open(self.path, "r+b") as file:
+            _, _, count = HEADER.unpack(file.read(HEADER.size))
+            file.seek(HEADER.size + count * RECORD_SIZE)
+            file.write(b"".join(created))
+            file.flush()
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, last_seq, count + len(created)))
+
+    def _write(self, records: Iterable[bytes], last_seq: int):
+        """Write a whole new snapshot and atomically replace the current one."""
+        temporary = self.path.with_suffix(".tmp")
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, last_seq, 0))
+            count = 0
+            for record in records:
+                file.write(record)
+                count += 1
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, last_seq, count))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
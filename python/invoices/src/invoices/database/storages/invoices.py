@@ -1,34 +1,352 @@
+from datetime import UTC
+from datetime import datetime
+from functools import partial
+from typing import Sequence
+from uuid import UUID
+
 from injector import inject
+from sqlalchemy import Row
+from sqlalchemy import Select
+from sqlalchemy import Table
 from sqlalchemy import delete
+from sqlalchemy import func
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from invoices.database.archives import attach
+from invoices.database.archives import delete_archived
+from invoices.database.archives import find_archive
+from invoices.database.archives import registered_archives
+from invoices.database.tables.invoice_changes import invoice_changes
+from invoices.database.tables.invoice_numbers import invoice_numbers
+from invoices.database.tables.invoice_sequences import invoice_sequences
 from invoices.database.tables.invoices import invoices
+from invoices.database.writer import DatabaseWriter
 from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_change import InvoiceChange
+from invoices.domain.models.invoice_change import InvoiceOperation
+from invoices.domain.models.invoice_sequence import InvoiceSequence
 from invoices.domain.storages.interface import InvoiceStorage
 
+# bound parameters per `IN (...)` query, under SQLITE_MAX_VARIABLE_NUMBER (999 before 3.32)
+IN_CHUNK_SIZE = 500
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """SQLite has no time zones: timestamps are stored as naive UTC."""
+    return moment.astimezone(UTC).replace(tzinfo=None)
+
+
+async def _record(connection: AsyncConnection, invoice: Invoice, operation: InvoiceOperation):
+    """Appends an entry to the change feed, in the transaction of the write itself."""
+    stmt = insert(invoice_changes).values(
+        invoice_id=invoice.id,
+        operation=operation.value,
+        recorded_at=_naive_utc(datetime.now(UTC)),
+    )
+    await connection.execute(stmt)
+
+
+async def _allocate_numbers(
+    connection: AsyncConnection, sequence: InvoiceSequence, count: int
+) -> int:
+    """Reserves the next values of a sequence with a single upsert of its counter row."""
+    stmt = sqlite_insert(invoice_sequences).values(
+        prefix=sequence.prefix, year=sequence.year, next_value=1 + count
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[invoice_sequences.c.prefix, invoice_sequences.c.year],
+        set_={"next_value": invoice_sequences.c.next_value + count},
+    ).returning(invoice_sequences.c.next_value)
+    result = await connection.execute(stmt)
+    return result.scalar_one() - count
+
+
+async def _insert(
+    connection: AsyncConnection, invoice: Invoice, sequence: InvoiceSequence | None = None
+) -> str | None:
+    """Inserts a new invoice using the given connection, numbering it from `sequence`.
+
+    Returns the number of the inserted invoice: the caller assigns it once the insert
+    succeeded, a failed one leaving the invoice unnumbered.
+    """
+    number = invoice.number
+    if sequence is not None:
+        number = sequence.format(await _allocate_numbers(connection, sequence, 1))
+    stmt = insert(invoices).values(id=invoice.id)
+    await connection.execute(stmt)
+    if number is not None:
+        stmt = insert(invoice_numbers).values(number=number, invoice_id=invoice.id)
+        await connection.execute(stmt)
+    await _record(connection, invoice, InvoiceOperation.CREATED)
+    return number
+
+
+async def _delete(connection: AsyncConnection, invoice: Invoice) -> bool:
+    """Deletes an invoice using the given connection, returning whether it existed."""
+    stmt = delete(invoices).where(invoices.c.id == invoice.id)
+    result = await connection.execute(stmt)
+    if result.rowcount == 0 and not await delete_archived(connection, invoice.id):
+        return False
+    await _record(connection, invoice, InvoiceOperation.DELETED)
+    return True
+
+
+async def _compact_changes(connection: AsyncConnection, before: datetime) -> int:
+    """Deletes the change feed entries recorded before the given moment."""
+    stmt = delete(invoice_changes).where(invoice_changes.c.recorded_at < _naive_utc(before))
+    result = await connection.execute(stmt)
+    return result.rowcount
+
+
+def _in_range(table: Table, lower_id: UUID | None, upper_id: UUID | None) -> list:
+    """Conditions keeping the ids of a table within `[lower_id, upper_id)`."""
+    conditions = []
+    if lower_id is not None:
+        conditions.append(table.c.id >= lower_id)
+    if upper_id is not None:
+        conditions.append(table.c.id < upper_id)
+    return conditions
+
+
+def _select_invoices(table: Table) -> Select:
+    """Selects the invoices of the main table or of an archive, with their legal number.
+
+    Numbers stay in the main database when invoices are archived.
+    """
+    numbered = table.outerjoin(invoice_numbers, invoice_numbers.c.invoice_id == table.c.id)
+    return select(table.c.id, invoice_numbers.c.number).select_from(numbered)
+
+
+def _invoice(row: Row) -> Invoice:
+    """Builds an invoice from a row of `_select_invoices`."""
+    return Invoice(id_=row.id, number=row.number)
+
+
+async def _fetch_page(
+    connection: AsyncConnection,
+    table: Table,
+    limit: int,
+    offset: int,
+    lower_id: UUID | None = None,
+    upper_id: UUID | None = None,
+) -> list[Invoice]:
+    """Fetches a page of the invoices of the main table or of an archive (a PK range seek)."""
+    stmt = (
+        _select_invoices(table)
+        .where(*_in_range(table, lower_id, upper_id))
+        .order_by(table.c.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await connection.execute(stmt)
+    return [_invoice(row) for row in result]
+
+
+async def _fetch_existing(
+    connection: AsyncConnection, table: Table, invoice_ids: Sequence[UUID]
+) -> list[Invoice]:
+    """Fetches the invoices of the given ids a table holds, one `IN (...)` query per chunk."""
+    existing: list[Invoice] = []
+    for start in range(0, len(invoice_ids), IN_CHUNK_SIZE):
+        end = start + IN_CHUNK_SIZE
+        stmt = _select_invoices(table).where(table.c.id.in_(invoice_ids[start:end]))
+        result = await connection.execute(stmt)
+        existing += (_invoice(row) for row in result)
+    return existing
+
+
+async def _count_ids(
+    connection: AsyncConnection, table: Table, lower_id: UUID | None, upper_id: UUID | None
+) -> int:
+    """Counts the invoice ids of an archive within the given range."""
+    stmt = select(func.count()).select_from(table).where(*_in_range(table, lower_id, upper_id))
+    result = await connection.execute(stmt)
+    return result.scalar_one()
+
 
 class DatabaseInvoiceStorage(InvoiceStorage):
-    """Postgres implementation of the InvoiceStorage interface."""
+    """Postgres implementation of the InvoiceStorage interface.
+
+    Invoices moved to the archives are read transparently: the registry tells which
+    archives hold the requested invoices, and only those get attached.
+    """
 
     @inject
     def __init__(self, connection: AsyncConnection):
         self._connection = connection
 
-    async def insert(self, invoice: Invoice) -> None:
+    async def insert(self, invoice: Invoice, sequence: InvoiceSequence | None = None) -> None:
         """Inserts a new invoice into the database."""
-        stmt = insert(invoices).values(id=invoice.id)
-        await self._connection.execute(stmt)
+        invoice.number = await _insert(self._connection, invoice, sequence)
 
-    async def fetch_all(self, limit: int = 100, offset: int = 0) -> list[Invoice]:
-        """Fetches a paginated list of invoices, ordered by ID (chronological via uuid7)."""
-        stmt = select(invoices).limit(limit).offset(offset).order_by(invoices.c.id)
-        result = await self._connection.execute(stmt)
-        rows = result.fetchall()
-        return [Invoice(id_=row.id) for row in rows]
+    async def allocate_numbers(self, sequence: InvoiceSequence, count: int) -> int:
+        """Reserves the next `count` values of a sequence, returning the first one."""
+        return await _allocate_numbers(self._connection, sequence, count)
+
+    async def fetch_by(self, invoice_id: UUID) -> Invoice | None:
+        """Fetches one invoice by its ID."""
+        stmt = _select_invoices(invoices).where(invoices.c.id == invoice_id)
+        row = (await self._connection.execute(stmt)).fetchone()
+        if row is None and (archive := await find_archive(self._connection, invoice_id)):
+            table = await attach(self._connection, archive.period, archive.path)
+            stmt = _select_invoices(table).where(table.c.id == invoice_id)
+            row = (await self._connection.execute(stmt)).fetchone()
+        return _invoice(row) if row else None
+
+    async def fetch_many(self, invoice_ids: Sequence[UUID]) -> list[Invoice]:
+        """Fetches the invoices of the given IDs that exist, in chunked `IN (...)` queries.
+
+        The ids missing from the main table are looked up in the archives whose bounds
+        contain them, the others are not attached.
+        """
+        ids = list(dict.fromkeys(invoice_ids))
+        found = {
+            invoice.id: invoice
+            for invoice in await _fetch_existing(self._connection, invoices, ids)
+        }
+        missing = [invoice_id for invoice_id in ids if invoice_id not in found]
+        if missing:
+            for archive in await registered_archives(self._connection):
+                within = [id_ for id_ in missing if archive.lower_id <= id_ <= archive.upper_id]
+                if within:
+                    table = await attach(self._connection, archive.period, archive.path)
+                    archived = await _fetch_existing(self._connection, table, within)
+                    found.update((invoice.id, invoice) for invoice in archived)
+        return [found[invoice_id] for invoice_id in ids if invoice_id in found]
+
+    async def fetch_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        lower_id: UUID | None = None,
+        upper_id: UUID | None = None,
+    ) -> list[Invoice]:
+        """Fetches a paginated list of invoices, ordered by ID (chronological via uuid7).
+
+        Archives hold the oldest invoices: their registered bounds and counts tell which
+        ones the page overlaps, the others are skipped without being attached.
+        """
+        page: list[Invoice] = []
+        for archive in await registered_archives(self._connection):
+            if len(page) == limit:
+                break
+            if (lower_id is not None and archive.upper_id < lower_id) or (
+                upper_id is not None and archive.lower_id >= upper_id
+            ):
+                continue
+            within = (lower_id is None or lower_id <= archive.lower_id) and (
+                upper_id is None or archive.upper_id < upper_id
+            )
+            if within and offset >= archive.count:
+                offset -= archive.count
+                continue
 
-    async def delete(self, invoice: Invoice) -> None:
+            table = await attach(self._connection, archive.period, archive.path)
+            archived = await _fetch_page(
+                self._connection, table, limit - len(page), offset, lower_id, upper_id
+            )
+            if archived:
+                page += archived
+                offset = 0
+            else:
+                offset -= await _count_ids(self._connection, table, lower_id, upper_id)
+
+        if len(page) < limit:
+            page += await _fetch_page(
+                self._connection, invoices, limit - len(page), offset, lower_id, upper_id
+            )
+        return page
+
+    async def fetch_timestamps(self, lower_id: UUID | None = None) -> bytes:
+        """Fetches the packed creation timestamps of the invoices from `lower_id` on.
+
+        SQLite stores the ids as 32 hex digits: the timestamps are their first 12, which
+        are concatenated by the database and decoded at once, without any per-row object.
+        """
+        tables = [invoices]
+        for archive in await registered_archives(self._connection):
+            if lower_id is None or archive.upper_id >= lower_id:
+                tables.append(await attach(self._connection, archive.period, archive.path))
+
+        buffers = []
+        for table in tables:
+            digits = func.group_concat(func.substr(table.c.id, 1, 12), "")
+            stmt = select(digits).where(*_in_range(table, lower_id, None))
+            result = await self._connection.execute(stmt)
+            if hexadecimal := result.scalar_one():
+                buffers.append(bytes.fromhex(hexadecimal))
+        return b"".join(buffers)
+
+    async def delete(self, invoice: Invoice) -> bool:
         """Deletes an invoice by its ID."""
-        stmt = delete(invoices).where(invoices.c.id == invoice.id)
-        await self._connection.execute(stmt)
+        return await _delete(self._connection, invoice)
+
+    async def fetch_changes(self, since: int = 0, limit: int = 100) -> list[InvoiceChange]:
+        """Fetches the change feed entries following the given sequence number (a PK seek)."""
+        stmt = (
+            select(invoice_changes)
+            .where(invoice_changes.c.seq > since)
+            .order_by(invoice_changes.c.seq)
+            .limit(limit)
+        )
+        result = await self._connection.execute(stmt)
+        return [
+            InvoiceChange(
+                seq=row.seq,
+                invoice_id=row.invoice_id,
+                operation=InvoiceOperation(row.operation),
+                recorded_at=row.recorded_at.replace(tzinfo=UTC),
+            )
+            for row in result.fetchall()
+        ]
+
+    async def last_change_seq(self) -> int:
+        """Returns the sequence number of the latest change feed entry, 0 if none."""
+        stmt = select(func.max(invoice_changes.c.seq))
+        result = await self._connection.execute(stmt)
+        return result.scalar_one() or 0
+
+    async def compact_changes(self, before: datetime) -> int:
+        """Deletes the change feed entries recorded before the given moment."""
+        return await _compact_changes(self._connection, before)
+
+
+class WriterInvoiceStorage(DatabaseInvoiceStorage):
+    """Database storage whose writes go through the group-commit writer.
+
+    Reads still use the request's connection; each write is one writer operation, so
+    it is applied and committed atomically along with the rest of its batch.
+    """
+
+    @inject
+    def __init__(self, connection: AsyncConnection, writer: DatabaseWriter):
+        super().__init__(connection)
+        self._writer = writer
+
+    async def insert(self, invoice: Invoice, sequence: InvoiceSequence | None = None) -> None:
+        """Inserts a new invoice through the writer.
+
+        A strict number is taken within the writer operation: all the inserts of a batch
+        update the counter row in the batch's single transaction, and the savepoint of a
+        failing insert rolls its number back. The invoice is numbered once committed.
+        """
+        invoice.number = await self._writer.submit(
+            partial(_insert, invoice=invoice, sequence=sequence)
+        )
+
+    async def allocate_numbers(self, sequence: InvoiceSequence, count: int) -> int:
+        """Reserves a block of values of a sequence through the writer."""
+        return await self._writer.submit(
+            partial(_allocate_numbers, sequence=sequence, count=count)
+        )
+
+    async def delete(self, invoice: Invoice) -> bool:
+        """Deletes an invoice through the writer."""
+        return await self._writer.submit(partial(_delete, invoice=invoice))
+
+    async def compact_changes(self, before: datetime) -> int:
+        """Compacts the change feed through the writer."""
+        return await self._writer.submit(partial(_compact_changes, before=before))
@@ -0,0 +1,104 @@
+import struct
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+import numpy as np
+
+from invoices.database.snapshot import RECORD_SIZE
+from invoices.database.snapshot import InvoiceSnapshot
+from invoices.database.snapshot import SnapshotRecords
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_change import InvoiceChange
+from invoices.domain.models.invoice_sequence import InvoiceSequence
+from invoices.domain.storages.interface import InvoiceStorage
+
+TIMESTAMP_SIZE = 6
+
+
+class SnapshotInvoiceStorage(InvoiceStorage):
+    """Invoice storage listing the ids from the memory-mapped snapshot, not the database.
+
+    Listings and range filters are binary searches over the snapshot, so the offset of a
+    page costs nothing; the invoices of the page are then looked up by ID in the wrapped
+    storage. The snapshot is refreshed from the change feed of the wrapped storage once
+    older than `max_age` seconds (or after a write of this worker): pages may miss the
+    invoices created since. Everything else goes to the wrapped storage.
+    """
+
+    def __init__(self, inner: InvoiceStorage, snapshot: InvoiceSnapshot, max_age: float):
+        self.inner = inner
+        self.snapshot = snapshot
+        self.max_age = max_age
+
+    async def _records(self) -> SnapshotRecords | None:
+        """The ids of the snapshot, refreshed first if it is stale."""
+        if self.snapshot.is_stale(self.max_age):
+            await self.snapshot.refresh(self.inner)
+        return self.snapshot.records()
+
+    async def insert(self, invoice: Invoice, sequence: InvoiceSequence | None = None) -> None:
+        """Inserts a new invoice, then has the snapshot refreshed on the next read."""
+        await self.inner.insert(invoice, sequence)
+        self.snapshot.invalidate()
+
+    async def allocate_numbers(self, sequence: InvoiceSequence, count: int) -> int:
+        """Reserves the next `count` values of a sequence, returning the first one."""
+        return await self.inner.allocate_numbers(sequence, count)
+
+    async def fetch_by(self, invoice_id: UUID) -> Invoice | None:
+        """Fetches one invoice by its ID."""
+        return await self.inner.fetch_by(invoice_id)
+
+    async def fetch_many(self, invoice_ids: Sequence[UUID]) -> list[Invoice]:
+        """Fetches the invoices of the given IDs that exist."""
+        return await self.inner.fetch_many(invoice_ids)
+
+    async def fetch_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        lower_id: UUID | None = None,
+        upper_id: UUID | None = None,
+    ) -> list[Invoice]:
+        """Fetches a paginated list of invoices, bisecting the snapshot for the bounds."""
+        records = await self._records()
+        if records is None:
+            return await self.inner.fetch_all(limit, offset, lower_id, upper_id)
+
+        start = records.bisect(lower_id) if lower_id is not None else 0
+        end = records.bisect(upper_id) if upper_id is not None else len(records)
+        start += offset
+        ids = records.slice(start, min(start + limit, end))
+        page = [UUID(bytes=value) for (value,) in struct.iter_unpack("16s", ids)]
+        # the details (legal numbers) of a page are PK lookups, whatever its offset
+        found = {invoice.id: invoice for invoice in await self.inner.fetch_many(page)}
+        return [found[invoice_id] for invoice_id in page if invoice_id in found]
+
+    async def fetch_timestamps(self, lower_id: UUID | None = None) -> bytes:
+        """Fetches the packed creation timestamps of the invoices, sliced out of the snapshot."""
+        records = await self._records()
+        if records is None:
+            return await self.inner.fetch_timestamps(lower_id)
+
+        start = records.bisect(lower_id) if lower_id is not None else 0
+        ids = np.frombuffer(records.slice(start, len(records)), dtype=np.uint8)
+        return ids.reshape(-1, RECORD_SIZE)[:, :TIMESTAMP_SIZE].tobytes()
+
+    async def delete(self, invoice: Invoice) -> bool:
+        """Deletes an invoice, then has the snapshot refreshed on the next read."""
+        deleted = await self.inner.delete(invoice)
+        self.snapshot.invalidate()
+        return deleted
+
+    async def fetch_changes(self, since: int = 0, limit: int = 100) -> list[InvoiceChange]:
+        """Fetches the change feed entries following the given sequence number."""
+        return await self.inner.fetch_changes(since, limit)
+
+    async def last_change_seq(self) -> int:
+        """Returns the sequence number of the latest change feed entry, 0 if none."""
+        return await self.inner.last_change_seq()
+
+    async def compact_changes(self, before: datetime) -> int:
+        """Deletes the change feed entries recorded before the given moment."""
+        return await self.inner.compact_changes(before)
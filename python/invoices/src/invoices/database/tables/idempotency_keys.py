@@ -0,0 +1,22 @@
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Integer
+from sqlalchemy import LargeBinary
+from sqlalchemy import String
+from sqlalchemy import Table
+
+from invoices.database.core import metadata
+
+idempotency_keys = Table(
+    "idempotency_keys",
+    metadata,
+    # the client the key belongs to: a hash of its API key, or its IP address
+    Column("scope", String(255), primary_key=True),
+    Column("key", String(255), primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    # NULL while the first request with the key is in flight
+    Column("status_code", Integer, nullable=True),
+    Column("media_type", String(255), nullable=True),
+    Column("body", LargeBinary, nullable=True),
+    Column("expires_at", DateTime, nullable=False, index=True),
+)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import Table
+from sqlalchemy.types import UUID
+
+from invoices.database.core import metadata
+
+invoice_archives = Table(
+    "invoice_archives",
+    metadata,
+    Column("period", String(7), primary_key=True),
+    Column("path", String, nullable=False),
+    Column("lower_id", UUID(as_uuid=True), nullable=False),
+    Column("upper_id", UUID(as_uuid=True), nullable=False),
+    Column("count", Integer, nullable=False),
+)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import Table
+from sqlalchemy.types import UUID
+
+from invoices.database.core import metadata
+
+invoice_changes = Table(
+    "invoice_changes",
+    metadata,
+    Column("seq", Integer, primary_key=True),
+    Column("invoice_id", UUID(as_uuid=True), nullable=False),
+    Column("operation", String(16), nullable=False),
+    Column("recorded_at", DateTime, nullable=False, index=True),
+    # never hand out the sequence numbers of compacted entries again
+    sqlite_autoincrement=True,
+)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column
+from sqlalchemy import String
+from sqlalchemy import Table
+from sqlalchemy.types import UUID
+
+from invoices.database.core import metadata
+
+invoice_numbers = Table(
+    "invoice_numbers",
+    metadata,
+    Column("number", String(32), primary_key=True),
+    Column("invoice_id", UUID(as_uuid=True), nullable=False, unique=True),
+)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import Table
+
+from invoices.database.core import metadata
+
+invoice_sequences = Table(
+    "invoice_sequences",
+    metadata,
+    Column("prefix", String(16), primary_key=True),
+    Column("year", Integer, primary_key=True),
+    Column("next_value", Integer, nullable=False),
+)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from invoices.core.config import WriterConfig
+
+T = TypeVar("T")
+Operation = Callable[[AsyncConnection], Awaitable[T]]
+Connect = Callable[[], AbstractAsyncContextManager[AsyncConnection]]
+
+_STOP = object()
+
+
+class DatabaseWriter:
+    """Single task applying the write operations and committing them in batches.
+
+    Callers submit storage operations (coroutine functions taking a connection); the
+    writer applies every operation queued within a short window in one transaction,
+    each under its own savepoint so that a failing operation does not abort the others,
+    and resolves the callers once the shared commit (and its fsync) is done.
+    """
+
+    def __init__(self, connect: Connect, config: WriterConfig):
+        self._connect = connect
+        self._config = config
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the writer task is running in the current event loop."""
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._task.get_loop() is asyncio.get_running_loop()
+        )
+
+    async def start(self):
+        """Start the writer task, if it is not already running."""
+        if not self.running:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run(), name="database-writer")
+
+    async def stop(self):
+        """Apply the pending operations, then stop the writer task."""
+        if self.running:
+            await self._queue.put(_STOP)
+            await self._task  # type: ignore[misc]
+        self._task = None
+
+    async def submit(self, operation: Operation[T]) -> T:
+        """Queue an operation and wait until it has been committed."""
+        await self.start()
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    async def _run(self):
+        """Drain the queue batch after batch, until asked to stop."""
+        try:
+            stopping = False
+            while not stopping:
+                batch, stopping = await self._next_batch()
+                if not batch:
+                    continue
+                # one checkout per batch: per-connection state (attached archives)
+                # is released between batches
+                async with self._connect() as connection:
+                    connection = await connection.execution_options(sqlite_immediate=True)
+                    await self._apply(connection, batch)
+        finally:
+            for _, future in self._drain():
+                if not future.done():
+                    future.set_exception(RuntimeError("Database writer stopped"))
+
+    async def _next_batch(self) -> tuple[list[tuple[Operation, asyncio.Future]], bool]:
+        """Wait for an operation, then gather the ones queued within the batch window."""
+        loop = asyncio.get_running_loop()
+        batch: list[tuple[Operation, asyncio.Future]] = []
+        deadline = None
+
+        while len(batch) < self._config.max_batch_size:
+            if deadline is None:
+                item = await self._queue.get()
+                deadline = loop.time() + self._config.max_batch_delay
+            elif not self._queue.empty():
+                item = self._queue.get_nowait()
+            elif (remaining := deadline - loop.time()) > 0:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+            else:
+                break
+
+            if item is _STOP:
+                return batch + self._drain(), True
+            batch.append(item)
+
+        return batch, False
+
+    def _drain(self) -> list[tuple[Operation, asyncio.Future]]:
+        """Take every operation left in the queue."""
+        items = []
+        while not self._queue.empty():
+            if (item := self._queue.get_nowait()) is not _STOP:
+                items.append(item)
+        return items
+
+    @staticmethod
+    async def _apply(connection: AsyncConnection, batch: list[tuple[Operation, asyncio.Future]]):
+        """Apply a batch in a single transaction and resolve its callers after commit."""
+        outcomes: list[tuple[asyncio.Future, Any, BaseException | None]] = []
+        try:
+            async with connection.begin():
+                for operation, future in batch:
+                    if future.done():  # caller went away
+                        continue
+                    try:
+                        async with connection.begin_nested():
+                            outcomes.append((future, await operation(connection), None))
+                    except Exception as exc:  # pylint: disable=broad-exception-caught
+                        outcomes.append((future, None, exc))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # the transaction failed to begin or to commit: nothing of this batch was
+            # persisted, and every caller still waiting fails
+            outcomes = [(future, None, exc) for _, future in batch]
+
+        for future, result, exc in outcomes:
+            if future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
@@ -9,9 +9,12 @@ class Invoice:
     """Represents an invoice of the system."""
 
     id: UUID
+    number: str | None
 
     def __init__(
         self,
         id_: UUID | None = None,
+        number: str | None = None,
     ):
         self.id = id_ or uuid7()
+        self.number = number
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+
+class InvoiceOperation(Enum):
+    """Operations recorded in the invoice change feed."""
+
+    CREATED = "created"
+    DELETED = "deleted"
+
+
+@dataclass(frozen=True)
+class InvoiceChange:
+    """Represents one entry of the invoice change feed.
+
+    Sequence numbers are strictly increasing and never reused, so a consumer can resume
+    the feed from the last sequence number it has seen.
+    """
+
+    seq: int
+    invoice_id: UUID
+    operation: InvoiceOperation
+    recorded_at: datetime
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class InvoiceDocument:
+    """Represents the printable document of an invoice.
+
+    Its key is the hash of what the document is rendered from: it changes along with
+    the invoice or the template, and nothing else.
+    """
+
+    key: str
+    content: bytes
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class InvoiceSequence:
+    """Sequence of the legal numbers of the invoices created within a year, per prefix."""
+
+    prefix: str
+    year: int
+
+    def format(self, value: int) -> str:
+        """The legal number of a value of the sequence.
+
+        Examples:
+            >>> InvoiceSequence(prefix="OT", year=2026).format(1)
+            'OT26000001'
+        """
+        return f"{self.prefix}{self.year % 100:02d}{value:06d}"
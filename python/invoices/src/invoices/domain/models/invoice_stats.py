@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+
+class StatsBucket(Enum):
+    """Time buckets invoices can be counted by, with their NumPy datetime unit."""
+
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+
+    @property
+    def unit(self) -> str:
+        """The `datetime64` unit of the bucket."""
+        return {"hour": "h", "day": "D", "month": "M"}[self.value]
+
+
+@dataclass(frozen=True)
+class BucketCount:
+    """Number of invoices created within a time bucket."""
+
+    start: datetime
+    count: int
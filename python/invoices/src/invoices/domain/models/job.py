@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+
+class JobStatus(StrEnum):
+    """Lifecycle of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Job:
+    """Represents a unit of background work, run by the job workers.
+
+    `attempts` counts the runs started so far, the job failing for good once a run
+    fails with `max_attempts` reached.
+    """
+
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    priority: int
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    result: Any
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from injector import inject
+
+from invoices.domain.storages.interface import InvoiceStorage
+
+
+@dataclass(frozen=True)
+class CompactInvoiceChanges:
+    """The compact invoice changes command payload."""
+
+    retention: timedelta
+
+
+class CompactInvoiceChangesHandler:
+    """The compact invoice changes command handler."""
+
+    invoices: InvoiceStorage
+
+    @inject
+    def __init__(self, invoices: InvoiceStorage):
+        self.invoices = invoices
+
+    async def handle(self, command: CompactInvoiceChanges) -> int:
+        """Handles the compact invoice changes command, returning the number of entries removed."""
+        return await self.invoices.compact_changes(before=datetime.now(UTC) - command.retention)
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+from injector import inject
+
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.services.numbering import InvoiceNumbering
+from invoices.domain.storages.interface import InvoiceStorage
+
+
+@dataclass(frozen=True)
+class CreateInvoice:
+    """The create invoice command payload."""
+
+
+class CreateInvoiceHandler:
+    """The create invoice command handler."""
+
+    invoices: InvoiceStorage
+    numbering: InvoiceNumbering
+
+    @inject
+    def __init__(self, invoices: InvoiceStorage, numbering: InvoiceNumbering):
+        self.invoices = invoices
+        self.numbering = numbering
+
+    async def handle(self, command: CreateInvoice) -> Invoice:  # pylint: disable=unused-argument
+        """Handles the create invoice command, giving the invoice its legal number."""
+        invoice = Invoice()
+        await self.numbering.insert(self.invoices, invoice)
+        return invoice
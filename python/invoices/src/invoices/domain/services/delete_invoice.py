@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from injector import inject
+
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.storages.interface import InvoiceStorage
+
+
+@dataclass(frozen=True)
+class DeleteInvoice:
+    """The delete invoice command payload."""
+
+    invoice_id: UUID
+
+
+class DeleteInvoiceHandler:
+    """The delete invoice command handler."""
+
+    invoices: InvoiceStorage
+
+    @inject
+    def __init__(self, invoices: InvoiceStorage):
+        self.invoices = invoices
+
+    async def handle(self, command: DeleteInvoice) -> Invoice | None:
+        """Handles the delete invoice command, returning `None` if there is no such invoice."""
+        invoice = Invoice(id_=command.invoice_id)
+        if not await self.invoices.delete(invoice):
+            return None
+        return invoice
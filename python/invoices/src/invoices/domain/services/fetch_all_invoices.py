@@ -1,7 +1,9 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 from injector import inject
 
+from invoices.core.uuid7 import uuid7_lower_bound
 from invoices.domain.models.invoice import Invoice
 from invoices.domain.storages.interface import InvoiceStorage
 
@@ -12,6 +14,8 @@ class FetchAllInvoices:
 
     limit: int
     offset: int
+    created_after: datetime | None = None
+    created_before: datetime | None = None
 
 
 class FetchAllInvoicesHandler:
@@ -24,6 +28,15 @@ class FetchAllInvoicesHandler:
         self.invoices = invoices
 
     async def handle(self, query: FetchAllInvoices) -> list[Invoice]:
-        """Handles the fetch all invoices query."""
-        invoices = await self.invoices.fetch_all(limit=query.limit, offset=query.offset)
+        """Handles the fetch all invoices query.
+
+        The creation time range, `created_after` included and `created_before` excluded,
+        becomes a range of ids: uuid7 ids start with their creation timestamp.
+        """
+        invoices = await self.invoices.fetch_all(
+            limit=query.limit,
+            offset=query.offset,
+            lower_id=uuid7_lower_bound(query.created_after) if query.created_after else None,
+            upper_id=uuid7_lower_bound(query.created_before) if query.created_before else None,
+        )
         return invoices
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+from injector import inject
+
+from invoices.domain.models.invoice_change import InvoiceChange
+from invoices.domain.storages.interface import InvoiceStorage
+
+
+@dataclass(frozen=True)
+class FetchInvoiceChanges:
+    """The fetch invoice changes query payload."""
+
+    since: int
+    limit: int
+
+
+class FetchInvoiceChangesHandler:
+    """The fetch invoice changes query handler."""
+
+    invoices: InvoiceStorage
+
+    @inject
+    def __init__(self, invoices: InvoiceStorage):
+        self.invoices = invoices
+
+    async def handle(self, query: FetchInvoiceChanges) -> list[InvoiceChange]:
+        """Handles the fetch invoice changes query."""
+        return await self.invoices.fetch_changes(since=query.since, limit=query.limit)
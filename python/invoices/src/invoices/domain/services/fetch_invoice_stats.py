@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+from injector import inject
+
+from invoices.core.uuid7 import EPOCH
+from invoices.core.uuid7 import uuid7_lower_bound
+from invoices.core.uuid7 import uuid7_timestamp
+from invoices.domain.models.invoice_stats import BucketCount
+from invoices.domain.models.invoice_stats import StatsBucket
+from invoices.domain.storages.interface import InvoiceStorage
+
+CHANGES_PAGE_SIZE = 1000
+
+
+def _milliseconds(moment: datetime) -> int:
+    """Milliseconds since the epoch of a moment."""
+    return (moment - EPOCH) // timedelta(milliseconds=1)
+
+
+def _bucket_start(milliseconds: np.ndarray, bucket: StatsBucket) -> np.ndarray:
+    """Start of the bucket of each timestamp, in milliseconds since the epoch."""
+    moments = milliseconds.astype("datetime64[ms]")
+    return moments.astype(f"datetime64[{bucket.unit}]").astype("datetime64[ms]").astype(np.int64)
+
+
+def count_by_bucket(timestamps: bytes, bucket: StatsBucket) -> dict[int, int]:
+    """Count packed 6-byte big-endian timestamps per bucket, in bulk.
+
+    Examples:
+        >>> packed = bytes.fromhex("019a3b0c4d00" "019a3b0c4d01" "019c000000ff")
+        >>> count_by_bucket(packed, StatsBucket.MONTH)
+        {1759276800000: 2, 1767225600000: 1}
+    """
+    packed = np.frombuffer(timestamps, dtype=np.uint8).reshape(-1, 6)
+    padded = np.zeros((len(packed), 8), dtype=np.uint8)
+    padded[:, 2:] = packed
+    milliseconds = padded.view(">u8").ravel().astype(np.int64)
+    starts, counts = np.unique(_bucket_start(milliseconds, bucket), return_counts=True)
+    return dict(zip(starts.tolist(), counts.tolist()))
+
+
+@dataclass
+class _ClosedBuckets:
+    """Counts of the buckets starting before `boundary`, as of the change `last_seq`."""
+
+    boundary: int
+    last_seq: int
+    counts: dict[int, int]
+
+
+class InvoiceStatsCache:
+    """Per-worker cache of the invoice counts of the closed buckets.
+
+    A closed bucket gets no new invoices (ids embed their creation time), so only the
+    open bucket is counted again on each call. The changes read from the change feed
+    invalidate the cached counts they affect: deletions, and the invoices created in a
+    closed bucket after it was counted (backfilled, e.g. by the database seed).
+    """
+
+    def __init__(self):
+        self._closed: dict[StatsBucket, _ClosedBuckets] = {}
+
+    async def count(
+        self, storage: InvoiceStorage, bucket: StatsBucket, now: datetime
+    ) -> list[BucketCount]:
+        """Count the invoices per bucket, as of the given moment."""
+        current = int(_bucket_start(np.array([_milliseconds(now)]), bucket)[0])
+        closed = self._closed.get(bucket)
+        if closed is not None and not await self._still_valid(storage, closed):
+            closed = None
+
+        # read before the scan: a deletion racing with it is seen on the next call
+        last_seq = await storage.last_change_seq()
+        lower_id = None
+        if closed is not None:
+            lower_id = uuid7_lower_bound(EPOCH + timedelta(milliseconds=closed.boundary))
+        fresh = count_by_bucket(await storage.fetch_timestamps(lower_id), bucket)
+
+        counts = dict(closed.counts) if closed else {}
+        counts.update((start, count) for start, count in fresh.items() if start < current)
+        self._closed[bucket] = _ClosedBuckets(current, last_seq, counts)
+
+        opened = {start: count for start, count in fresh.items() if start >= current}
+        return [
+            BucketCount(start=EPOCH + timedelta(milliseconds=start), count=count)
+            for start, count in sorted({**counts, **opened}.items())
+        ]
+
+    @staticmethod
+    async def _still_valid(storage: InvoiceStorage, closed: _ClosedBuckets) -> bool:
+        """Whether no invoice of the closed buckets changed since they were counted."""
+        since = closed.last_seq
+        while changes := await storage.fetch_changes(since, CHANGES_PAGE_SIZE):
+            if changes[0].seq != since + 1:  # compacted away: changes may be missing
+                return False
+            for change in changes:
+                if _milliseconds(uuid7_timestamp(change.invoice_id)) < closed.boundary:
+                    return False
+            since = changes[-1].seq
+        # an empty read may also mean that every entry since was compacted away
+        return since > closed.last_seq or await storage.last_change_seq() == since
+
+
+@dataclass(frozen=True)
+class FetchInvoiceStats:
+    """The fetch invoice stats query payload."""
+
+    bucket: StatsBucket
+
+
+class FetchInvoiceStatsHandler:
+    """The fetch invoice stats query handler."""
+
+    invoices: InvoiceStorage
+    cache: InvoiceStatsCache
+
+    @inject
+    def __init__(self, invoices: InvoiceStorage, cache: InvoiceStatsCache):
+        self.invoices = invoices
+        self.cache = cache
+
+    async def handle(self, query: FetchInvoiceStats) -> list[BucketCount]:
+        """Handles the fetch invoice stats query."""
+        return await self.cache.count(self.invoices, query.bucket, datetime.now(UTC))
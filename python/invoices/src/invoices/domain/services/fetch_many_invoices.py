@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from injector import inject
+
+from invoices.core.cache import LRUCache
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_change import InvoiceOperation
+from invoices.domain.storages.interface import InvoiceStorage
+
+CHANGES_PAGE_SIZE = 1000
+
+
+class InvoiceCache:
+    """Per-worker LRU cache of the invoices fetched by ID.
+
+    Invoices never change once created, only deletions make an entry stale: before each
+    lookup, the cache compares the last change feed entry (a single max-seq read) with
+    the one it is up to date with, and evicts the invoices deleted since.
+    """
+
+    def __init__(self, maxsize: int):
+        self._invoices: LRUCache[UUID, Invoice] = LRUCache(maxsize)
+        self._last_seq: int | None = None
+
+    async def sync(self, storage: InvoiceStorage) -> int:
+        """Evict the invoices deleted since the last sync, returning the seq now synced to."""
+        last_seq = await storage.last_change_seq()
+        since = self._last_seq
+        if since is None or last_seq < since:  # first sync, or the feed was reset
+            self._invoices.clear()
+        elif since < last_seq:
+            changes = await storage.fetch_changes(since, CHANGES_PAGE_SIZE)
+            if not changes or changes[0].seq != since + 1:  # compacted away
+                self._invoices.clear()
+            while changes:
+                for change in changes:
+                    if change.operation is InvoiceOperation.DELETED:
+                        self._invoices.pop(change.invoice_id)
+                if changes[-1].seq >= last_seq:
+                    break
+                changes = await storage.fetch_changes(changes[-1].seq, CHANGES_PAGE_SIZE)
+        self._last_seq = last_seq
+        return last_seq
+
+    def get(self, invoice_id: UUID) -> Invoice | None:
+        """The cached invoice of an ID, if any."""
+        return self._invoices.get(invoice_id)
+
+    def put(self, invoices: list[Invoice], synced: int):
+        """Cache invoices read after the given sync, unless a later sync ran meanwhile.
+
+        A later sync may have missed the deletion of an invoice read before it: such
+        reads are not cached.
+        """
+        if synced == self._last_seq:
+            for invoice in invoices:
+                self._invoices.put(invoice.id, invoice)
+
+
+@dataclass(frozen=True)
+class FetchManyInvoices:
+    """The fetch many invoices query payload."""
+
+    invoice_ids: tuple[UUID, ...]
+
+
+class FetchManyInvoicesHandler:
+    """The fetch many invoices query handler."""
+
+    invoices: InvoiceStorage
+    cache: InvoiceCache
+
+    @inject
+    def __init__(self, invoices: InvoiceStorage, cache: InvoiceCache):
+        self.invoices = invoices
+        self.cache = cache
+
+    async def handle(self, query: FetchManyInvoices) -> list[Invoice | None]:
+        """Handles the fetch many invoices query.
+
+        Returns one item per requested ID, in the requested order: the invoice, or `None`
+        if there is no such invoice. Only the cache misses are read from the storage.
+        """
+        synced = await self.cache.sync(self.invoices)
+        cached = {invoice_id: self.cache.get(invoice_id) for invoice_id in query.invoice_ids}
+        misses = [invoice_id for invoice_id, invoice in cached.items() if invoice is None]
+        if misses:
+            fetched = await self.invoices.fetch_many(misses)
+            self.cache.put(fetched, synced)
+            cached.update((invoice.id, invoice) for invoice in fetched)
+        return [cached[invoice_id] for invoice_id in query.invoice_ids]
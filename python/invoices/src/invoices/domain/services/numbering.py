@@ -0,0 +1,57 @@
+import asyncio
+from collections import defaultdict
+from enum import StrEnum
+
+from invoices.core.uuid7 import uuid7_timestamp
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_sequence import InvoiceSequence
+from invoices.domain.storages.interface import InvoiceStorage
+
+
+class NumberingMode(StrEnum):
+    """How the legal invoice numbers are allocated."""
+
+    BLOCK = "block"
+    STRICT = "strict"
+
+
+class InvoiceNumbering:
+    """Per-worker allocator of the legal invoice numbers, one sequence per prefix and year.
+
+    In block mode (hi/lo), a worker reserves `block_size` numbers at once and hands them
+    out from memory: the counter row is updated once per block rather than once per
+    invoice. Numbers then follow the creation order within a worker only, and those left
+    unused by a stopping worker (or a failed insert) are lost. In strict mode, each insert
+    takes the next number in its own transaction, batched by the group commit: numbers
+    are gap-free.
+    """
+
+    def __init__(self, prefix: str, mode: NumberingMode, block_size: int):
+        self.prefix = prefix
+        self.mode = mode
+        self.block_size = block_size
+        self._blocks: dict[InvoiceSequence, range] = {}
+        self._locks: defaultdict[InvoiceSequence, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def sequence(self, invoice: Invoice) -> InvoiceSequence:
+        """The sequence numbering an invoice, from the year of its creation."""
+        return InvoiceSequence(prefix=self.prefix, year=uuid7_timestamp(invoice.id).year)
+
+    async def insert(self, storage: InvoiceStorage, invoice: Invoice):
+        """Number a new invoice and store it."""
+        sequence = self.sequence(invoice)
+        if self.mode is NumberingMode.STRICT:
+            await storage.insert(invoice, sequence)
+            return
+        invoice.number = sequence.format(await self._next_value(storage, sequence))
+        await storage.insert(invoice)
+
+    async def _next_value(self, storage: InvoiceStorage, sequence: InvoiceSequence) -> int:
+        """Take the next value of the worker's block, reserving a new block once used up."""
+        async with self._locks[sequence]:
+            block = self._blocks.get(sequence)
+            if not block:
+                first = await storage.allocate_numbers(sequence, self.block_size)
+                block = range(first, first + self.block_size)
+            self._blocks[sequence] = block[1:]
+            return block[0]
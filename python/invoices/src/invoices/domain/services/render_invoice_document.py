@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import html
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from uuid import UUID
+
+from injector import inject
+
+from invoices.core.content_cache import ContentCache
+from invoices.core.content_cache import write_atomically
+from invoices.core.singleflight import SingleFlight
+from invoices.core.uuid7 import uuid7_timestamp
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_document import InvoiceDocument
+from invoices.domain.storages.interface import InvoiceStorage
+
+# bump whenever the template changes, so that the cached documents are rendered again
+TEMPLATE_VERSION = "1"
+TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Invoice {number}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2cm; }}
+dt {{ font-weight: bold; margin-top: 1em; }}
+@page {{ size: A4; margin: 2cm; }}
+</style>
+</head>
+<body>
+<h1>Invoice {number}</h1>
+<dl>
+<dt>Number</dt><dd>{number}</dd>
+<dt>Issued on</dt><dd>{issued_on}</dd>
+<dt>Reference</dt><dd>{reference}</dd>
+</dl>
+</body>
+</html>
+"""
+DOCUMENT_SUFFIX = ".html"
+PAGE_SIZE = 10000
+CHUNK_SIZE = 500
+
+
+def document_key(invoice: Invoice) -> str:
+    """The hash of what the document of an invoice is rendered from."""
+    source = "\0".join([TEMPLATE_VERSION, str(invoice.id), invoice.number or ""])
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def render_invoice(invoice: Invoice) -> bytes:
+    """Render the printable HTML document of an invoice (CPU-bound)."""
+    return TEMPLATE.format(
+        number=html.escape(invoice.number or "(unnumbered)"),
+        issued_on=f"{uuid7_timestamp(invoice.id):%Y-%m-%d}",
+        reference=invoice.id,
+    ).encode()
+
+
+def render_files(items: list[tuple[Invoice, str]]) -> int:
+    """Render the documents of invoices to their cache files, returning how many."""
+    for invoice, path in items:
+        write_atomically(Path(path), render_invoice(invoice))
+    return len(items)
+
+
+class DocumentRenderer:
+    """Per-process renderer of the invoice documents, cached on disk by content hash.
+
+    Rendering runs in a pool of `processes` processes, started on first use, so that it
+    never blocks the event loop; concurrent requests for the same document share one
+    rendering.
+    """
+
+    def __init__(self, cache: ContentCache, processes: int):
+        self._cache = cache
+        self._processes = processes
+        self._flights: SingleFlight[InvoiceDocument] = SingleFlight()
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def render(self, invoice: Invoice) -> InvoiceDocument:
+        """The document of an invoice, from the cache or rendered."""
+        key = document_key(invoice)
+        if (content := self._cache.get(key)) is not None:
+            return InvoiceDocument(key, content)
+        return await self._flights.do(key, partial(self._render, invoice, key))
+
+    async def render_many(self, invoices: list[Invoice]) -> int:
+        """Render the documents of invoices missing from the cache, on every process.
+
+        Returns the number of documents rendered.
+        """
+        missing = [
+            (invoice, str(path))
+            for invoice in invoices
+            if not (path := self._cache.path(document_key(invoice))).exists()
+        ]
+        count = -(-len(missing) // CHUNK_SIZE)
+        chunks = [missing[index::count] for index in range(count)]
+        counts = await asyncio.gather(*(self._run(render_files, chunk) for chunk in chunks))
+        return sum(counts)
+
+    def close(self):
+        """Stop the process pool."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def _render(self, invoice: Invoice, key: str) -> InvoiceDocument:
+        """Render the document of an invoice in the pool, then cache it."""
+        content = await self._run(render_invoice, invoice)
+        await asyncio.to_thread(self._cache.put, key, content)
+        return InvoiceDocument(key, content)
+
+    async def _run(self, function: Callable[[Any], Any], argument: Any) -> Any:
+        """Call a function in the process pool."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self._processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        pool = self._pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, function, argument)
+        except BrokenProcessPool:
+            # a process died (e.g. out of memory): start a new pool for the next calls,
+            # without blocking the event loop until the broken one is shut down
+            if self._pool is pool:
+                self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+@dataclass(frozen=True)
+class RenderInvoiceDocument:
+    """The render invoice document query payload."""
+
+    invoice_id: UUID
+
+
+class RenderInvoiceDocumentHandler:
+    """The render invoice document query handler."""
+
+    invoices: InvoiceStorage
+    renderer: DocumentRenderer
+
+    @inject
+    def __init__(self, invoices: InvoiceStorage, renderer: DocumentRenderer):
+        self.invoices = invoices
+        self.renderer = renderer
+
+    async def handle(self, query: RenderInvoiceDocument) -> InvoiceDocument | None:
+        """Handles the render invoice document query, `None` meaning no such invoice."""
+        invoice = await self.invoices.fetch_by(query.invoice_id)
+        if invoice is None:
+            return None
+        return await self.renderer.render(invoice)
+
+
+@dataclass(frozen=True)
+class RenderInvoiceDocuments:
+    """The render invoice documents command payload, for the ids within `[lower_id, upper_id)`."""
+
+    lower_id: UUID
+    upper_id: UUID
+
+
+class RenderInvoiceDocumentsHandler:
+    """The render invoice documents command handler."""
+
+    invoices: InvoiceStorage
+    renderer: DocumentRenderer
+
+    @inject
+    def __init__(self, invoices: InvoiceStorage, renderer: DocumentRenderer):
+        self.invoices = invoices
+        self.renderer = renderer
+
+    async def handle(self, command: RenderInvoiceDocuments) -> tuple[int, int]:
+        """Handles the render invoice documents command, a page of invoices at a time.
+
+        Returns the number of invoices, and of documents rendered (the others being
+        cached already).
+        """
+        total = rendered = 0
+        lower_id = command.lower_id
+        while page := await self.invoices.fetch_all(PAGE_SIZE, 0, lower_id, command.upper_id):
+            rendered += await self.renderer.render_many(page)
+            total += len(page)
+            lower_id = UUID(int=page[-1].id.int + 1)
+        return total, rendered
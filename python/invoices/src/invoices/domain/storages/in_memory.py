@@ -1,6 +1,15 @@
+from bisect import bisect_left
+from bisect import bisect_right
+from bisect import insort
+from datetime import UTC
+from datetime import datetime
+from typing import Sequence
 from uuid import UUID
 
 from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_change import InvoiceChange
+from invoices.domain.models.invoice_change import InvoiceOperation
+from invoices.domain.models.invoice_sequence import InvoiceSequence
 from invoices.domain.storages.interface import InvoiceStorage
 
 
@@ -8,24 +17,90 @@ class InMemoryInvoiceStorage(InvoiceStorage):
     """In-memory implementation of the InvoiceStorage interface."""
 
     _invoices: dict[UUID, Invoice]
+    _ids: list[UUID]
+    _changes: list[InvoiceChange]
+    _last_seq: int
+    _sequences: dict[InvoiceSequence, int]
 
     def __init__(self, *args: Invoice):
         self._invoices = {invoice.id: invoice for invoice in args}
+        self._ids = sorted(self._invoices)
+        self._changes = []
+        self._last_seq = 0
+        self._sequences = {}
 
     @property
     def items(self) -> list[Invoice]:
-        """All invoices stored in memory."""
-        return list(self._invoices.values())
+        """All invoices stored in memory, ordered by ID."""
+        return [self._invoices[invoice_id] for invoice_id in self._ids]
 
-    async def insert(self, invoice: Invoice) -> None:
-        """Insert a new invoice."""
+    async def insert(self, invoice: Invoice, sequence: InvoiceSequence | None = None) -> None:
+        """Insert a new invoice, numbered with the next value of `sequence` if given."""
+        if sequence is not None:
+            invoice.number = sequence.format(await self.allocate_numbers(sequence, 1))
+        if invoice.id not in self._invoices:
+            insort(self._ids, invoice.id)
         self._invoices[invoice.id] = invoice
+        self._record(invoice, InvoiceOperation.CREATED)
 
-    async def fetch_all(self, limit: int = 100, offset: int = 0) -> list[Invoice]:
-        """Fetch a paginated list of invoices."""
-        start, end = offset, offset + limit
-        return self.items[start:end]
+    async def allocate_numbers(self, sequence: InvoiceSequence, count: int) -> int:
+        """Reserve the next `count` values of a sequence, returning the first one."""
+        first = self._sequences.get(sequence, 1)
+        self._sequences[sequence] = first + count
+        return first
 
-    async def delete(self, invoice: Invoice) -> None:
+    async def fetch_by(self, invoice_id: UUID) -> Invoice | None:
+        """Fetch one invoice by its ID."""
+        return self._invoices.get(invoice_id)
+
+    async def fetch_many(self, invoice_ids: Sequence[UUID]) -> list[Invoice]:
+        """Fetch the invoices of the given IDs that exist."""
+        return [self._invoices[id_] for id_ in dict.fromkeys(invoice_ids) if id_ in self._invoices]
+
+    async def fetch_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        lower_id: UUID | None = None,
+        upper_id: UUID | None = None,
+    ) -> list[Invoice]:
+        """Fetch a paginated list of invoices, bisecting the sorted IDs for the bounds."""
+        first = bisect_left(self._ids, lower_id) if lower_id is not None else 0
+        last = bisect_left(self._ids, upper_id) if upper_id is not None else len(self._ids)
+        start, end = first + offset, min(first + offset + limit, last)
+        return [self._invoices[invoice_id] for invoice_id in self._ids[start:end]]
+
+    async def fetch_timestamps(self, lower_id: UUID | None = None) -> bytes:
+        """Fetch the packed creation timestamps of the invoices from `lower_id` on."""
+        start = bisect_left(self._ids, lower_id) if lower_id is not None else 0
+        return b"".join(invoice_id.bytes[:6] for invoice_id in self._ids[start:])
+
+    async def delete(self, invoice: Invoice) -> bool:
         """Delete an invoice."""
-        self._invoices.pop(invoice.id, None)
+        if self._invoices.pop(invoice.id, None) is None:
+            return False
+        del self._ids[bisect_left(self._ids, invoice.id)]
+        self._record(invoice, InvoiceOperation.DELETED)
+        return True
+
+    async def fetch_changes(self, since: int = 0, limit: int = 100) -> list[InvoiceChange]:
+        """Fetch the change feed entries following the given sequence number."""
+        start = bisect_right(self._changes, since, key=lambda change: change.seq)
+        end = start + limit
+        return self._changes[start:end]
+
+    async def last_change_seq(self) -> int:
+        """Return the sequence number of the latest change feed entry."""
+        return self._last_seq
+
+    async def compact_changes(self, before: datetime) -> int:
+        """Delete the change feed entries recorded before the given moment."""
+        end = bisect_left(self._changes, before, key=lambda change: change.recorded_at)
+        del self._changes[:end]
+        return end
+
+    def _record(self, invoice: Invoice, operation: InvoiceOperation):
+        """Append an entry to the change feed."""
+        self._last_seq += 1
+        change = InvoiceChange(self._last_seq, invoice.id, operation, datetime.now(UTC))
+        self._changes.append(change)
@@ -1,20 +1,67 @@
 from abc import ABC
 from abc import abstractmethod
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
 
 from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_change import InvoiceChange
+from invoices.domain.models.invoice_sequence import InvoiceSequence
 
 
 class InvoiceStorage(ABC):
     """Abstract base class for managing invoice persistence."""
 
     @abstractmethod
-    async def insert(self, invoice: Invoice) -> None:
-        """Stores a new invoice."""
+    async def insert(self, invoice: Invoice, sequence: InvoiceSequence | None = None) -> None:
+        """Stores a new invoice.
+
+        Given a sequence, the invoice is numbered with its next value in the transaction
+        of the insert itself, so that numbers are gap-free.
+        """
+
+    @abstractmethod
+    async def allocate_numbers(self, sequence: InvoiceSequence, count: int) -> int:
+        """Reserves the next `count` values of a sequence, returning the first one."""
+
+    @abstractmethod
+    async def fetch_by(self, invoice_id: UUID) -> Invoice | None:
+        """Fetches one invoice by its ID."""
+
+    @abstractmethod
+    async def fetch_many(self, invoice_ids: Sequence[UUID]) -> list[Invoice]:
+        """Fetches the invoices of the given IDs that exist, in no particular order."""
+
+    @abstractmethod
+    async def fetch_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        lower_id: UUID | None = None,
+        upper_id: UUID | None = None,
+    ) -> list[Invoice]:
+        """Fetches a paginated list of invoices, optionally within `[lower_id, upper_id)`."""
+
+    @abstractmethod
+    async def fetch_timestamps(self, lower_id: UUID | None = None) -> bytes:
+        """Fetches the creation timestamps of the invoices from `lower_id` on.
+
+        Timestamps are the 6 leading bytes of the uuid7 ids (big-endian milliseconds
+        since the epoch), packed in one buffer in no particular order.
+        """
+
+    @abstractmethod
+    async def delete(self, invoice: Invoice) -> bool:
+        """Deletes an invoice by its ID, returning whether it existed."""
+
+    @abstractmethod
+    async def fetch_changes(self, since: int = 0, limit: int = 100) -> list[InvoiceChange]:
+        """Fetches the change feed entries following the given sequence number."""
 
     @abstractmethod
-    async def fetch_all(self, limit: int = 100, offset: int = 0) -> list[Invoice]:
-        """Fetches a paginated list of invoices."""
+    async def last_change_seq(self) -> int:
+        """Returns the sequence number of the latest change feed entry, 0 if none."""
 
     @abstractmethod
-    async def delete(self, invoice: Invoice) -> None:
-        """Deletes an invoice by its ID."""
+    async def compact_changes(self, before: datetime) -> int:
+        """Deletes the change feed entries recorded before the given moment."""
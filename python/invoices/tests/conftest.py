@@ -1,4 +1,8 @@
+import secrets
+from datetime import datetime
 from typing import AsyncGenerator
+from typing import Callable
+from uuid import UUID
 
 import pytest
 import pytest_asyncio
@@ -55,3 +59,15 @@ async def invoice(connection: AsyncConnection) -> Invoice:
     await storage.insert(invoice)
     await connection.commit()
     return invoice
+
+
+@pytest.fixture
+def created_at() -> Callable[[datetime], Invoice]:
+    """A factory of invoices whose uuid7 was generated at a given moment."""
+
+    def factory(moment: datetime) -> Invoice:
+        milliseconds = int(moment.timestamp() * 1000)
+        value = (milliseconds << 80) | (0x7 << 76) | (0b10 << 62) | secrets.randbits(62)
+        return Invoice(id_=UUID(int=value))
+
+    return factory
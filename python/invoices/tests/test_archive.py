@@ -0,0 +1,102 @@
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from invoices.core.uuid7 import uuid7_lower_bound
+from invoices.database.archives import archive_invoices
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.database.tables.invoice_archives import invoice_archives
+from invoices.domain.models.invoice import Invoice
+
+CUTOFF = datetime(2026, 3, 1, tzinfo=UTC)
+
+
+async def seed(
+    connection: AsyncConnection, created_at: Callable[[datetime], Invoice]
+) -> list[Invoice]:
+    """Store invoices spread over January, February and March, in id order."""
+    storage = DatabaseInvoiceStorage(connection)
+    days = [(1, 5), (1, 20), (1, 31), (2, 3), (2, 14), (3, 2), (3, 9)]
+    seeded = [created_at(datetime(2026, month, day, tzinfo=UTC)) for month, day in days]
+    for invoice in seeded:
+        await storage.insert(invoice)
+    await connection.commit()
+    return seeded
+
+
+@pytest.mark.asyncio
+async def test_archive_by_period(connection: AsyncConnection, tmp_path: Path, created_at):
+    """Test that old invoices are moved, chunk by chunk, to the archive of their month."""
+    await seed(connection, created_at)
+
+    moved = await archive_invoices(connection, uuid7_lower_bound(CUTOFF), tmp_path, chunk_size=2)
+
+    result = await connection.execute(select(invoice_archives).order_by("period"))
+    registry = [(row.period, row.count) for row in result]
+    assert moved == 5
+    assert registry == [("2026-01", 3), ("2026-02", 2)]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "invoices-2026-01.db",
+        "invoices-2026-02.db",
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit, offset", [(3, 0), (2, 2), (4, 3), (10, 5), (2, 6)])
+async def test_pages_span_archives(
+    connection: AsyncConnection, tmp_path: Path, created_at, limit: int, offset: int
+):
+    """Test that pages read through the archives and the main table in id order."""
+    seeded = await seed(connection, created_at)
+    await archive_invoices(connection, uuid7_lower_bound(CUTOFF), tmp_path, chunk_size=100)
+    storage = DatabaseInvoiceStorage(connection)
+
+    page = await storage.fetch_all(limit=limit, offset=offset)
+
+    end = offset + limit
+    assert page == seeded[offset:end]
+
+
+@pytest.mark.asyncio
+async def test_fetch_and_delete_archived(connection: AsyncConnection, tmp_path: Path, created_at):
+    """Test that archived invoices can still be fetched and deleted by id."""
+    seeded = await seed(connection, created_at)
+    await archive_invoices(connection, uuid7_lower_bound(CUTOFF), tmp_path, chunk_size=100)
+    storage = DatabaseInvoiceStorage(connection)
+
+    assert await storage.fetch_by(seeded[1].id) == seeded[1]
+    assert await storage.delete(seeded[1])
+    assert not await storage.delete(seeded[1])
+    assert await storage.fetch_by(seeded[1].id) is None
+    assert await storage.fetch_all() == seeded[:1] + seeded[2:]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "lower, upper, limit, offset, expected",
+    [
+        ((1, 20), (2, 14), 10, 0, slice(1, 4)),
+        ((1, 20), None, 3, 1, slice(2, 5)),
+        (None, (3, 9), 10, 4, slice(4, 6)),
+        ((2, 1), (3, 3), 1, 2, slice(5, 6)),
+    ],
+)
+async def test_ranges_span_archives(
+    connection: AsyncConnection, tmp_path: Path, created_at, lower, upper, limit, offset, expected
+):
+    """Test that creation ranges read through the archives they overlap only."""
+    seeded = await seed(connection, created_at)
+    await archive_invoices(connection, uuid7_lower_bound(CUTOFF), tmp_path, chunk_size=100)
+    storage = DatabaseInvoiceStorage(connection)
+
+    def bound(day):
+        return uuid7_lower_bound(datetime(2026, *day, tzinfo=UTC)) if day else None
+
+    page = await storage.fetch_all(limit, offset, bound(lower), bound(upper))
+
+    assert page == seeded[expected]
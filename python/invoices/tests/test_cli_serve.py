@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from invoices.apps.cli.commands.server import WORKER_CLASS
+from invoices.apps.cli.commands.server import Server
+from invoices.apps.cli.commands.server import build_options
+from invoices.apps.cli.commands.server import pre_fork
+from invoices.apps.cli.commands.server import serve
+from invoices.core.config import ServerConfig
+
+
+def test_build_options():
+    """Test that the server configuration is translated into gunicorn settings."""
+    config = ServerConfig(host="0.0.0.0", port=9000, workers=3, max_requests=50)
+
+    options = build_options(config)
+
+    assert options["bind"] == "0.0.0.0:9000"
+    assert options["workers"] == 3
+    assert options["worker_class"] == WORKER_CLASS
+    assert options["preload_app"] is True
+    assert options["max_requests"] == 50
+    assert options["pre_fork"] is pre_fork
+
+
+def test_server_loads_options():
+    """Test that the gunicorn application accepts every generated setting."""
+    application = Server(build_options(ServerConfig(workers=2)))
+
+    assert application.cfg.workers == 2
+    assert application.cfg.preload_app is True
+    assert application.cfg.worker_class_str == WORKER_CLASS
+
+
+def test_pre_fork_freezes_gc():
+    """Test that the master freezes the garbage collector before forking."""
+    with patch("invoices.apps.cli.commands.server.gc") as gc:
+        pre_fork(None, None)
+
+    gc.freeze.assert_called_once()
+
+
+def test_serve_command():
+    """Test that the serve command passes its flags to the gunicorn application."""
+    with patch("invoices.apps.cli.commands.server.Server") as server:
+        result = CliRunner().invoke(
+            serve,
+            [
+                "--workers",
+                "2",
+                "--port",
+                "9001",
+                "--max-requests",
+                "500",
+                "--max-requests-jitter",
+                "50",
+                "--graceful-timeout",
+                "7",
+            ],
+        )
+
+    assert result.exit_code == 0, result.output
+    options = server.call_args.args[0]
+    assert options["workers"] == 2
+    assert options["bind"].endswith(":9001")
+    assert options["max_requests"] == 500
+    assert options["max_requests_jitter"] == 50
+    assert options["graceful_timeout"] == 7
+    server.return_value.run.assert_called_once()
@@ -0,0 +1,123 @@
+import asyncio
+
+import httpx
+import pytest
+
+from invoices.apps.server.extensions.concurrency import AdaptiveLimiter
+from invoices.apps.server.extensions.concurrency import ConcurrencyLimitMiddleware
+from invoices.core.config import ConcurrencyConfig
+
+
+def make_config(**kwargs) -> ConcurrencyConfig:
+    """Build a limiter configuration with small, deterministic values."""
+    kwargs.setdefault("initial_limit", 2)
+    kwargs.setdefault("min_limit", 1)
+    kwargs.setdefault("max_limit", 10)
+    kwargs.setdefault("max_queue", 1)
+    kwargs.setdefault("queue_timeout", 0.01)
+    kwargs.setdefault("retry_after", 3)
+    kwargs.setdefault("smoothing", 1.0)
+    return ConcurrencyConfig(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_sheds_above_limit():
+    """Test that requests above the limit are shed once the queue timeout expires."""
+    limiter = AdaptiveLimiter(make_config())
+
+    assert await limiter.acquire()
+    assert await limiter.acquire()
+    assert not await limiter.acquire()
+    assert limiter.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_release_hands_slot_to_waiter():
+    """Test that a released slot is handed over to a queued request."""
+    limiter = AdaptiveLimiter(make_config(initial_limit=1, queue_timeout=1.0))
+    assert await limiter.acquire()
+
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.release(0.01)
+
+    assert await waiting
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_queue_is_full():
+    """Test that requests are rejected immediately when the queue is full."""
+    limiter = AdaptiveLimiter(make_config(initial_limit=1, queue_timeout=1.0))
+    assert await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    assert not await limiter.acquire()
+
+    limiter.release(0.01)
+    assert await waiting
+
+
+@pytest.mark.asyncio
+async def test_limit_decreases_when_latency_grows():
+    """Test that the limit shrinks when latencies rise above the baseline."""
+    limiter = AdaptiveLimiter(make_config(initial_limit=8))
+    for _ in range(8):
+        await limiter.acquire()
+
+    limiter.release(0.01)
+    limiter.release(0.01)
+    baseline = limiter.limit
+    for _ in range(6):
+        limiter.release(0.5)
+
+    assert limiter.limit < baseline
+
+
+@pytest.mark.asyncio
+async def test_middleware_returns_retry_after():
+    """Test that the middleware answers shed requests with a 503 and `Retry-After`."""
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = ConcurrencyLimitMiddleware(app, make_config(initial_limit=1, max_queue=0))
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/invoices"))
+        await asyncio.sleep(0.01)
+        shed = await client.get("/invoices")
+        release.set()
+        accepted = await first
+
+    assert accepted.status_code == 200
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "3"
+    assert shed.json()["kind"] == "unavailable"
+
+
+@pytest.mark.asyncio
+async def test_middleware_exempt_paths():
+    """Test that requests to the exempt paths are neither limited nor counted."""
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    config = make_config(initial_limit=1, max_queue=0)
+    middleware = ConcurrencyLimitMiddleware(app, config, exempt_paths={"/invoices/events"})
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        streams = [asyncio.create_task(client.get("/invoices/events")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        release.set()
+        responses = await asyncio.gather(*streams)
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    assert middleware.limiter.in_flight == 0
@@ -0,0 +1,139 @@
+import asyncio
+from functools import partial
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from invoices.core.config import DatabaseConfig
+from invoices.core.config import WriterConfig
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+from invoices.database.core import metadata
+from invoices.database.storages.invoices import WriterInvoiceStorage
+from invoices.database.tables.invoices import invoices
+from invoices.database.writer import DatabaseWriter
+from invoices.domain.models.invoice import Invoice
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    """An engine on a file database, so that the writer owns a connection of its own."""
+    engine = await get_async_engine(DatabaseConfig(path=str(tmp_path / "invoices.db")))
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+def make_writer(engine: AsyncEngine, max_batch_size: int = 64) -> DatabaseWriter:
+    """Build a writer on its own connection of the given engine."""
+    config = WriterConfig(max_batch_size=max_batch_size, max_batch_delay=0.01)
+    return DatabaseWriter(partial(get_connection, engine), config)
+
+
+async def count_invoices(engine: AsyncEngine) -> int:
+    """Count the invoices committed to the database."""
+    async with get_connection(engine) as connection:
+        result = await connection.execute(select(func.count()).select_from(invoices))
+        return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_commits(engine: AsyncEngine):
+    """Test that concurrent writes are committed together, in few transactions."""
+    writer = make_writer(engine, max_batch_size=16)
+    commits = 0
+
+    def count_commit(_):
+        nonlocal commits
+        commits += 1
+
+    event.listen(engine.sync_engine, "commit", count_commit)
+    async with get_connection(engine) as connection:
+        storage = WriterInvoiceStorage(connection, writer)
+        await asyncio.gather(*(storage.insert(Invoice()) for _ in range(64)))
+    await writer.stop()
+    event.remove(engine.sync_engine, "commit", count_commit)
+
+    assert await count_invoices(engine) == 64
+    assert commits <= 64 // 16 + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_begin_fails_every_caller(engine: AsyncEngine, monkeypatch):
+    """Test that a transaction failing to begin fails the whole batch, instead of hanging."""
+    writer = make_writer(engine)
+
+    def locked(self):
+        raise OperationalError("BEGIN IMMEDIATE", None, Exception("database is locked"))
+
+    async with get_connection(engine) as connection:
+        storage = WriterInvoiceStorage(connection, writer)
+        monkeypatch.setattr(AsyncConnection, "begin", locked)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(storage.insert(Invoice()) for _ in range(3)), return_exceptions=True),
+            timeout=5,
+        )
+        monkeypatch.undo()
+    await writer.stop()
+
+    assert all(isinstance(result, OperationalError) for result in results)
+    assert await count_invoices(engine) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_operation_does_not_abort_batch(engine: AsyncEngine):
+    """Test that a failing operation only fails its own caller."""
+    writer = make_writer(engine)
+    duplicate = Invoice()
+    async with get_connection(engine) as connection:
+        storage = WriterInvoiceStorage(connection, writer)
+        await storage.insert(duplicate)
+        results = await asyncio.gather(
+            storage.insert(Invoice()),
+            storage.insert(duplicate),
+            storage.insert(Invoice()),
+            return_exceptions=True,
+        )
+    await writer.stop()
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], Exception)
+    assert await count_invoices(engine) == 3
+
+
+@pytest.mark.asyncio
+async def test_delete_reports_missing_rows(engine: AsyncEngine):
+    """Test that a delete tells whether the invoice existed, within one operation."""
+    writer = make_writer(engine)
+    invoice = Invoice()
+    async with get_connection(engine) as connection:
+        storage = WriterInvoiceStorage(connection, writer)
+        await storage.insert(invoice)
+        deleted = await asyncio.gather(storage.delete(invoice), storage.delete(invoice))
+    await writer.stop()
+
+    assert sorted(deleted) == [False, True]
+    assert await count_invoices(engine) == 0
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_operations(engine: AsyncEngine):
+    """Test that stopping the writer applies the operations already queued."""
+    writer = make_writer(engine)
+    async with get_connection(engine) as connection:
+        storage = WriterInvoiceStorage(connection, writer)
+        pending = [asyncio.create_task(storage.insert(Invoice())) for _ in range(5)]
+        await asyncio.sleep(0)
+        await writer.stop()
+        await asyncio.gather(*pending)
+
+    assert await count_invoices(engine) == 5
@@ -1,7 +1,23 @@
+import asyncio
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+
+import httpx
 import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection
 from starlette.testclient import TestClient
 
+from invoices.apps.server.app import create_app
+from invoices.apps.server.extensions import database as database_extension
+from invoices.core.config import DatabaseConfig
+from invoices.database.core import get_sync_engine
+from invoices.database.core import metadata
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
 from invoices.domain.models.invoice import Invoice
+from invoices.domain.services.fetch_all_invoices import FetchAllInvoices
+from invoices.domain.services.fetch_all_invoices import FetchAllInvoicesHandler
+from invoices.domain.storages.in_memory import InMemoryInvoiceStorage
 
 
 @pytest.mark.asyncio
@@ -20,3 +36,72 @@ async def test_not_empty(client: TestClient, invoice: Invoice):
 
     assert response.status_code == 200, response.text
     assert response.json() == [{"id": str(invoice.id)}]
+
+
+@pytest.mark.asyncio
+async def test_created_range(client: TestClient, connection: AsyncConnection, created_at):
+    """Test that the endpoint filters invoices on the creation time embedded in their id."""
+    storage = DatabaseInvoiceStorage(connection)
+    seeded = [created_at(datetime(2026, 5, day, tzinfo=UTC)) for day in (1, 2, 3, 4)]
+    for invoice in seeded:
+        await storage.insert(invoice)
+    await connection.commit()
+
+    response = client.get(
+        "/invoices",
+        params={"created_after": "2026-05-02T00:00:00Z", "created_before": "2026-05-04T00:00:00Z"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == [{"id": str(invoice.id)} for invoice in seeded[1:3]]
+
+
+@pytest.mark.asyncio
+async def test_created_range_in_memory(created_at):
+    """Test that the in-memory storage bisects its sorted ids for the creation range."""
+    seeded = [created_at(datetime(2026, 5, day, tzinfo=UTC)) for day in (1, 2, 3, 4)]
+    storage = InMemoryInvoiceStorage(*reversed(seeded))
+    handler = FetchAllInvoicesHandler(storage)
+
+    query = FetchAllInvoices(
+        limit=10,
+        offset=1,
+        created_after=datetime(2026, 5, 1, 12, tzinfo=UTC),
+        created_before=datetime(2026, 5, 4, tzinfo=UTC),
+    )
+
+    assert await handler.handle(query) == seeded[2:3]
+
+
+@pytest.mark.asyncio
+async def test_shared_query_outlives_cancelled_leader(tmp_path: Path, monkeypatch):
+    """Test that a request joining a shared query is answered once the first one is gone.
+
+    The shared query reads on a connection of its own, not on the first request's one,
+    which is released when that request is cancelled.
+    """
+    config = DatabaseConfig(path=str(tmp_path / "db.sqlite"))
+    engine = get_sync_engine(config)
+    metadata.create_all(engine)
+    engine.dispose()
+    app = create_app(config)
+    handle = FetchAllInvoicesHandler.handle
+
+    async def slow_handle(self, query):
+        await asyncio.sleep(0.05)
+        return await handle(self, query)
+
+    monkeypatch.setattr(FetchAllInvoicesHandler, "handle", slow_handle)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        leader = asyncio.create_task(client.get("/invoices"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(client.get("/invoices"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        response = await follower
+    await database_extension.shutdown(app)
+
+    assert leader.cancelled()
+    assert response.status_code == 200, response.text
+    assert response.json() == []
@@ -0,0 +1,138 @@
+import asyncio
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.responses import Response
+from starlette.testclient import TestClient
+
+from invoices.apps.server.extensions.idempotency import IdempotencyStore
+from invoices.core.config import IdempotencyConfig
+from invoices.database.idempotency import delete_expired_keys
+from invoices.database.tables.idempotency_keys import idempotency_keys
+
+
+class CountingEndpoint:
+    """Endpoint counting its calls, each answered after a short delay."""
+
+    def __init__(self, status_code: int = HTTPStatus.CREATED):
+        self.calls = 0
+        self.status_code = status_code
+
+    async def __call__(self, request: Request) -> Response:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return JSONResponse({"call": self.calls}, status_code=self.status_code)
+
+
+def make_request(body: bytes = b"") -> Request:
+    """A `POST /invoices` request with the given body."""
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {"type": "http", "method": "POST", "path": "/invoices", "headers": []}
+    return Request(scope, receive)
+
+
+def make_store(connection: AsyncConnection, **kwargs) -> IdempotencyStore:
+    """A store of a worker, on the given connection."""
+
+    @asynccontextmanager
+    async def connect() -> AsyncIterator[AsyncConnection]:
+        yield connection
+
+    return IdempotencyStore(connect, IdempotencyConfig(poll_interval=0.01, **kwargs))
+
+
+@pytest.mark.asyncio
+async def test_replay(client: TestClient):
+    """Test that a retried request gets the first response, without a second invoice."""
+    first = client.post("/invoices", headers={"Idempotency-Key": "retry-1"})
+    second = client.post("/invoices", headers={"Idempotency-Key": "retry-1"})
+
+    assert first.status_code == second.status_code == 201
+    assert second.content == first.content
+    assert "idempotent-replayed" not in first.headers
+    assert second.headers["idempotent-replayed"] == "true"
+    assert len(client.get("/invoices").json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_key_reused_for_another_request(client: TestClient):
+    """Test that a key cannot be reused for a different request."""
+    created = client.post("/invoices", headers={"Idempotency-Key": "reused"})
+    invoice_id = created.json()["id"]
+
+    response = client.delete(f"/invoices/{invoice_id}", headers={"Idempotency-Key": "reused"})
+
+    assert response.status_code == 422, response.text
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait(connection: AsyncConnection):
+    """Test that duplicates, in this worker or another one, wait for the first request."""
+    endpoint = CountingEndpoint()
+    worker, other_worker = make_store(connection), make_store(connection)
+
+    responses = await asyncio.gather(
+        worker.execute(make_request(), "key", endpoint),
+        worker.execute(make_request(), "key", endpoint),
+        other_worker.execute(make_request(), "key", endpoint),
+    )
+
+    assert endpoint.calls == 1
+    assert {response.body for response in responses} == {b'{"call":1}'}
+    await worker.stop()
+    await other_worker.stop()
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_not_stored(connection: AsyncConnection):
+    """Test that a request failing on the server can be retried with the same key."""
+    endpoint = CountingEndpoint(status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+    store = make_store(connection)
+
+    await store.execute(make_request(), "key", endpoint)
+    await store.execute(make_request(), "key", endpoint)
+
+    assert endpoint.calls == 2
+    await store.stop()
+
+
+@pytest.mark.asyncio
+async def test_expired_keys(connection: AsyncConnection):
+    """Test that expired keys run the request again, and are cleaned up."""
+    endpoint = CountingEndpoint()
+    store = make_store(connection, ttl=0)
+
+    await store.execute(make_request(), "key", endpoint)
+    await asyncio.sleep(0.01)
+    await store.execute(make_request(), "key", endpoint)
+    await asyncio.sleep(0.01)
+    deleted = await delete_expired_keys(connection)
+
+    result = await connection.execute(select(func.count()).select_from(idempotency_keys))
+    assert endpoint.calls == 2
+    assert deleted == 1
+    assert result.scalar_one() == 0
+    await store.stop()
+
+
+@pytest.mark.asyncio
+async def test_keys_scoped_to_the_client(client: TestClient):
+    """Test that the same key sent by two clients runs two requests."""
+    first = client.post("/invoices", headers={"Idempotency-Key": "k", "x-api-key": "alice"})
+    second = client.post("/invoices", headers={"Idempotency-Key": "k", "x-api-key": "bob"})
+    replay = client.post("/invoices", headers={"Idempotency-Key": "k", "x-api-key": "alice"})
+
+    assert first.status_code == second.status_code == replay.status_code == 201
+    assert first.json()["id"] != second.json()["id"]
+    assert replay.content == first.content
+    assert len(client.get("/invoices").json()) == 2
@@ -0,0 +1,83 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.testclient import TestClient
+
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_change import InvoiceOperation
+from invoices.domain.storages.in_memory import InMemoryInvoiceStorage
+
+
+@pytest.mark.asyncio
+async def test_writes_are_recorded(client: TestClient):
+    """Test that creations and deletions are appended to the feed, in order."""
+    invoice_id = client.post("/invoices").json()["id"]
+    client.delete(f"/invoices/{invoice_id}")
+
+    response = client.get("/invoices/changes")
+
+    assert response.status_code == 200, response.text
+    changes = response.json()
+    assert [(change["invoiceId"], change["operation"]) for change in changes] == [
+        (invoice_id, "created"),
+        (invoice_id, "deleted"),
+    ]
+    assert changes[0]["seq"] < changes[1]["seq"]
+
+
+@pytest.mark.asyncio
+async def test_since_and_limit(client: TestClient):
+    """Test that a consumer only reads the entries following its last seen `seq`."""
+    for _ in range(3):
+        client.post("/invoices")
+    first, *rest = client.get("/invoices/changes").json()
+
+    response = client.get("/invoices/changes", params={"since": first["seq"], "limit": 1})
+
+    assert response.status_code == 200, response.text
+    assert response.json() == rest[:1]
+
+
+@pytest.mark.asyncio
+async def test_missing_delete_is_not_recorded(client: TestClient, invoice: Invoice):
+    """Test that deleting an unknown invoice leaves the feed untouched."""
+    client.delete(f"/invoices/{Invoice().id}")
+
+    changes = client.get("/invoices/changes").json()
+
+    assert [(change["invoiceId"], change["operation"]) for change in changes] == [
+        (str(invoice.id), "created"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalid_limit(client: TestClient):
+    """Test that the page size is bounded."""
+    response = client.get("/invoices/changes", params={"limit": 0})
+
+    assert response.status_code == 422, response.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage_factory", ["database", "in_memory"])
+async def test_compaction(connection: AsyncConnection, storage_factory: str):
+    """Test that compaction drops the old entries but never reuses their `seq`."""
+    if storage_factory == "database":
+        storage = DatabaseInvoiceStorage(connection)
+    else:
+        storage = InMemoryInvoiceStorage()
+    await storage.insert(Invoice())
+    await storage.insert(Invoice())
+
+    removed = await storage.compact_changes(before=datetime.now(UTC) + timedelta(seconds=1))
+    await storage.insert(invoice := Invoice())
+    changes = await storage.fetch_changes()
+
+    assert removed == 2
+    assert [(change.seq, change.invoice_id) for change in changes] == [(3, invoice.id)]
+    assert changes[0].operation is InvoiceOperation.CREATED
+    assert await storage.compact_changes(before=datetime.now(UTC) - timedelta(days=1)) == 0
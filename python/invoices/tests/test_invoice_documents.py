@@ -0,0 +1,135 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+from typing import Iterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from invoices.apps.server.extensions import documents
+from invoices.core.config import DocumentsConfig
+from invoices.core.content_cache import ContentCache
+from invoices.core.uuid7 import uuid7_lower_bound
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.services.render_invoice_document import DOCUMENT_SUFFIX
+from invoices.domain.services.render_invoice_document import DocumentRenderer
+from invoices.domain.services.render_invoice_document import RenderInvoiceDocuments
+from invoices.domain.services.render_invoice_document import RenderInvoiceDocumentsHandler
+
+
+@pytest.fixture
+def renderer(tmp_path: Path) -> Iterator[DocumentRenderer]:
+    """A renderer caching the documents in a temporary directory."""
+    renderer = DocumentRenderer(ContentCache(tmp_path, DOCUMENT_SUFFIX), processes=2)
+    yield renderer
+    renderer.close()
+
+
+@pytest.fixture
+def documents_client(app: Starlette, tmp_path: Path) -> Iterator[TestClient]:
+    """A client of the app, caching the documents in a temporary directory."""
+    documents.init_app(app, DocumentsConfig(directory=str(tmp_path), processes=1))
+    yield TestClient(app)
+    app.state.documents.close()
+
+
+@pytest.mark.asyncio
+async def test_get_document(documents_client: TestClient, tmp_path: Path):
+    """Test that a document is rendered once, then revalidated with its `ETag`."""
+    invoice = documents_client.post("/invoices").json()
+
+    response = documents_client.get(f"/invoices/{invoice['id']}/document")
+    revalidated = documents_client.get(
+        f"/invoices/{invoice['id']}/document", headers={"If-None-Match": response.headers["etag"]}
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/html")
+    assert f"Invoice {invoice['number']}" in response.text
+    assert revalidated.status_code == 304
+    assert len(list(tmp_path.glob(f"*/*{DOCUMENT_SUFFIX}"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_missing_document(documents_client: TestClient):
+    """Test that the document of an unknown invoice is not found."""
+    response = documents_client.get(f"/invoices/{Invoice().id}/document")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_renders_are_shared(renderer: DocumentRenderer):
+    """Test that concurrent requests for the same document share one rendering."""
+    calls = []
+    run = renderer._run  # pylint: disable=protected-access
+
+    async def counting_run(function, argument):
+        calls.append(argument)
+        return await run(function, argument)
+
+    renderer._run = counting_run  # pylint: disable=protected-access
+    invoice = Invoice(number="OT26000001")
+
+    rendered = await asyncio.gather(*(renderer.render(invoice) for _ in range(5)))
+    cached = await renderer.render(invoice)
+
+    assert len(calls) == 1
+    assert {document.content for document in rendered} == {cached.content}
+
+
+def crash(invoice: Invoice) -> bytes:
+    """Kill the rendering process, as running out of memory would."""
+    os._exit(1)
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_is_replaced(renderer: DocumentRenderer, monkeypatch):
+    """Test that a pool whose process died is shut down without waiting, then replaced."""
+    invoice = Invoice(number="OT26000001")
+    await renderer.render(invoice)
+    pool = renderer._pool  # pylint: disable=protected-access
+    shutdowns = []
+    shutdown = pool.shutdown
+
+    def recording_shutdown(**kwargs):
+        shutdowns.append(kwargs)
+        shutdown(**kwargs)
+
+    monkeypatch.setattr(pool, "shutdown", recording_shutdown)
+
+    with pytest.raises(BrokenProcessPool):
+        await renderer._run(crash, invoice)  # pylint: disable=protected-access
+    rendered = await renderer.render(Invoice(number="OT26000002"))
+
+    assert shutdowns == [{"wait": False, "cancel_futures": True}]
+    assert renderer._pool is not pool  # pylint: disable=protected-access
+    assert b"OT26000002" in rendered.content
+
+
+@pytest.mark.asyncio
+async def test_render_month(
+    connection: AsyncConnection,
+    renderer: DocumentRenderer,
+    created_at: Callable[[datetime], Invoice],
+):
+    """Test that the documents of a month are rendered once, the other months skipped."""
+    storage = DatabaseInvoiceStorage(connection)
+    for day in (1, 15, 31):
+        await storage.insert(created_at(datetime(2026, 8, day, tzinfo=UTC)))
+    await storage.insert(created_at(datetime(2026, 9, 1, tzinfo=UTC)))
+    command = RenderInvoiceDocuments(
+        lower_id=uuid7_lower_bound(datetime(2026, 8, 1, tzinfo=UTC)),
+        upper_id=uuid7_lower_bound(datetime(2026, 9, 1, tzinfo=UTC)),
+    )
+    handler = RenderInvoiceDocumentsHandler(storage, renderer)
+
+    assert await handler.handle(command) == (3, 3)
+    assert await handler.handle(command) == (3, 0)
@@ -0,0 +1,125 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from starlette.applications import Starlette
+
+from invoices.apps.server.extensions.events import Broadcaster
+from invoices.core.config import EventsConfig
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.models.invoice_change import InvoiceOperation
+from invoices.domain.storages.in_memory import InMemoryInvoiceStorage
+
+
+def make_broadcaster(storage: InMemoryInvoiceStorage, **kwargs) -> Broadcaster:
+    """Build a broadcaster tailing the change feed of an in-memory storage."""
+
+    @asynccontextmanager
+    async def open_storage():
+        yield storage
+
+    kwargs.setdefault("poll_interval", 0.001)
+    kwargs.setdefault("queue_size", 16)
+    kwargs.setdefault("heartbeat", 1.0)
+    kwargs.setdefault("batch_size", 2)
+    return Broadcaster(open_storage, EventsConfig(**kwargs))
+
+
+@pytest.mark.asyncio
+async def test_new_changes_are_broadcast():
+    """Test that every subscriber receives the changes following its subscription."""
+    storage = InMemoryInvoiceStorage()
+    await storage.insert(Invoice())
+    broadcaster = make_broadcaster(storage)
+    listeners = [broadcaster.listen(), broadcaster.listen()]
+    pending = [asyncio.create_task(anext(listener)) for listener in listeners]
+    await asyncio.sleep(0.01)
+
+    await storage.insert(invoice := Invoice())
+    changes = await asyncio.gather(*pending)
+    await broadcaster.stop()
+
+    assert [(change.seq, change.invoice_id) for change in changes] == [(2, invoice.id)] * 2
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_missed_changes():
+    """Test that a subscriber resuming from a `seq` first receives what it missed."""
+    storage = InMemoryInvoiceStorage()
+    for _ in range(5):
+        await storage.insert(invoice := Invoice())
+    await storage.delete(invoice)
+    broadcaster = make_broadcaster(storage)
+
+    listener = broadcaster.listen(since=2)
+    changes = [await anext(listener) for _ in range(4)]
+    await broadcaster.stop()
+
+    assert [change.seq for change in changes] == [3, 4, 5, 6]
+    assert changes[-1].operation is InvoiceOperation.DELETED
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected():
+    """Test that a subscriber whose queue overflows is disconnected."""
+    storage = InMemoryInvoiceStorage()
+    broadcaster = make_broadcaster(storage, queue_size=2)
+    listener = broadcaster.listen()
+    first = asyncio.create_task(anext(listener))
+    await asyncio.sleep(0.01)
+    await storage.insert(Invoice())
+    await first
+
+    for _ in range(3):
+        await storage.insert(Invoice())
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(StopAsyncIteration):
+        await anext(listener)
+    assert broadcaster.subscribers == 0
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat():
+    """Test that an idle subscriber is handed a heartbeat."""
+    broadcaster = make_broadcaster(InMemoryInvoiceStorage(), heartbeat=0.01)
+
+    assert await anext(broadcaster.listen()) is None
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_endpoint_streams_events(app: Starlette, invoice: Invoice):
+    """Test that the endpoint resumes from `Last-Event-ID` in the event stream format."""
+    messages: asyncio.Queue[dict] = asyncio.Queue()
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/invoices/events",
+        "raw_path": b"/invoices/events",
+        "query_string": b"",
+        "headers": [(b"last-event-id", b"0")],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+        "root_path": "",
+    }
+    request = asyncio.create_task(app(scope, receive, messages.put))
+    start = await messages.get()
+    body = await messages.get()
+    disconnected.set()
+    await request
+    await app.state.broadcaster.stop()
+
+    assert start["status"] == 200
+    assert dict(start["headers"])[b"content-type"].startswith(b"text/event-stream")
+    assert body["body"].decode().startswith("id: 1\nevent: created\ndata: {")
+    assert str(invoice.id) in body["body"].decode()
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import UTC
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.testclient import TestClient
+
+from invoices.core.config import DatabaseConfig
+from invoices.core.config import WriterConfig
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+from invoices.database.core import metadata
+from invoices.database.storages.invoices import WriterInvoiceStorage
+from invoices.database.writer import DatabaseWriter
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.services.numbering import InvoiceNumbering
+from invoices.domain.services.numbering import NumberingMode
+from invoices.domain.storages.in_memory import InMemoryInvoiceStorage
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    """An engine on a file database, so that the writer owns a connection of its own."""
+    engine = await get_async_engine(DatabaseConfig(path=str(tmp_path / "invoices.db")))
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_create_returns_number(client: TestClient):
+    """Test that created invoices get a legal number, listed along with them."""
+    response = client.post("/invoices")
+
+    assert response.status_code == 201, response.text
+    assert response.json()["number"] == f"OT{datetime.now(UTC):%y}000001"
+    assert client.get("/invoices").json() == [response.json()]
+
+
+@pytest.mark.asyncio
+async def test_blocks_per_worker():
+    """Test that each worker hands out numbers from the blocks it reserved."""
+    storage = InMemoryInvoiceStorage()
+    first, second = (InvoiceNumbering("OT", NumberingMode.BLOCK, block_size=3) for _ in "ab")
+
+    numbers = []
+    for numbering in (first, second, first, first, first):
+        invoice = Invoice()
+        await numbering.insert(storage, invoice)
+        numbers.append(invoice.number[-2:])
+
+    assert numbers == ["01", "04", "02", "03", "07"]
+
+
+@pytest.mark.asyncio
+async def test_sequence_per_year(created_at):
+    """Test that numbering starts over every year."""
+    storage = InMemoryInvoiceStorage()
+    numbering = InvoiceNumbering("OT", NumberingMode.STRICT, block_size=1)
+
+    numbers = []
+    for year in (2025, 2025, 2026):
+        invoice = created_at(datetime(year, 12, 31, tzinfo=UTC))
+        await numbering.insert(storage, invoice)
+        numbers.append(invoice.number)
+
+    assert numbers == ["OT25000001", "OT25000002", "OT26000001"]
+
+
+@pytest.mark.asyncio
+async def test_strict_numbers_are_gap_free(engine: AsyncEngine):
+    """Test that concurrent strict inserts get consecutive numbers, failed ones none."""
+    writer = DatabaseWriter(
+        partial(get_connection, engine), WriterConfig(max_batch_size=16, max_batch_delay=0.01)
+    )
+    numbering = InvoiceNumbering("OT", NumberingMode.STRICT, block_size=1)
+    async with get_connection(engine) as connection:
+        storage = WriterInvoiceStorage(connection, writer)
+        duplicate = Invoice()
+        await numbering.insert(storage, duplicate)
+        created = [Invoice() for _ in range(32)]
+        failed = Invoice(id_=duplicate.id)
+        results = await asyncio.gather(
+            *(numbering.insert(storage, invoice) for invoice in created),
+            numbering.insert(storage, failed),
+            return_exceptions=True,
+        )
+    await writer.stop()
+
+    assert isinstance(results[-1], IntegrityError)
+    assert failed.number is None
+    assert sorted(int(invoice.number[-6:]) for invoice in created) == list(range(2, 34))
@@ -0,0 +1,108 @@
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from invoices.apps.server.extensions import snapshot as snapshot_extension
+from invoices.core.config import SnapshotConfig
+from invoices.core.uuid7 import uuid7_lower_bound
+from invoices.database.snapshot import InvoiceSnapshot
+from invoices.database.storages.snapshot import SnapshotInvoiceStorage
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.storages.in_memory import InMemoryInvoiceStorage
+
+
+def seed(created_at, *days: int) -> list[Invoice]:
+    """Invoices created on the given days of May 2026."""
+    return [created_at(datetime(2026, 5, day, tzinfo=UTC)) for day in days]
+
+
+@pytest.mark.asyncio
+async def test_build_and_range(tmp_path: Path, created_at):
+    """Test that listings and range filters are read from the snapshot."""
+    seeded = seed(created_at, 1, 2, 3, 4, 5)
+    inner = InMemoryInvoiceStorage(*seeded)
+    storage = SnapshotInvoiceStorage(inner, InvoiceSnapshot(tmp_path / "ids.snap"), max_age=60)
+
+    page = await storage.fetch_all(limit=2, offset=1)
+    in_range = await storage.fetch_all(
+        lower_id=uuid7_lower_bound(datetime(2026, 5, 2, tzinfo=UTC)),
+        upper_id=uuid7_lower_bound(datetime(2026, 5, 4, tzinfo=UTC)),
+    )
+
+    assert (tmp_path / "ids.snap").exists()
+    assert page == seeded[1:3]
+    assert in_range == seeded[1:3]
+    assert await storage.fetch_all(offset=10) == []
+    assert await storage.fetch_timestamps() == await inner.fetch_timestamps()
+
+
+@pytest.mark.asyncio
+async def test_refresh_from_changes(tmp_path: Path, created_at):
+    """Test that the writes are applied to the snapshot from the change feed."""
+    older, *seeded = seed(created_at, 1, 3, 5)
+    storage = SnapshotInvoiceStorage(
+        InMemoryInvoiceStorage(), InvoiceSnapshot(tmp_path / "ids.snap"), max_age=60
+    )
+    for invoice in seeded:
+        await storage.insert(invoice)
+    assert await storage.fetch_all() == seeded
+
+    newer = created_at(datetime(2026, 5, 9, tzinfo=UTC))
+    await storage.insert(newer)  # appended in place
+    assert await storage.fetch_all() == [*seeded, newer]
+
+    await storage.insert(older)  # rewritten
+    await storage.delete(seeded[0])
+    assert await storage.fetch_all() == [older, seeded[1], newer]
+    assert await storage.fetch_by(seeded[0].id) is None
+    assert await storage.fetch_by(newer.id) == newer
+
+
+@pytest.mark.asyncio
+async def test_shared_between_workers(tmp_path: Path, created_at):
+    """Test that a worker reads the snapshot another worker refreshed."""
+    inner = InMemoryInvoiceStorage()
+    path = tmp_path / "ids.snap"
+    writer = SnapshotInvoiceStorage(inner, InvoiceSnapshot(path), max_age=60)
+    reader = SnapshotInvoiceStorage(inner, InvoiceSnapshot(path), max_age=60)
+    assert await reader.fetch_all() == []
+
+    seeded = seed(created_at, 1, 2)
+    for invoice in seeded:
+        await writer.insert(invoice)
+    await writer.fetch_all()
+
+    assert await reader.fetch_all() == seeded
+
+
+@pytest.mark.asyncio
+async def test_rebuild_after_compaction(tmp_path: Path, created_at):
+    """Test that the snapshot is rebuilt when the changes it misses were compacted away."""
+    inner = InMemoryInvoiceStorage()
+    snapshot = InvoiceSnapshot(tmp_path / "ids.snap")
+    storage = SnapshotInvoiceStorage(inner, snapshot, max_age=60)
+    await storage.fetch_all()
+
+    seeded = seed(created_at, 1, 2)
+    for invoice in seeded:
+        await inner.insert(invoice)
+    await inner.compact_changes(datetime.now(UTC))
+    await snapshot.refresh(inner)
+
+    assert await storage.fetch_all() == seeded
+
+
+@pytest.mark.asyncio
+async def test_endpoint(app: Starlette, client: TestClient, invoice: Invoice, tmp_path: Path):
+    """Test that the endpoint lists the invoices from the snapshot, once configured."""
+    snapshot_extension.init_app(app, SnapshotConfig(path=str(tmp_path / "ids.snap")))
+
+    response = client.get("/invoices")
+
+    assert response.status_code == 200, response.text
+    assert response.json() == [{"id": str(invoice.id)}]
+    assert app.state.snapshot.records().count == 1
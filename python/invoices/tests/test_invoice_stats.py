@@ -0,0 +1,115 @@
+from datetime import UTC
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.testclient import TestClient
+
+from invoices.core.uuid7 import uuid7_lower_bound
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.domain.models.invoice_stats import StatsBucket
+from invoices.domain.services.fetch_invoice_stats import InvoiceStatsCache
+from invoices.domain.storages.in_memory import InMemoryInvoiceStorage
+
+NOW = datetime(2026, 5, 3, 12, tzinfo=UTC)
+
+
+class ScanningInvoiceStorage(InMemoryInvoiceStorage):
+    """In-memory storage recording the lower bounds of its timestamp scans."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.scans: list[UUID | None] = []
+
+    async def fetch_timestamps(self, lower_id: UUID | None = None) -> bytes:
+        self.scans.append(lower_id)
+        return await super().fetch_timestamps(lower_id)
+
+
+@pytest.mark.asyncio
+async def test_counts_per_bucket(client: TestClient, connection: AsyncConnection, created_at):
+    """Test that the endpoint counts the invoices per creation day."""
+    storage = DatabaseInvoiceStorage(connection)
+    for day, hour in [(1, 8), (1, 17), (2, 9), (3, 10)]:
+        await storage.insert(created_at(datetime(2026, 5, day, hour, tzinfo=UTC)))
+    await connection.commit()
+
+    response = client.get("/invoices/stats", params={"bucket": "day"})
+
+    assert response.status_code == 200, response.text
+    assert [(stats["start"][:10], stats["count"]) for stats in response.json()] == [
+        ("2026-05-01", 2),
+        ("2026-05-02", 1),
+        ("2026-05-03", 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalid_bucket(client: TestClient):
+    """Test that only the supported buckets are accepted."""
+    response = client.get("/invoices/stats", params={"bucket": "week"})
+
+    assert response.status_code == 422, response.text
+
+
+@pytest.mark.asyncio
+async def test_closed_buckets_are_cached(created_at):
+    """Test that only the open bucket is scanned again once the closed ones are counted."""
+    storage = ScanningInvoiceStorage(
+        created_at(datetime(2026, 5, 1, 8, tzinfo=UTC)),
+        created_at(datetime(2026, 5, 3, 9, tzinfo=UTC)),
+    )
+    cache = InvoiceStatsCache()
+
+    await cache.count(storage, StatsBucket.DAY, NOW)
+    await storage.insert(created_at(datetime(2026, 5, 3, 11, tzinfo=UTC)))
+    stats = await cache.count(storage, StatsBucket.DAY, NOW)
+
+    assert storage.scans == [None, uuid7_lower_bound(datetime(2026, 5, 3, tzinfo=UTC))]
+    assert [(stat.start.day, stat.count) for stat in stats] == [(1, 1), (3, 2)]
+
+
+@pytest.mark.asyncio
+async def test_deletions_invalidate_closed_buckets(created_at):
+    """Test that deleting an invoice of a closed bucket recounts the closed buckets."""
+    old = created_at(datetime(2026, 4, 30, tzinfo=UTC))
+    storage = ScanningInvoiceStorage(old, created_at(datetime(2026, 5, 1, tzinfo=UTC)))
+    cache = InvoiceStatsCache()
+
+    await cache.count(storage, StatsBucket.MONTH, NOW)
+    await storage.delete(old)
+    stats = await cache.count(storage, StatsBucket.MONTH, NOW)
+
+    assert storage.scans == [None, None]
+    assert [(stat.start.month, stat.count) for stat in stats] == [(5, 1)]
+
+
+@pytest.mark.asyncio
+async def test_backfills_invalidate_closed_buckets(created_at):
+    """Test that an invoice created in a closed bucket, once counted, recounts them."""
+    storage = ScanningInvoiceStorage(created_at(datetime(2026, 5, 1, tzinfo=UTC)))
+    cache = InvoiceStatsCache()
+
+    await cache.count(storage, StatsBucket.MONTH, NOW)
+    await storage.insert(created_at(datetime(2026, 4, 30, tzinfo=UTC)))
+    stats = await cache.count(storage, StatsBucket.MONTH, NOW)
+
+    assert storage.scans == [None, None]
+    assert [(stat.start.month, stat.count) for stat in stats] == [(4, 1), (5, 1)]
+
+
+@pytest.mark.asyncio
+async def test_compacted_deletions_invalidate_closed_buckets(created_at):
+    """Test that closed buckets are recounted when the changes since were compacted away."""
+    old = created_at(datetime(2026, 4, 30, tzinfo=UTC))
+    storage = ScanningInvoiceStorage(old, created_at(datetime(2026, 5, 1, tzinfo=UTC)))
+    cache = InvoiceStatsCache()
+
+    await cache.count(storage, StatsBucket.MONTH, NOW)
+    await storage.delete(old)
+    await storage.compact_changes(datetime.now(UTC))
+    stats = await cache.count(storage, StatsBucket.MONTH, NOW)
+
+    assert storage.scans == [None, None]
+    assert [(stat.start.month, stat.count) for stat in stats] == [(5, 1)]
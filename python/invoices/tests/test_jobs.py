@@ -0,0 +1,179 @@
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.testclient import TestClient
+
+from invoices.apps.worker.tasks import TaskRegistry
+from invoices.apps.worker.worker import Connect
+from invoices.apps.worker.worker import JobWorker
+from invoices.core.config import DatabaseConfig
+from invoices.core.config import JobsConfig
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+from invoices.database.core import metadata
+from invoices.database.jobs import claim_jobs
+from invoices.database.jobs import enqueue_job
+from invoices.database.jobs import fetch_job
+from invoices.domain.models.job import Job
+from invoices.domain.models.job import JobStatus
+
+registry = TaskRegistry()
+runs: Counter[str] = Counter()
+
+
+@registry.register("square")
+async def square(connection: AsyncConnection, payload: dict[str, Any]) -> int:
+    """A task returning the square of a value."""
+    return payload["value"] ** 2
+
+
+@registry.register("locking", immediate=True)
+async def locking(connection: AsyncConnection, payload: dict[str, Any]) -> bool:
+    """A task telling whether its transaction takes the write lock upfront."""
+    return connection.sync_connection.get_execution_options().get("sqlite_immediate", False)
+
+
+@registry.register("lock-free")
+async def lock_free(connection: AsyncConnection, payload: dict[str, Any]) -> bool:
+    """A task telling whether its transaction takes the write lock upfront."""
+    return connection.sync_connection.get_execution_options().get("sqlite_immediate", False)
+
+
+@registry.register("flaky")
+async def flaky(connection: AsyncConnection, payload: dict[str, Any]) -> str:
+    """A task failing its first `failures` runs."""
+    runs[payload["name"]] += 1
+    if runs[payload["name"]] <= payload["failures"]:
+        raise RuntimeError("try again")
+    return "done"
+
+
+def pinned(connection: AsyncConnection) -> Connect:
+    """Connect to the given connection, every time."""
+
+    @asynccontextmanager
+    async def connect() -> AsyncIterator[AsyncConnection]:
+        yield connection
+
+    return connect
+
+
+async def run_until_finished(connect: Connect, job: Job, **kwargs) -> Job:
+    """Run a worker on the given connections until the job succeeds or fails."""
+    config = JobsConfig(concurrency=1, poll_interval=0.01, backoff_base=0, **kwargs)
+    worker = JobWorker(connect, registry, config)
+    running = asyncio.create_task(worker.run())
+    try:
+        async with asyncio.timeout(30):
+            while True:
+                async with connect() as connection:
+                    job = await fetch_job(connection, job.id)
+                if job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+                    break
+                await asyncio.sleep(0.01)
+    finally:
+        worker.stop()
+        await running
+    return job
+
+
+@pytest.mark.asyncio
+async def test_enqueue_and_status(client: TestClient):
+    """Test that a queued job can be followed through its status endpoint."""
+    created = client.post("/jobs", json={"kind": "compact-changes", "priority": 5})
+    status = client.get(created.headers["location"])
+
+    assert created.status_code == 202, created.text
+    assert status.status_code == 200
+    assert status.json() == created.json()
+    assert status.json()["status"] == "queued"
+    assert status.json()["priority"] == 5
+
+
+@pytest.mark.asyncio
+async def test_enqueue_unknown_kind(client: TestClient):
+    """Test that only the kinds of jobs the workers can run are queued."""
+    response = client.post("/jobs", json={"kind": "mine-bitcoins"})
+
+    assert response.status_code == 422, response.text
+    assert client.get("/jobs/1").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_claim_by_priority(connection: AsyncConnection):
+    """Test that jobs are claimed once each, highest priority first."""
+    low = await enqueue_job(connection, "square", {}, priority=0, max_attempts=1)
+    high = await enqueue_job(connection, "square", {}, priority=10, max_attempts=1)
+    other = await enqueue_job(connection, "square", {}, priority=0, max_attempts=1)
+
+    first = await claim_jobs(connection, limit=2, lease=60)
+    second = await claim_jobs(connection, limit=2, lease=60)
+
+    assert [job.id for job in first] == [high.id, low.id]
+    assert [job.id for job in second] == [other.id]
+    assert await claim_jobs(connection, limit=2, lease=60) == []
+    assert {job.status for job in first + second} == {JobStatus.RUNNING}
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_claimed_again(connection: AsyncConnection):
+    """Test that a job whose worker died is claimed again once its lease expires."""
+    job = await enqueue_job(connection, "square", {}, priority=0, max_attempts=3)
+    await claim_jobs(connection, limit=1, lease=0)
+    await asyncio.sleep(0.01)
+
+    [claimed] = await claim_jobs(connection, limit=1, lease=60)
+
+    assert claimed.id == job.id
+    assert claimed.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff(connection: AsyncConnection):
+    """Test that failed runs are retried until the job succeeds."""
+    job = await enqueue_job(
+        connection, "flaky", {"name": "retried", "failures": 2}, priority=0, max_attempts=3
+    )
+
+    job = await run_until_finished(pinned(connection), job)
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.attempts == 3
+    assert job.result == "done"
+
+
+@pytest.mark.asyncio
+async def test_out_of_attempts(connection: AsyncConnection):
+    """Test that a job fails for good once it runs out of attempts."""
+    job = await enqueue_job(
+        connection, "flaky", {"name": "failed", "failures": 5}, priority=0, max_attempts=2
+    )
+
+    job = await run_until_finished(pinned(connection), job)
+
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 2
+    assert job.error == "RuntimeError: try again"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind, immediate", [("locking", True), ("lock-free", False)])
+async def test_immediate_tasks(tmp_path: Path, kind: str, immediate: bool):
+    """Test that only the tasks registered as immediate take the write lock upfront."""
+    engine = await get_async_engine(DatabaseConfig(path=str(tmp_path / "invoices.db")))
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+        job = await enqueue_job(connection, kind, {}, priority=0, max_attempts=1)
+
+    job = await run_until_finished(partial(get_connection, engine), job)
+    await engine.dispose()
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result is immediate
@@ -0,0 +1,128 @@
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence
+from uuid import UUID
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.testclient import TestClient
+from uuid6 import uuid7
+
+from invoices.core.uuid7 import uuid7_lower_bound
+from invoices.database.archives import archive_invoices
+from invoices.database.storages import invoices as invoice_storages
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.services.fetch_many_invoices import FetchManyInvoices
+from invoices.domain.services.fetch_many_invoices import FetchManyInvoicesHandler
+from invoices.domain.services.fetch_many_invoices import InvoiceCache
+from invoices.domain.storages.in_memory import InMemoryInvoiceStorage
+
+
+class CountingInvoiceStorage(InMemoryInvoiceStorage):
+    """In-memory storage recording the ids each `fetch_many` call reads."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reads: list[list[UUID]] = []
+
+    async def fetch_many(self, invoice_ids: Sequence[UUID]) -> list[Invoice]:
+        self.reads.append(list(invoice_ids))
+        return await super().fetch_many(invoice_ids)
+
+
+async def seed(connection: AsyncConnection, count: int) -> list[Invoice]:
+    """Store some invoices."""
+    storage = DatabaseInvoiceStorage(connection)
+    seeded = [Invoice() for _ in range(count)]
+    for invoice in seeded:
+        await storage.insert(invoice)
+    await connection.commit()
+    return seeded
+
+
+@pytest.mark.asyncio
+async def test_get_by_ids(client: TestClient, connection: AsyncConnection):
+    """Test that the endpoint returns the invoices in the requested order, and the missing ids."""
+    first, second = await seed(connection, 2)
+    unknown = uuid7()
+
+    response = client.get("/invoices", params={"ids": f"{second.id},{unknown},{first.id}"})
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "invoices": [{"id": str(second.id)}, {"id": str(first.id)}],
+        "missing": [str(unknown)],
+    }
+
+
+@pytest.mark.asyncio
+async def test_post_lookup(client: TestClient, connection: AsyncConnection):
+    """Test that long id lists can be sent in the body of a lookup."""
+    seeded = await seed(connection, 3)
+
+    response = client.post("/invoices/lookup", json={"ids": [str(i.id) for i in seeded]})
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "invoices": [{"id": str(invoice.id)} for invoice in seeded],
+        "missing": [],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ids", ["not-a-uuid", ",".join(str(uuid7()) for _ in range(1001))])
+async def test_invalid_ids(client: TestClient, ids: str):
+    """Test that malformed ids and too long lists are rejected."""
+    response = client.post("/invoices/lookup", json={"ids": ids.split(",")})
+
+    assert response.status_code == 422, response.text
+
+
+@pytest.mark.asyncio
+async def test_chunked_queries(
+    connection: AsyncConnection, tmp_path: Path, created_at, monkeypatch
+):
+    """Test that the ids are read in chunks, from the main table and the archives."""
+    monkeypatch.setattr(invoice_storages, "IN_CHUNK_SIZE", 2)
+    storage = DatabaseInvoiceStorage(connection)
+    old = [created_at(datetime(2026, month, 1, tzinfo=UTC)) for month in (1, 2)]
+    seeded = [*old, *await seed(connection, 3)]
+    for invoice in old:
+        await storage.insert(invoice)
+    await archive_invoices(
+        connection, uuid7_lower_bound(datetime(2026, 3, 1, tzinfo=UTC)), tmp_path, 100
+    )
+
+    queries: list[str] = []
+
+    def record(_conn, _cursor, statement, *_):
+        if " IN (" in statement:
+            queries.append(statement)
+
+    event.listen(connection.sync_engine, "before_cursor_execute", record)
+    fetched = await storage.fetch_many([invoice.id for invoice in seeded] + [uuid7()])
+    event.remove(connection.sync_engine, "before_cursor_execute", record)
+
+    assert sorted(invoice.id for invoice in fetched) == sorted(invoice.id for invoice in seeded)
+    # 6 ids in the main table, then one old invoice in each archive (the unknown id in none)
+    assert len(queries) == 3 + 1 + 1
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_and_deletions():
+    """Test that cached invoices are not read again, until they are deleted."""
+    first, second = Invoice(), Invoice()
+    storage = CountingInvoiceStorage(first, second)
+    handler = FetchManyInvoicesHandler(storage, InvoiceCache(maxsize=10))
+
+    await handler.handle(FetchManyInvoices((first.id, second.id)))
+    invoices = await handler.handle(FetchManyInvoices((second.id, first.id)))
+    await storage.delete(first)
+    after_delete = await handler.handle(FetchManyInvoices((first.id, second.id)))
+
+    assert invoices == [second, first]
+    assert after_delete == [None, second]
+    assert storage.reads == [[first.id, second.id], [first.id]]
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+
+from invoices.apps.server.extensions import rate_limit
+from invoices.apps.server.extensions.rate_limit import RateLimitMiddleware
+from invoices.apps.server.extensions.rate_limit import parse_rules
+from invoices.core.config import RateLimitConfig
+from invoices.core.token_bucket import MemoryTokenBuckets
+from invoices.core.token_bucket import SharedTokenBuckets
+from invoices.core.token_bucket import TokenBuckets
+
+
+async def app(scope, receive, send):
+    """An ASGI app answering every request with a 200."""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def make_client(buckets: TokenBuckets, rules: str = "POST /invoices=1:2") -> httpx.AsyncClient:
+    """A client of the app, rate limited by the given rules."""
+    middleware = RateLimitMiddleware(app, parse_rules(rules), buckets, "x-api-key")
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_limited_requests():
+    """Test that requests beyond the burst get a 429 with `Retry-After` and `RateLimit-*`."""
+    async with make_client(MemoryTokenBuckets(100)) as client:
+        responses = [await client.post("/invoices") for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert [response.headers["RateLimit-Remaining"] for response in responses] == ["1", "0", "0"]
+    assert responses[0].headers["RateLimit-Limit"] == "2"
+    assert responses[2].headers["Retry-After"] == "1"
+    assert responses[2].json()["kind"] == "rate-limited"
+
+
+@pytest.mark.asyncio
+async def test_limits_per_client_and_route():
+    """Test that each API key has its own bucket, and unmatched routes are not limited."""
+    async with make_client(MemoryTokenBuckets(100), "POST /invoices=1:1") as client:
+        first = await client.post("/invoices", headers={"x-api-key": "first"})
+        second = await client.post("/invoices", headers={"x-api-key": "second"})
+        limited = await client.post("/invoices", headers={"x-api-key": "first"})
+        listed = [await client.get("/invoices") for _ in range(3)]
+
+    assert (first.status_code, second.status_code, limited.status_code) == (200, 200, 429)
+    assert {response.status_code for response in listed} == {200}
+    assert "RateLimit-Limit" not in listed[0].headers
+
+
+@pytest.mark.asyncio
+async def test_shared_buckets(tmp_path: Path):
+    """Test that the workers sharing a file share the buckets of the clients."""
+    path = tmp_path / "rate-limit"
+    worker, other_worker = SharedTokenBuckets(path, 64), SharedTokenBuckets(path, 64)
+
+    async with make_client(worker) as client, make_client(other_worker) as other_client:
+        statuses = [
+            (await client.post("/invoices")).status_code,
+            (await other_client.post("/invoices")).status_code,
+            (await other_client.post("/invoices")).status_code,
+        ]
+
+    assert statuses == [200, 200, 429]
+    worker.close()
+    other_worker.close()
+
+
+@pytest.mark.parametrize(
+    "rule", ["POST /invoices=0:5", "POST /invoices=-1:5", "POST /invoices=1:0"]
+)
+def test_invalid_rules(rule: str):
+    """Test that rules which would never refill, or never allow a request, are rejected."""
+    with pytest.raises(ValueError, match="Invalid rate limit rule"):
+        parse_rules(rule)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_shared_buckets(tmp_path: Path):
+    """Test that the shared buckets of a worker are unmapped when it shuts down."""
+    app = Starlette()
+    config = RateLimitConfig(rules="POST /invoices=1:2", shared_path=str(tmp_path / "rl"))
+    rate_limit.init_app(app, config)
+    buckets = app.state.rate_limit_buckets
+
+    await rate_limit.shutdown(app)
+
+    assert buckets._map.closed  # pylint: disable=protected-access
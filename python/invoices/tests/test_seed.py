@@ -0,0 +1,84 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy import select
+
+from invoices.core.config import DatabaseConfig
+from invoices.core.uuid7 import uuid7_timestamp
+from invoices.database.archives import registered_archives
+from invoices.database.core import get_async_engine
+from invoices.database.core import get_connection
+from invoices.database.core import get_sync_engine
+from invoices.database.core import metadata
+from invoices.database.seed import InvoiceSeeder
+from invoices.database.storages.invoices import DatabaseInvoiceStorage
+from invoices.database.tables.invoice_numbers import invoice_numbers
+from invoices.database.tables.invoices import invoices as invoices_table
+
+END = datetime(2027, 1, 10, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_seed(tmp_path: Path):
+    """Test that seeded invoices are uuid7 ids spread over the period, numbered per year."""
+    config = DatabaseConfig(path=str(tmp_path / "seeded.db"))
+    engine = get_sync_engine(config)
+    metadata.create_all(engine)
+    seeder = InvoiceSeeder(engine, prefix="OT", batch_size=1000, archive_directory=tmp_path)
+    inserted = seeder.seed(rows=5000, days=20, end=END, seed=1)
+    inserted += seeder.seed(rows=10, days=1, end=END, seed=2)
+    engine.dispose()
+
+    async_engine = await get_async_engine(config)
+    async with get_connection(async_engine) as connection:
+        storage = DatabaseInvoiceStorage(connection)
+        invoices = await storage.fetch_all(limit=10_000)
+        result = await connection.execute(select(func.count()).select_from(invoice_numbers))
+        numbered = result.scalar_one()
+        changes = await storage.fetch_changes(limit=10_000)
+    await async_engine.dispose()
+
+    created = [uuid7_timestamp(invoice.id) for invoice in invoices]
+    numbers_2027 = sorted(invoice.number for invoice in invoices if invoice.number[2:4] == "27")
+    assert inserted == len(invoices) == numbered == len(changes) == 5010
+    assert {change.invoice_id for change in changes} == {invoice.id for invoice in invoices}
+    assert {invoice.id.version for invoice in invoices} == {7}
+    assert END - timedelta(days=21) <= min(created) and max(created) < END
+    assert numbers_2027[0] == "OT27000001"
+    assert numbers_2027[-1] == f"OT27{len(numbers_2027):06d}"
+
+
+@pytest.mark.asyncio
+async def test_seed_archives_historical_invoices(tmp_path: Path):
+    """Test that the invoices created before the archival cutoff go to the archives."""
+    config = DatabaseConfig(path=str(tmp_path / "seeded.db"))
+    engine = get_sync_engine(config)
+    metadata.create_all(engine)
+    cutoff = datetime(2027, 1, 1, tzinfo=UTC)
+    seeder = InvoiceSeeder(
+        engine, prefix="OT", batch_size=100, archive_directory=tmp_path, archive_before=cutoff
+    )
+    inserted = seeder.seed(rows=1000, days=50, end=END, seed=1)
+    engine.dispose()
+
+    async_engine = await get_async_engine(config)
+    async with get_connection(async_engine) as connection:
+        storage = DatabaseInvoiceStorage(connection)
+        invoices = await storage.fetch_all(limit=10_000)
+        result = await connection.execute(select(func.count()).select_from(invoices_table))
+        unarchived = result.scalar_one()
+        archives = await registered_archives(connection)
+        archived = await storage.fetch_many([invoice.id for invoice in invoices])
+    await async_engine.dispose()
+
+    old = [invoice for invoice in invoices if uuid7_timestamp(invoice.id) < cutoff]
+    assert len(invoices) == len(archived) == inserted == 1000
+    assert 0 < unarchived == len(invoices) - len(old) < 1000
+    assert [archive.period for archive in archives] == ["2026-11", "2026-12"]
+    assert sum(archive.count for archive in archives) == len(old)
+    assert min(invoice.id for invoice in old) == archives[0].lower_id
+    assert max(invoice.id for invoice in old) == archives[-1].upper_id
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from invoices.core.singleflight import SingleFlight
+from invoices.domain.models.invoice import Invoice
+from invoices.domain.services.fetch_all_invoices import FetchAllInvoices
+from invoices.domain.services.fetch_all_invoices import FetchAllInvoicesHandler
+from invoices.domain.storages.in_memory import InMemoryInvoiceStorage
+
+
+class CountingInvoiceStorage(InMemoryInvoiceStorage):
+    """In-memory storage counting (and slowing down) its reads."""
+
+    calls = 0
+
+    async def fetch_all(self, *args, **kwargs) -> list[Invoice]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return await super().fetch_all(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_computation():
+    """Test that identical concurrent calls run the computation only once."""
+    storage = CountingInvoiceStorage(Invoice(), Invoice())
+    handler = FetchAllInvoicesHandler(storage)
+    flights: SingleFlight[list[Invoice]] = SingleFlight()
+    query = FetchAllInvoices(limit=100, offset=0)
+
+    results = await asyncio.gather(
+        *(flights.do(query, lambda: handler.handle(query)) for _ in range(10))
+    )
+
+    assert storage.calls == 1
+    assert all(result == storage.items for result in results)
+    assert query not in flights
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    """Test that calls with different keys are not coalesced."""
+    storage = CountingInvoiceStorage(Invoice(), Invoice())
+    handler = FetchAllInvoicesHandler(storage)
+    flights: SingleFlight[list[Invoice]] = SingleFlight()
+    first, second = FetchAllInvoices(limit=1, offset=0), FetchAllInvoices(limit=1, offset=1)
+
+    await asyncio.gather(
+        flights.do(first, lambda: handler.handle(first)),
+        flights.do(second, lambda: handler.handle(second)),
+    )
+
+    assert storage.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared():
+    """Test that every waiting caller receives the exception of the shared call."""
+    flights: SingleFlight[None] = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flights.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert "key" not in flights
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_cancel_followers():
+    """Test that cancelling the first caller only detaches that caller."""
+    flights: SingleFlight[int] = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        return 42
+
+    leader = asyncio.create_task(flights.do("key", compute))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == 42
+    assert leader.cancelled()
+    assert "key" not in flights
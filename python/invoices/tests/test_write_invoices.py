@@ -0,0 +1,32 @@
+import pytest
+from starlette.testclient import TestClient
+from uuid6 import uuid7
+
+from invoices.domain.models.invoice import Invoice
+
+
+@pytest.mark.asyncio
+async def test_create(client: TestClient):
+    """Test that the endpoint creates an invoice."""
+    response = client.post("/invoices")
+
+    assert response.status_code == 201, response.text
+    assert client.get("/invoices").json() == [response.json()]
+
+
+@pytest.mark.asyncio
+async def test_delete(client: TestClient, invoice: Invoice):
+    """Test that the endpoint deletes an existing invoice."""
+    response = client.delete(f"/invoices/{invoice.id}")
+
+    assert response.status_code == 204, response.text
+    assert client.get("/invoices").json() == []
+
+
+@pytest.mark.asyncio
+async def test_delete_not_found(client: TestClient):
+    """Test that deleting an unknown invoice returns a 404."""
+    response = client.delete(f"/invoices/{uuid7()}")
+
+    assert response.status_code == 404, response.text
+    assert response.json()["kind"] == "not-found"